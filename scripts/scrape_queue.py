@@ -0,0 +1,146 @@
+"""
+Scraping réparti entre plusieurs machines via une file de blocs scl
+
+    # Découper la plage en blocs de 500 dans une file SQLite
+    python scripts/scrape_queue.py init jobs.db 1 100000
+    # Coordinateur pour les autres machines (sinon, fichier partagé en local)
+    python scripts/scrape_queue.py serve jobs.db --port 8765
+    # Autant de workers que voulu, sur chaque machine (un CSV par worker)
+    python scripts/scrape_queue.py work http://coordinateur:8765 clubs_machine1.csv
+    # Avancement
+    python scripts/scrape_queue.py status http://coordinateur:8765
+
+Chaque worker prend un bloc, le scrape comme scripts/scrape_range.py en
+renouvelant son bail, puis rend compte. Le bloc d'un worker arrêté net
+est redonné à un autre à l'expiration du bail.
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from job_queue import (DEFAULT_BLOCK_SIZE, DEFAULT_LEASE_SECONDS, JobQueue, JobServer, LeaseKeeper,
+                       default_worker_id, open_queue)
+from scrape_range import scrape_range
+from scraper_options import ScraperOptions, add_scraper_arguments
+
+
+def work(queue_spec: str, output_csv: str = "clubs_france.csv", worker: str = None,
+         heartbeat: float = 60.0, wait: bool = False, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+         max_attempts: int = 5, **scrape_options):
+    """
+    Traite des blocs de la file jusqu'à ce qu'il n'y en ait plus
+
+    Args:
+        queue_spec: Fichier SQLite de la file ou URL du coordinateur
+        output_csv: Fichier CSV de ce worker
+        worker: Identifiant du worker (défaut: machine-pid-aléatoire)
+        heartbeat: Intervalle de renouvellement du bail (s), bien inférieur à sa durée
+        wait: File vide mais blocs encore en cours ailleurs: attendre leur éventuelle expiration
+        lease_seconds: Durée d'un bail (file locale uniquement, sinon celle du coordinateur)
+        max_attempts: Bails accordés à un bloc avant échec (file locale uniquement)
+        scrape_options: Options transmises à scrape_range
+    """
+    queue = open_queue(queue_spec, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    worker = worker or default_worker_id()
+    print(f"👷 Worker {worker} sur {queue_spec}")
+    blocks = 0
+
+    while True:
+        job = queue.lease(worker)
+        if job is None:
+            status = queue.status()
+            if wait and status['leased']:
+                print(f"⏳ {status['leased']} blocs en cours ailleurs, attente d'une éventuelle expiration...")
+                time.sleep(heartbeat)
+                continue
+            break
+
+        print(f"\n📦 Bloc {job.start}-{job.end} (tentative {job.attempts})")
+        try:
+            with LeaseKeeper(queue, job, heartbeat) as keeper:
+                stats = scrape_range(job.start, job.end, output_csv, **scrape_options)
+        except BaseException:
+            queue.release(job)
+            raise
+
+        if stats['interrupted']:
+            queue.release(job)
+            print(f"↩️  Bloc {job.start}-{job.end} rendu à la file")
+            break
+        if not queue.complete(job, stats['found'], stats['tested'], stats['errors']) or keeper.lost:
+            print(f"⚠️  Bail perdu pendant le bloc {job.start}-{job.end}: résultat enregistré quand même")
+        blocks += 1
+
+    print(f"\n🏁 {blocks} blocs traités par {worker}")
+    print(f"📊 File: {queue.summary()}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scraping réparti via une file de blocs scl")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = subparsers.add_parser('init', help='Découper une plage en blocs dans la file')
+    init_parser.add_argument('queue', type=str, help='Fichier SQLite de la file')
+    init_parser.add_argument('start', type=int, help='Numéro SCL de début')
+    init_parser.add_argument('end', type=int, help='Numéro SCL de fin')
+    init_parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                             help=f'Numéros par bloc (défaut: {DEFAULT_BLOCK_SIZE})')
+
+    serve_parser = subparsers.add_parser('serve', help='Coordinateur HTTP pour les workers des autres machines')
+    serve_parser.add_argument('queue', type=str, help='Fichier SQLite de la file')
+    serve_parser.add_argument('--host', type=str, default='0.0.0.0', help='Adresse d\'écoute (défaut: 0.0.0.0)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port (défaut: 8765)')
+
+    status_parser = subparsers.add_parser('status', help='Avancement de la file')
+    status_parser.add_argument('queue', type=str, help='Fichier SQLite de la file ou URL du coordinateur')
+
+    work_parser = subparsers.add_parser('work', help='Scraper des blocs de la file jusqu\'à épuisement')
+    work_parser.add_argument('queue', type=str, help='Fichier SQLite de la file ou URL du coordinateur')
+    work_parser.add_argument('output', type=str, nargs='?', default='clubs_france.csv',
+                             help='Fichier CSV de ce worker (défaut: clubs_france.csv)')
+    work_parser.add_argument('--worker', type=str, default=None,
+                             help='Identifiant du worker (défaut: machine-pid-aléatoire)')
+    work_parser.add_argument('--heartbeat', type=float, default=60.0,
+                             help='Intervalle de renouvellement du bail en secondes (défaut: 60)')
+    work_parser.add_argument('--wait', action='store_true',
+                             help='Attendre les blocs encore en cours ailleurs (repris si leur worker meurt)')
+    work_parser.add_argument('--archive', type=str, default=None,
+                             help='Répertoire où archiver les pages récupérées (re-parsing hors ligne)')
+    work_parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                             help='URL de base (peu importe, le scl est unique)')
+    add_scraper_arguments(work_parser, parquet=False)
+
+    for sub in (serve_parser, work_parser):
+        sub.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                         help=f'Durée d\'un bail en secondes (défaut: {DEFAULT_LEASE_SECONDS:g}, file locale)')
+        sub.add_argument('--max-leases', type=int, default=5,
+                         help='Bails accordés à un bloc avant de le déclarer en échec (défaut: 5, file locale)')
+
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        added = JobQueue(args.queue).populate(args.start, args.end, args.block_size)
+        print(f"📦 {added} blocs ajoutés à {args.queue}")
+        print(f"📊 File: {JobQueue(args.queue).summary()}")
+    elif args.command == 'serve':
+        server = JobServer(JobQueue(args.queue, args.lease, args.max_leases), args.host, args.port)
+        print(f"🛰️  Coordinateur sur {server.url} ({args.queue}), Ctrl+C pour arrêter")
+        print(f"📊 File: {server.queue.summary()}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n📊 File: {server.queue.summary()}")
+        finally:
+            server.httpd.server_close()
+    elif args.command == 'status':
+        print(f"📊 File: {open_queue(args.queue).summary()}")
+    else:
+        work(args.queue, args.output, args.worker, args.heartbeat, args.wait, args.lease, args.max_leases,
+             archive_dir=args.archive, base_url=args.base_url,
+             **ScraperOptions.from_args(args).as_kwargs())
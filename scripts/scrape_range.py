@@ -1,19 +1,37 @@
 """
 Script pour scraper une plage de numéros SCL
-Surcharge les entrées existantes dans le CSV (évite les doublons)
+Surcharge les entrées existantes dans le CSV (évite les doublons): chaque
+résultat est ajouté au journal <sortie>.log dès qu'il arrive, puis fusionné
+dans le CSV trié par compaction (voir src/record_log.py)
 Même format et délais que test_50_clubs.py
 """
 
 import sys
 import os
-import csv
 import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from negative_cache import DEFAULT_TTL_DAYS, NegativeCache
+from page_archive import PageArchive
+from parquet_export import ParquetSink, export_csv, require_pyarrow, run_file_path
+from club_data import STATUS_ERROR, STATUS_TRANSIENT
+from club_store import ClubStore
+from host_pool import HostPool
+from rate_limit import RateLimiter
+from record_log import RecordLog
+from retry_queue import RetryPolicy, RetryQueue
+from scan_checkpoint import ScanCheckpoint
 from scraper_by_scl import SCLScraper
+from scraper_options import ScraperOptions, add_scraper_arguments
 
-def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.csv"):
+def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.csv",
+                 archive_dir: str = None, base_url: str = "https://gironde.fff.fr",
+                 negative_cache_file: str = None, cache_ttl: float = DEFAULT_TTL_DAYS,
+                 rate: float = None, burst: float = None, rate_state_dir: str = None,
+                 retry_policy: RetryPolicy = None, hosts_file: str = None,
+                 host_strategy: str = 'least-loaded', checkpoint_file: str = None, compact: bool = None,
+                 sqlite_file: str = None, parquet_file: str = None):
     """
     Scrape une plage de numéros SCL et met à jour le CSV (surcharge les entrées existantes)
     
@@ -21,8 +39,28 @@ def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.c
         start_scl: Numéro SCL de début
         end_scl: Numéro SCL de fin
         output_csv: Fichier CSV de sortie (surcharge les entrées existantes)
+        archive_dir: Répertoire où archiver les pages récupérées (optionnel)
+        base_url: URL de base du district (ou d'un faux site local pour les tests)
+        negative_cache_file: Cache des scl sans club (numéros sautés tant que valides)
+        cache_ttl: Durée de validité du cache négatif (jours)
+        rate: Débit maximal par hôte (requêtes/s)
+        burst: Rafale tolérée par hôte
+        rate_state_dir: Répertoire des seaux partagés avec d'autres processus
+        retry_policy: Tentatives et délais pour les numéros en échec transitoire
+        hosts_file: districts_urls.json, pour répartir les requêtes entre les hôtes (remplace base_url)
+        host_strategy: "round-robin" ou "least-loaded"
+        checkpoint_file: Point de reprise exact (numéros déjà traités sautés, supprimé en fin de plage)
+        compact: Fusion du journal dans le CSV en fin de plage (True: toujours, False: jamais, None: selon la taille)
+        sqlite_file: Base SQLite des clubs mise à jour en plus du CSV (voir src/club_store.py)
+        parquet_file: Export Parquet de tout le CSV: clubs de la plage écrits au fil de l'eau, fusionnés en fin de plage (voir src/parquet_export.py)
+    
+    Returns:
+        Bilan de la plage: clubs trouvés, numéros testés, numéros en erreur, interruption
     """
     
+    if parquet_file:
+        require_pyarrow()
+    
     print("=" * 60)
     print(f"🏆 SCRAPING PLAGE SCL {start_scl}-{end_scl}")
     print("=" * 60)
@@ -37,97 +75,161 @@ def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.c
     
     start_time = time.time()
     
-    # Charger les données existantes pour éviter les doublons
-    existing_data = {}
-    file_exists = os.path.exists(output_csv)
-    
-    if file_exists:
-        try:
-            with open(output_csv, 'r', encoding='utf-8', newline='') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    scl_key = row.get('scl', '').strip()
-                    if scl_key and scl_key.isdigit():
-                        existing_data[int(scl_key)] = row
-        except Exception as e:
-            print(f"⚠️  Erreur lors de la lecture du fichier existant: {e}")
-            existing_data = {}
+    # Plage interrompue: les numéros déjà trouvés ou absents ne sont pas retestés
+    checkpoint = ScanCheckpoint(checkpoint_file) if checkpoint_file else None
+    if checkpoint is not None and checkpoint.resumed:
+        scl_list = [scl for scl in scl_list if not checkpoint.is_done(scl)]
+        print(f"🧾 Reprise depuis {checkpoint_file}: {checkpoint.summary()}")
+        print(f"   {len(scl_list)} numéros restants\n")
+    negative_cache = NegativeCache(negative_cache_file, cache_ttl) if negative_cache_file else None
+    if negative_cache is not None:
+        scl_list = negative_cache.filter(scl_list)
+        print(f"🚫 Cache négatif: {negative_cache.skipped} numéros sans club sautés\n")
+    if not scl_list:
+        if checkpoint is not None:
+            checkpoint.remove()
+        print("✅ Rien à faire")
+        return {'found': 0, 'tested': 0, 'errors': 0, 'interrupted': False}
+    archive = PageArchive(archive_dir) if archive_dir else None
+    rate_limiter = RateLimiter(rate, burst, rate_state_dir) if rate else None
+    hosts = HostPool.from_file(hosts_file, strategy=host_strategy) if hosts_file else None
+    # Résultats ajoutés au journal au fil de l'eau (la dernière ligne d'un scl l'emporte)
+    records = RecordLog(output_csv)
+    store = ClubStore(sqlite_file) if sqlite_file else None
+    # Clubs de la plage écrits au fil de l'eau, fusionnés dans l'export en fin de plage
+    run_sink = ParquetSink(run_file_path(parquet_file)) if parquet_file else None
     
-    with SCLScraper(headless=True, slow_mo=0) as scraper:
+    with SCLScraper(headless=True, slow_mo=0, archive=archive, negative_cache=negative_cache,
+                    rate_limiter=rate_limiter, retry_policy=retry_policy, hosts=hosts) as scraper:
         clubs_found = []
         clubs_not_found = []
         
-        # Collecter toutes les données (existantes + nouvelles)
-        all_data = existing_data.copy()
+        # Échecs transitoires retentés en fin de plage (pas d'entrée vide écrite pour eux)
+        retry_queue = RetryQueue(retry_policy)
+        # Issue de chaque numéro, reportée dans le point de reprise une fois la ligne écrite
+        outcomes = {}
+        interrupted = False
+        
+        def record_outcome(scl, status):
+            outcomes[scl] = status
+            if checkpoint is not None:
+                checkpoint.record(scl, status)
+        
+        def record_result(scl, club, club_time):
+            if club:
+                print(f"✅ {club.nom} ({club_time:.2f}s)")
+                print(f"       📋 Affiliation: {club.numero_affiliation}")
+                print(f"       📧 Email: {club.email or 'N/A'}")
+                print(f"       📞 Téléphone: {club.telephone or 'N/A'}")
+                print(f"       📍 Adresse: {club.adresse or 'N/A'}")
+                print(f"       🔗 URL: {club.url_detail}")
+                
+                # Mettre à jour ou créer l'entrée (surcharge si existe)
+                records.append({
+                    'scl': str(scl),
+                    'nom': club.nom,
+                    'numero_affiliation': club.numero_affiliation or '',
+                    'email': club.email or '',
+                    'telephone': club.telephone or '',
+                    'adresse': club.adresse or '',
+                    'url_detail': club.url_detail or '',
+                    'temps_extraction': f"{club_time:.2f}"
+                })
+                
+                clubs_found.append({
+                    'scl': scl,
+                    'club': club,
+                    'time': club_time
+                })
+            else:
+                print(f"❌ Aucun club ({club_time:.2f}s)")
+                clubs_not_found.append(scl)
+                
+                # Mettre à jour ou créer l'entrée vide (surcharge si existe)
+                records.append({
+                    'scl': str(scl),
+                    'nom': '',
+                    'numero_affiliation': '',
+                    'email': '',
+                    'telephone': '',
+                    'adresse': '',
+                    'url_detail': '',
+                    'temps_extraction': f"{club_time:.2f}"
+                })
         
         for i, scl in enumerate(scl_list, 1):
             club_start = time.time()
             print(f"  [{i}/{len(scl_list)}] Test scl={scl}...", end=" ", flush=True)
             
             try:
-                club = scraper.extract_club_by_scl(scl)
+                result = scraper.fetch_club(scl, base_url)
                 club_time = time.time() - club_start
                 
-                if club:
-                    print(f"✅ {club.nom} ({club_time:.2f}s)")
-                    print(f"       📋 Affiliation: {club.numero_affiliation}")
-                    print(f"       📧 Email: {club.email or 'N/A'}")
-                    print(f"       📞 Téléphone: {club.telephone or 'N/A'}")
-                    print(f"       📍 Adresse: {club.adresse or 'N/A'}")
-                    print(f"       🔗 URL: {club.url_detail}")
-                    
-                    # Mettre à jour ou créer l'entrée (surcharge si existe)
-                    all_data[scl] = {
-                        'scl': str(scl),
-                        'nom': club.nom,
-                        'numero_affiliation': club.numero_affiliation or '',
-                        'email': club.email or '',
-                        'telephone': club.telephone or '',
-                        'adresse': club.adresse or '',
-                        'url_detail': club.url_detail or '',
-                        'temps_extraction': f"{club_time:.2f}"
-                    }
-                    
-                    clubs_found.append({
-                        'scl': scl,
-                        'club': club,
-                        'time': club_time
-                    })
+                if result.status == STATUS_TRANSIENT:
+                    if retry_queue.record(result):
+                        # Plus de tentative permise (--max-attempts 1): numéro à relancer plus tard
+                        record_outcome(scl, result.status)
+                        print(f"⚠️  {result.error}, abandon ({club_time:.2f}s)")
+                    else:
+                        print(f"🔁 {result.error}, nouvelle tentative en fin de plage ({club_time:.2f}s)")
                 else:
-                    print(f"❌ Aucun club ({club_time:.2f}s)")
-                    clubs_not_found.append(scl)
-                    
-                    # Mettre à jour ou créer l'entrée vide (surcharge si existe)
-                    all_data[scl] = {
-                        'scl': str(scl),
-                        'nom': '',
-                        'numero_affiliation': '',
-                        'email': '',
-                        'telephone': '',
-                        'adresse': '',
-                        'url_detail': '',
-                        'temps_extraction': f"{club_time:.2f}"
-                    }
+                    record_result(scl, result.club, club_time)
+                    if store is not None:
+                        store.record(result, club_time)
+                    if run_sink is not None:
+                        run_sink.record(result, club_time)
+                    record_outcome(scl, result.status)
                 
             except KeyboardInterrupt:
                 print("\n\n⚠️  Interruption utilisateur")
+                interrupted = True
                 break
             except Exception as e:
                 club_time = time.time() - club_start
                 print(f"❌ Erreur: {e} ({club_time:.2f}s)")
                 clubs_not_found.append(scl)
+                record_outcome(scl, STATUS_ERROR)
             
             print()
         
-        # Écrire toutes les données dans le CSV (surcharge complète)
-        fieldnames = ['scl', 'nom', 'numero_affiliation', 'email', 'telephone', 'adresse', 'url_detail', 'temps_extraction']
-        with open(output_csv, 'w', encoding='utf-8', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Trier par SCL pour un ordre cohérent
-            for scl_key in sorted(all_data.keys()):
-                writer.writerow(all_data[scl_key])
+        if len(retry_queue) and not interrupted:
+            print(f"🔁 Nouvelles tentatives pour {len(retry_queue)} numéros en échec transitoire...\n")
+            club_start = time.time()
+            try:
+                for result in retry_queue.drain(lambda scl: scraper.fetch_club(scl, base_url)):
+                    if result.status != STATUS_TRANSIENT:
+                        print(f"  Reprise scl={result.scl}...", end=" ", flush=True)
+                        record_result(result.scl, result.club, time.time() - club_start)
+                        if store is not None:
+                            store.record(result, time.time() - club_start)
+                        if run_sink is not None:
+                            run_sink.record(result, time.time() - club_start)
+                        print()
+                    record_outcome(result.scl, result.status)
+                    club_start = time.time()
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Interruption utilisateur")
+                interrupted = True
+        
+        # Fusion dans le CSV trié si le journal est assez gros (ou si demandé)
+        records.close(compact)
+        if store is not None:
+            store.close()
+        # Export du CSV complet: cette plage n'en est souvent qu'une partie
+        parquet = None
+        if run_sink is not None:
+            if interrupted:
+                run_sink.abort()
+            else:
+                run_sink.close()
+                parquet = export_csv(output_csv, parquet_file, run_file=run_sink.path)
+        
+        if checkpoint is not None:
+            if interrupted:
+                checkpoint.close()
+                print(f"🧾 Point de reprise: {checkpoint_file} (relancer pour reprendre)\n")
+            else:
+                checkpoint.remove()
         
         total_time = time.time() - start_time
         avg_time = total_time / len(scl_list)
@@ -140,6 +242,10 @@ def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.c
         print(f"❌ Clubs non trouvés: {len(clubs_not_found)}")
         if clubs_not_found:
             print(f"   Numéros: {clubs_not_found[:10]}{'...' if len(clubs_not_found) > 10 else ''}")
+        if retry_queue.attempts:
+            print(f"🔁 Reprises: {retry_queue.summary()}")
+            if retry_queue.given_up:
+                print(f"   ⚠️  Non résolus (à relancer): {sorted(retry_queue.given_up)[:10]}")
         print()
         print("⏱️  PERFORMANCE")
         print(f"   Temps total: {total_time:.2f}s")
@@ -161,6 +267,27 @@ def scrape_range(start_scl: int, end_scl: int, output_csv: str = "clubs_france.c
             print()
         
         print(f"💾 Résultats sauvegardés dans: {output_csv}")
+        print(f"📝 Journal: {records.summary()}")
+        if store is not None:
+            print(f"🗄️  SQLite: {store.upserted} clubs écrits, {store.deleted} supprimés dans {sqlite_file}")
+        if parquet is not None:
+            print(f"📊 Parquet: {parquet.summary()}")
+        elif parquet_file:
+            print(f"📊 Parquet: {parquet_file} inchangé (plage interrompue)")
+        if archive is not None:
+            archive.close()
+            print(f"📦 Archive: {archive.summary()}")
+        if negative_cache is not None:
+            negative_cache.compact()
+            print(f"🚫 Cache négatif: {negative_cache.summary()}")
+        if rate_limiter is not None:
+            rate_limiter.close()
+            print(f"🚦 Débit: {rate_limiter.summary()}")
+        if hosts is not None:
+            print(f"🌐 Hôtes: {hosts.summary()}")
+        
+        errors = sum(1 for status in outcomes.values() if status in (STATUS_ERROR, STATUS_TRANSIENT))
+        return {'found': len(clubs_found), 'tested': len(outcomes), 'errors': errors, 'interrupted': interrupted}
 
 if __name__ == "__main__":
     import argparse
@@ -170,8 +297,16 @@ if __name__ == "__main__":
     parser.add_argument('end', type=int, help='Numéro SCL de fin')
     parser.add_argument('output', type=str, nargs='?', default='clubs_france.csv',
                        help='Fichier CSV de sortie (défaut: clubs_france.csv)')
+    parser.add_argument('--archive', type=str, default=None,
+                       help='Répertoire où archiver les pages récupérées (re-parsing hors ligne)')
+    parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                       help='URL de base (peu importe, le scl est unique)')
+    add_scraper_arguments(parser)
+    parser.add_argument('--compact', action='store_true',
+                       help='Fusionner le journal <sortie>.log dans le CSV en fin de plage, quelle que soit sa taille')
     
     args = parser.parse_args()
     
-    scrape_range(args.start, args.end, args.output)
+    scrape_range(args.start, args.end, output_csv=args.output, archive_dir=args.archive, base_url=args.base_url,
+                 compact=True if args.compact else None, **ScraperOptions.from_args(args).as_kwargs())
 
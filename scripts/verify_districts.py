@@ -3,10 +3,15 @@ Script pour vérifier et générer le fichier JSON des URLs de districts FFF val
 Vérifie que chaque URL retourne un status 200 avant de l'ajouter au JSON.
 """
 
+import os
+import sys
 import requests
 import json
-import time
-from typing import Dict
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limit import RateLimiter
 
 # Liste des districts français avec leurs noms probables
 DISTRICTS = {
@@ -121,13 +126,14 @@ VARIANTES = {
 }
 
 
-def verify_url(url: str, timeout: int = 10) -> bool:
+def verify_url(url: str, timeout: int = 10, rate_limiter: Optional[RateLimiter] = None) -> bool:
     """
     Vérifie si une URL retourne un status 200.
     
     Args:
         url: URL à vérifier
         timeout: Timeout en secondes
+        rate_limiter: Limiteur de débit (une requête réservée avant l'envoi)
         
     Returns:
         True si l'URL est valide (status 200), False sinon
@@ -136,6 +142,8 @@ def verify_url(url: str, timeout: int = 10) -> bool:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
         response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
         return response.status_code == 200
     except Exception as e:
@@ -143,13 +151,14 @@ def verify_url(url: str, timeout: int = 10) -> bool:
         return False
 
 
-def find_valid_url(district_name: str, base_name: str) -> str:
+def find_valid_url(district_name: str, base_name: str, rate_limiter: Optional[RateLimiter] = None) -> str:
     """
     Trouve l'URL valide pour un district en testant différentes variantes.
     
     Args:
         district_name: Nom du district (clé)
         base_name: Nom de base pour l'URL
+        rate_limiter: Limiteur de débit appliqué à chaque requête
         
     Returns:
         URL valide ou None
@@ -157,7 +166,7 @@ def find_valid_url(district_name: str, base_name: str) -> str:
     # Test de la variante principale
     url = f"https://{base_name}.fff.fr/les-clubs/"
     print(f"  Test: {url}")
-    if verify_url(url):
+    if verify_url(url, rate_limiter=rate_limiter):
         print(f"  ✅ URL valide trouvée!")
         return url
     
@@ -167,20 +176,25 @@ def find_valid_url(district_name: str, base_name: str) -> str:
             if variante != base_name:
                 url = f"https://{variante}.fff.fr/les-clubs/"
                 print(f"  Test variante: {url}")
-                if verify_url(url):
+                if verify_url(url, rate_limiter=rate_limiter):
                     print(f"  ✅ URL valide trouvée (variante)!")
                     return url
     
     return None
 
 
-def generate_districts_json(output_file: str = "districts_urls.json"):
+def generate_districts_json(output_file: str = "districts_urls.json",
+                            rate_limiter: Optional[RateLimiter] = None):
     """
     Génère le fichier JSON des districts avec leurs URLs valides.
     
     Args:
         output_file: Nom du fichier de sortie
+        rate_limiter: Limiteur de débit (défaut: 1 requête/s pour l'ensemble de fff.fr)
     """
+    # Rate limiting pour ne pas surcharger les serveurs: tous les districts sont sur fff.fr
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(1.0, burst=1, per_domain=True)
     valid_districts: Dict[str, str] = {}
     
     print("🔍 Vérification des URLs des districts FFF...\n")
@@ -192,15 +206,12 @@ def generate_districts_json(output_file: str = "districts_urls.json"):
         current += 1
         print(f"[{current}/{total}] {district_name}...")
         
-        url = find_valid_url(district_name, base_name)
+        url = find_valid_url(district_name, base_name, rate_limiter)
         
         if url:
             valid_districts[district_name] = url
         else:
             print(f"  ⚠️  Aucune URL valide trouvée pour {district_name}")
-        
-        # Rate limiting pour ne pas surcharger les serveurs
-        time.sleep(1)
         print()
     
     # Sauvegarde du JSON
@@ -209,6 +220,7 @@ def generate_districts_json(output_file: str = "districts_urls.json"):
     
     print(f"\n✅ Fichier généré: {output_file}")
     print(f"📊 Districts valides trouvés: {len(valid_districts)}/{total}")
+    print(f"🚦 Débit: {rate_limiter.summary()}")
     
     return valid_districts
 
@@ -0,0 +1,130 @@
+"""
+Accès aux données JSON d'un club (API appelée par l'application Angular).
+
+La page `/recherche-clubs?scl=N` est une SPA: les données du club viennent
+d'un endpoint JSON interrogé avec le scl. Ce module centralise l'URL de cet
+endpoint et la conversion de sa réponse en ClubData. Si la forme de la
+réponse n'est pas reconnue, `club_from_payload` retourne None et l'appelant
+retombe sur l'extraction par le navigateur.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+from club_data import ClubData
+
+# Endpoint club de l'API DOFA de la FFF (configurable via --api-url)
+DEFAULT_API_URL_TEMPLATE = "https://api-dofa.fff.fr/api/clubs/{scl}"
+
+# Clés acceptées pour chaque champ, par ordre de priorité
+NAME_KEYS = ('name', 'nom', 'club_name', 'libelle')
+AFFILIATION_KEYS = ('affiliation_number', 'numero_affiliation', 'affiliation', 'cl_cod')
+EMAIL_PRINCIPAL_KEYS = ('email_principal', 'email', 'mail')
+EMAIL_OFFICIEL_KEYS = ('email_officiel', 'official_email')
+EMAIL_AUTRE_KEYS = ('email_autre', 'other_email')
+PHONE_KEYS = ('telephone_travail', 'phone', 'telephone', 'tel', 'telephone_domicile',
+              'mobile_personnel', 'mobile', 'telephone_autre')
+ADDRESS_LINE_KEYS = ('address1', 'address2', 'address3')
+POSTAL_CODE_KEYS = ('postal_code', 'code_postal', 'zip_code')
+CITY_KEYS = ('distributor_office', 'city', 'ville', 'localite')
+
+# Réponses XHR portant les données du club: ".../clubs/5000" ou "...?scl=5000" / "?cl_no=5000"
+# (hors document de la page elle-même, /recherche-clubs?scl=...)
+CLUB_PAYLOAD_URL_PATTERN = r'/clubs?/{scl}(?:[/?#]|$)|[?&](?:scl|cl_no)={scl}(?:&|$)'
+
+
+def is_club_payload_url(url: str, scl: int, pattern: str = CLUB_PAYLOAD_URL_PATTERN) -> bool:
+    """Indique si une URL de requête XHR correspond aux données JSON du club `scl`"""
+    if '/recherche-clubs' in url:
+        return False
+    return re.search(pattern.format(scl=scl), url) is not None
+
+
+def api_url(scl: int, template: str = DEFAULT_API_URL_TEMPLATE) -> str:
+    """URL de l'endpoint JSON pour un scl"""
+    return template.format(scl=scl)
+
+
+def _unwrap(payload: Any) -> Optional[Dict[str, Any]]:
+    """Retire les enveloppes courantes ({"data": {...}}, {"hydra:member": [...]}, [...])"""
+    for _ in range(3):
+        if isinstance(payload, list):
+            payload = payload[0] if len(payload) == 1 else None
+        elif isinstance(payload, dict):
+            for key in ('data', 'club', 'hydra:member', 'results'):
+                if key in payload and isinstance(payload[key], (dict, list)):
+                    payload = payload[key]
+                    break
+            else:
+                return payload
+        else:
+            return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _first(data: Dict[str, Any], keys) -> Optional[str]:
+    """Première valeur non vide parmi les clés, convertie en texte"""
+    for key in keys:
+        value = data.get(key)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return None
+
+
+def _format_adresse(data: Dict[str, Any]) -> Optional[str]:
+    """Reconstruit l'adresse au format du site: "rue - 32000 - VILLE" """
+    direct = _first(data, ('adresse', 'address'))
+    if direct:
+        return re.sub(r'\s+', ' ', direct)
+    street = ' '.join(str(data[k]).strip() for k in ADDRESS_LINE_KEYS if data.get(k))
+    parts = [p for p in (street, _first(data, POSTAL_CODE_KEYS), _first(data, CITY_KEYS)) if p]
+    if not parts:
+        return None
+    return re.sub(r'\s+', ' ', ' - '.join(parts))
+
+
+def club_from_payload(payload: Any, url_detail: str) -> Optional[ClubData]:
+    """
+    Convertit la réponse JSON de l'endpoint club en ClubData.
+
+    Args:
+        payload: Corps JSON décodé
+        url_detail: URL de la page club (gardée dans la sortie)
+
+    Returns:
+        ClubData, ou None si la forme de la réponse n'est pas reconnue
+        (pas de nom ou pas de numéro d'affiliation)
+    """
+    data = _unwrap(payload)
+    if not data:
+        return None
+
+    nom = _first(data, NAME_KEYS)
+    numero_affiliation = _first(data, AFFILIATION_KEYS)
+    if not nom or numero_affiliation is None or not numero_affiliation.isdigit():
+        return None
+
+    email_principal = _first(data, EMAIL_PRINCIPAL_KEYS)
+    email_officiel = _first(data, EMAIL_OFFICIEL_KEYS)
+    email_autre = _first(data, EMAIL_AUTRE_KEYS)
+    if email_autre:
+        # Peut contenir plusieurs emails séparés par des virgules
+        email_autre = email_autre.split(',')[0].strip()
+
+    telephone = None
+    phone_raw = _first(data, PHONE_KEYS)
+    if phone_raw:
+        phone_clean = re.sub(r'[^\d]', '', phone_raw)
+        if len(phone_clean) >= 6:
+            telephone = phone_clean
+
+    return ClubData(
+        nom=nom,
+        numero_affiliation=numero_affiliation,
+        email=email_principal or email_officiel or email_autre,
+        telephone=telephone,
+        adresse=_format_adresse(data),
+        url_detail=url_detail,
+        email_officiel=email_officiel,
+        email_principal=email_principal
+    )
@@ -0,0 +1,45 @@
+"""
+Structure de données d'un club, partagée par tous les scrapers.
+
+Module sans dépendance (pas de Playwright) pour pouvoir être importé
+par les backends sans navigateur.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ClubData:
+    """Structure de données pour un club"""
+    nom: str
+    numero_affiliation: Optional[str] = None
+    email: Optional[str] = None  # Coalesce: email_principal ou email_officiel
+    telephone: Optional[str] = None
+    adresse: Optional[str] = None
+    url_detail: Optional[str] = None
+
+    # Champs internes pour extraction (non utilisés dans la sortie finale)
+    email_officiel: Optional[str] = None
+    email_principal: Optional[str] = None
+
+
+# Issue d'une tentative d'extraction
+STATUS_FOUND = 'found'          # club extrait
+STATUS_ABSENT = 'absent'        # absence confirmée par le site (message "aucun résultat", 404 de l'API)
+STATUS_TRANSIENT = 'transient'  # timeout, 429/5xx, page non rendue: à retenter plus tard
+STATUS_ERROR = 'error'          # échec qui se reproduirait (page club non reconnue...): pas de nouvelle tentative
+
+
+@dataclass
+class ScrapeResult:
+    """Résultat d'une tentative d'extraction pour un scl"""
+    scl: int
+    status: str
+    club: Optional[ClubData] = None
+    error: Optional[str] = None
+
+    @property
+    def is_final(self) -> bool:
+        """Vrai si une nouvelle tentative ne changerait rien (club trouvé, absent ou erreur durable)"""
+        return self.status != STATUS_TRANSIENT
@@ -0,0 +1,499 @@
+"""
+Heuristiques d'extraction des champs d'un club, indépendantes du navigateur.
+
+Les scrapers récupèrent un snapshot de la page en un seul appel
+`page.evaluate(SNAPSHOT_JS, SNAPSHOT_ARGS)` (HTML, titres et positions,
+adresse du siège, champs étiquetés), puis `club_from_snapshot` applique les
+heuristiques côté Python.
+
+Le snapshot est limité au composant club (`app-club`) quand il est présent
+et contient le numéro d'affiliation: l'en-tête, la navigation, le pied de
+page et les scripts ne sont ni copiés hors du navigateur ni parcourus par
+les regex. Sinon, tout le document est utilisé.
+"""
+
+import itertools
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from club_data import ClubData
+
+
+class ExclusionMatcher:
+    """
+    Filtre précompilé des titres de navigation.
+
+    Un seul `search` pour tous les mots exclus, puis la règle "district de":
+    exclut "district de la X" mais pas "CLUB DISTRICT X".
+    """
+
+    def __init__(self, words: List[str]):
+        self.words = list(words)
+        self._words_re = re.compile('|'.join(re.escape(word) for word in self.words))
+
+    def contains_word(self, text_lower: str) -> bool:
+        return self._words_re.search(text_lower) is not None
+
+    def is_excluded(self, text_lower: str) -> bool:
+        if self.contains_word(text_lower):
+            return True
+        if 'district de' in text_lower:
+            return 'district de la' in text_lower or 'club district' not in text_lower
+        return False
+
+
+# Mots exclus lors de la recherche du nom (éléments de navigation du site)
+NOM_EXCLUDED_H1 = ExclusionMatcher(['accueil', 'gironde', 'paris', 'ensemble', 'écrivons'])
+NOM_EXCLUDED_REGEX = ExclusionMatcher(['accueil', 'gironde', 'paris',
+                                       'ensemble', 'écrivons', 'résultats', 'calendrier'])
+NOM_EXCLUDED_H2 = ExclusionMatcher(['accueil', 'ligue', 'gironde', 'paris',
+                                    'ensemble', 'écrivons', 'résultats', 'calendrier',
+                                    'équipes', 'staff', 'terrains', 'siège social'])
+NOM_EXCLUDED_H2_ALL = ExclusionMatcher(['accueil', 'ligue', 'gironde', 'paris',
+                                        'ensemble', 'écrivons', 'n°affiliation', 'résultats',
+                                        'calendrier', 'équipes', 'staff', 'terrains', 'siège social',
+                                        'installations', 'rencontres', 'prochaines', 'dernières'])
+NOM_SELECTORS = [
+    'h1:not([class*="title"]):not([class*="slogan"])',
+    '[class*="club-name"]',
+    '[class*="name-club"]',
+    'strong',
+]
+
+# Conteneurs de la fiche club, par ordre de préférence (portée de l'extraction)
+CLUB_SCOPE_SELECTORS = ['app-club']
+SCOPE_DOCUMENT = 'document'
+
+
+def is_excluded_heading(text_lower: str, excluded: ExclusionMatcher) -> bool:
+    """Indique si un titre correspond à un élément de navigation"""
+    return excluded.is_excluded(text_lower)
+
+
+def is_plausible_nom(text: str, require_words: bool = True) -> bool:
+    """Vérifie qu'un texte a la forme d'un nom de club"""
+    if not (text and len(text) > 5 and len(text) < 100 and any(c.isalpha() for c in text)):
+        return False
+    if require_words:
+        return len(text.split()) > 1 or len(text) > 8
+    return True
+
+
+# Table des libellés repérés en un seul passage sur la page.
+# L'ordre compte: les libellés longs ("Téléphone travail") avant les courts ("Téléphone").
+LABELS = [
+    ('email_principal', r'Email principal'),
+    ('email_officiel', r'Email officiel'),
+    ('email_autre', r'Email autre'),
+    ('telephone_travail', r'Téléphone travail'),
+    ('telephone_domicile', r'Téléphone domicile'),
+    ('mobile_personnel', r'Mobile personnel'),
+    ('telephone_autre', r'Téléphone autre'),
+    ('telephone', r'Téléphone'),
+    ('tel', r'Tel'),
+    ('adresse', r'Adresse'),
+    ('siege', r'Siège social'),
+    ('affiliation', r'N[°\s]*affiliation'),
+]
+# La lookahead sur la première lettre évite d'essayer toutes les alternatives à chaque position
+LABEL_SCAN_RE = re.compile(
+    '(?=[' + ''.join(sorted({label[0] for _, label in LABELS})) + '])(?:'
+    + '|'.join(f'(?P<{key}>{label})' for key, label in LABELS) + ')',
+    re.IGNORECASE)
+
+_EMAIL = r'([a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+_EMAIL_LOOSE = r'([^\s<>]+@[^\s<>]+)'
+_PHONE = r'([0-9\s\.\-\(\)]{6,})'
+
+
+def _rules(*rules: Tuple[bool, str]) -> List[Tuple[bool, 're.Pattern']]:
+    """Compile les règles de valeur: (libellé précédé de <b>, motif après le libellé)"""
+    return [(needs_bold, re.compile(pattern, re.IGNORECASE)) for needs_bold, pattern in rules]
+
+
+# Motifs appliqués juste après chaque libellé, par ordre de priorité
+EMAIL_RULES = _rules((False, r'[:\s]*' + _EMAIL), (True, r'</b>\s*:\s*' + _EMAIL),
+                     (False, r'[:\s]*' + _EMAIL_LOOSE))
+EMAIL_OFFICIEL_RULES = EMAIL_RULES[:2]
+PHONE_RULES = _rules((False, r'\s*:\s*' + _PHONE), (True, r'</b>\s*:\s*' + _PHONE),
+                     (False, r'[:\s]+' + _PHONE))
+PHONE_GENERIC_RULES = _rules((False, r'\s*:\s*' + _PHONE))
+AFFILIATION_RULES = _rules((False, r'[:\s]*(\d+)'))
+ADRESSE_RULES = _rules((True, r'\s*:</b>\s*<span[^>]*>([^<]+)</span>'),
+                       (False, r'\s*:\s*([^<\n]+(?:-\s*\d{5}\s*-\s*[A-Z\s]+)?)'))
+SIEGE_RULES = _rules((False, r'[:\s]*([^<]+)'))
+
+# Nom juste avant "N°affiliation" (motifs ancrés sur le début du libellé)
+NOM_WINDOW = 600
+NOM_RULES = [
+    # Pattern 1: Nom dans h1 avant h2 avec "N°affiliation"
+    re.compile(r'<h1[^>]*>([A-Z][A-Z\s\.\-\']{5,80}?)</h1>\s*<h2[^>]*>\Z', re.IGNORECASE),
+    # Pattern 2: Nom avant "N°affiliation" dans h2
+    re.compile(r'<h2[^>]*>([A-Z][A-Z\s\.\-\']{5,80}?)</h2>\s*\Z', re.IGNORECASE),
+    # Pattern 3: Nom en majuscules avant "N°affiliation" (texte brut)
+    re.compile(r'([A-Z][A-Z\s\.\-\']{5,80}?)\s*\Z', re.IGNORECASE),
+]
+# Les patterns 2 et 3 exigent un numéro après le libellé
+NOM_RULES_NEED_NUMBER = (False, True, True)
+
+_NON_DIGITS_RE = re.compile(r'[^\d]')
+_TAGS_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'\s+')
+_TITLE_SPLIT_RE = re.compile(r'[|\-]')
+
+
+class LabelScan:
+    """Positions de tous les libellés d'une page, trouvées en un seul passage"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.spans: Dict[str, List[Tuple[int, int]]] = {}
+        for match in LABEL_SCAN_RE.finditer(text):
+            self.spans.setdefault(match.lastgroup, []).append(match.span())
+
+    def _bold_before(self, start: int) -> bool:
+        return self.text[max(0, start - 3):start].lower() == '<b>'
+
+    def values(self, key: str, rules) -> Iterator[str]:
+        """
+        Valeurs trouvées après le libellé `key`, règle par règle puis dans l'ordre de la page
+        (même ordre que des `re.search` successifs sur chaque motif complet).
+        """
+        spans = self.spans.get(key)
+        if not spans:
+            return
+        for needs_bold, pattern in rules:
+            for start, end in spans:
+                if needs_bold and not self._bold_before(start):
+                    continue
+                match = pattern.match(self.text, end)
+                if match:
+                    yield match.group(1)
+
+    def first_value(self, key: str, rules) -> Optional[str]:
+        return next(self.values(key, rules), None)
+
+    def first_per_rule(self, key: str, rules) -> Iterator[str]:
+        """Première valeur de chaque règle (équivalent d'un `re.search` par motif)"""
+        for rule in rules:
+            value = self.first_value(key, [rule])
+            if value is not None:
+                yield value
+
+
+def _scan(page_text: str, scan: Optional[LabelScan]) -> LabelScan:
+    return scan if scan is not None and scan.text is page_text else LabelScan(page_text)
+
+
+def extract_affiliation(page_text: str, scan: Optional[LabelScan] = None) -> Optional[str]:
+    """Extrait le numéro d'affiliation du HTML, ou None si absent"""
+    return _scan(page_text, scan).first_value('affiliation', AFFILIATION_RULES)
+
+
+def extract_nom_from_html(page_text: str, scan: Optional[LabelScan] = None) -> Optional[str]:
+    """Cherche le nom du club juste avant le libellé "N°affiliation" dans le HTML"""
+    scan = _scan(page_text, scan)
+    spans = scan.spans.get('affiliation') or []
+
+    for pattern, needs_number in zip(NOM_RULES, NOM_RULES_NEED_NUMBER):
+        for start, end in spans:
+            if needs_number and not AFFILIATION_RULES[0][1].match(page_text, end):
+                continue
+            match = pattern.search(page_text, max(0, start - NOM_WINDOW), start)
+            if not match:
+                continue
+            potential_nom = match.group(1).strip()
+
+            # Filtrer les faux positifs ("district" n'est pas dans la liste,
+            # donc "CLUB DISTRICT X" reste accepté)
+            if (not NOM_EXCLUDED_REGEX.contains_word(potential_nom.lower()) and
+                    is_plausible_nom(potential_nom)):
+                return potential_nom
+            # Comme re.search: seul le premier match de chaque motif est considéré
+            break
+    return None
+
+
+def extract_nom_from_title(title: Optional[str]) -> Optional[str]:
+    """Extrait le nom du titre de la page (généralement avant le premier | ou -)"""
+    if not title:
+        return None
+    title_parts = _TITLE_SPLIT_RE.split(title)
+    if title_parts:
+        potential_nom = title_parts[0].strip()
+        if (len(potential_nom) > 5 and
+            'recherche' not in potential_nom.lower() and
+            'district' not in potential_nom.lower()):
+            return potential_nom
+    return None
+
+
+def _valid_phone(values: Iterable[str]) -> Optional[str]:
+    """Premier numéro d'au moins 6 chiffres (certains numéros courts existent)"""
+    for phone_raw in values:
+        phone_clean = _NON_DIGITS_RE.sub('', phone_raw)
+        if len(phone_clean) >= 6:
+            return phone_clean
+    return None
+
+
+def extract_emails(page_text: str, scan: Optional[LabelScan] = None
+                   ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Extrait les emails du HTML.
+
+    Returns:
+        Tuple (email, email_principal, email_officiel) où email est le coalesce
+        email_principal > email_officiel > email_autre
+    """
+    scan = _scan(page_text, scan)
+    email_principal = scan.first_value('email_principal', EMAIL_RULES)
+    if email_principal:
+        email_principal = email_principal.strip()
+    email_officiel = scan.first_value('email_officiel', EMAIL_OFFICIEL_RULES)
+    if email_officiel:
+        email_officiel = email_officiel.strip()
+    email_autre = scan.first_value('email_autre', EMAIL_RULES)
+    if email_autre:
+        # Peut contenir plusieurs emails séparés par des virgules: prendre le premier
+        email_autre = email_autre.strip().split(',')[0].strip()
+
+    # Coalesce: email_principal > email_officiel > email_autre
+    email = email_principal or email_officiel or email_autre
+    return email, email_principal, email_officiel
+
+
+def extract_telephone(page_text: str, scan: Optional[LabelScan] = None) -> Optional[str]:
+    """Extrait le téléphone du HTML (travail > domicile > mobile > autre > générique)"""
+    scan = _scan(page_text, scan)
+    telephone_travail = _valid_phone(scan.first_per_rule('telephone_travail', PHONE_RULES))
+    telephone_domicile = _valid_phone(scan.first_per_rule('telephone_domicile', PHONE_RULES))
+    mobile_personnel = _valid_phone(scan.first_per_rule('mobile_personnel', PHONE_RULES))
+    # "Téléphone autre" peut apparaître plusieurs fois: première occurrence valide
+    telephone_autre = _valid_phone(scan.values('telephone_autre', PHONE_RULES))
+
+    # Chercher "Téléphone" / "Tel" générique (priorité 5)
+    if not telephone_travail and not telephone_domicile and not mobile_personnel and not telephone_autre:
+        telephone_autre = (_valid_phone(scan.first_per_rule('telephone', PHONE_GENERIC_RULES)) or
+                           _valid_phone(scan.first_per_rule('tel', PHONE_GENERIC_RULES)))
+
+    # Coalesce: travail > domicile > mobile > autre
+    return telephone_travail or telephone_domicile or mobile_personnel or telephone_autre
+
+
+def extract_adresse(page_text: str, scan: Optional[LabelScan] = None) -> Optional[str]:
+    """Extrait l'adresse du siège social du HTML"""
+    scan = _scan(page_text, scan)
+    adresse = None
+    candidates = itertools.chain(scan.first_per_rule('adresse', ADRESSE_RULES),
+                                 scan.first_per_rule('siege', SIEGE_RULES))
+    for raw in candidates:
+        # Nettoyer l'adresse
+        adresse = _SPACES_RE.sub(' ', _TAGS_RE.sub('', raw).strip())
+        if len(adresse) > 10:  # Vérifier que c'est une adresse valide
+            break
+    return adresse
+
+
+# Snapshot de la page en un seul appel `page.evaluate`: HTML, titres avec
+# leur position, blocs candidats pour le nom, adresse du siège et champs
+# de contact étiquetés ("<b>Email principal</b> : ...").
+SNAPSHOT_JS = """
+({selectors, scopes}) => {
+    const text = (el) => (el.innerText || el.textContent || '').trim();
+    const top = (el) => {
+        const rect = el.getBoundingClientRect();
+        return (rect.width || rect.height) ? rect.top : null;
+    };
+
+    // Portée: composant club s'il porte le numéro d'affiliation, sinon tout le document
+    let root = document.documentElement;
+    let scope = 'document';
+    for (const selector of scopes) {
+        const el = document.querySelector(selector);
+        if (el && /N[°\\s]*affiliation/i.test(el.textContent)) {
+            root = el;
+            scope = selector;
+            break;
+        }
+    }
+
+    // Élément portant le texte "N° affiliation" (le plus profond)
+    let affilY = null;
+    const walker = document.createTreeWalker(scope === 'document' ? (document.body || document) : root, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        if (/N[°\\s]*affiliation/i.test(walker.currentNode.data)) {
+            affilY = top(walker.currentNode.parentElement);
+            break;
+        }
+    }
+
+    const candidates = {};
+    for (const selector of selectors) {
+        try {
+            candidates[selector] = Array.from(root.querySelectorAll(selector)).slice(0, 50).map(text);
+        } catch (e) {
+            candidates[selector] = [];
+        }
+    }
+
+    // Adresse: <b>Adresse :</b><span> Route de ... - 32000 - AUCH </span> dans .txt-map-siege
+    let siegeAddress = null;
+    for (const b of root.querySelectorAll('.txt-map-siege b')) {
+        if (/adresse/i.test(b.textContent)) {
+            const span = b.nextElementSibling;
+            if (span && span.tagName === 'SPAN') siegeAddress = text(span);
+            break;
+        }
+    }
+
+    // Champs étiquetés: texte du <b> puis texte des nœuds suivants jusqu'au prochain <b>/<br>
+    const fields = [];
+    for (const b of root.querySelectorAll('b, strong')) {
+        const label = b.textContent.replace(/\\s*:\\s*$/, '').trim();
+        if (!label || label.length > 40) continue;
+        let value = '';
+        for (let node = b.nextSibling; node; node = node.nextSibling) {
+            if (node.nodeType === 1 && (node.tagName === 'B' || node.tagName === 'STRONG' || node.tagName === 'BR')) break;
+            value += node.textContent;
+        }
+        value = value.replace(/^\\s*:\\s*/, '').trim();
+        if (value) fields.push([label, value]);
+    }
+
+    return {
+        html: root.outerHTML,
+        title: document.title,
+        scope: scope,
+        positions: 'layout',
+        h1: Array.from(root.querySelectorAll('h1')).map(text),
+        h2: Array.from(root.querySelectorAll('h2')).map((el) => ({text: text(el), y: top(el)})),
+        affil_y: affilY,
+        candidates: candidates,
+        siege_address: siegeAddress,
+        fields: fields,
+    };
+}
+"""
+
+# Argument de SNAPSHOT_JS
+SNAPSHOT_ARGS = {'selectors': NOM_SELECTORS, 'scopes': CLUB_SCOPE_SELECTORS}
+
+
+def nom_from_snapshot(snapshot: Dict[str, Any], scan: Optional[LabelScan] = None) -> Optional[str]:
+    """
+    Applique les stratégies d'extraction du nom à un snapshot de page.
+
+    Ordre: h1 (app-club), regex dans le HTML, h2 le plus proche au-dessus du
+    numéro d'affiliation, tous les h2, autres éléments, titre de la page.
+    """
+    # Stratégie 1: h1 (structure Angular: <h1>CLUB DISTRICT GERS</h1><h2>N°affiliation: 6504</h2>)
+    for text in snapshot.get('h1') or []:
+        text_lower = text.lower()
+        is_excluded = is_excluded_heading(text_lower, NOM_EXCLUDED_H1)
+        # Ne pas exclure si c'est "CLUB LIGUE" (ex: "CLUB LIGUE ALSACE")
+        if 'club ligue' in text_lower:
+            is_excluded = False
+        if not is_excluded and is_plausible_nom(text, require_words=False):
+            return text
+
+    # Stratégie 2: regex dans le HTML
+    nom = extract_nom_from_html(snapshot.get('html') or '', scan)
+    if nom:
+        return nom
+
+    h2_list = snapshot.get('h2') or []
+
+    # Stratégie 2 bis: h2 le plus proche au-dessus du numéro d'affiliation
+    affil_y = snapshot.get('affil_y')
+    if affil_y is not None:
+        # Positions à l'écran: h2 à moins de 300px; positions dans le document: h2 précédent
+        max_distance = 300 if snapshot.get('positions', 'layout') == 'layout' else float('inf')
+        closest_h2 = None
+        min_distance = float('inf')
+        for h2 in h2_list:
+            h2_y = h2.get('y')
+            if h2_y is not None and h2_y < affil_y and (affil_y - h2_y) < max_distance:
+                if affil_y - h2_y < min_distance:
+                    min_distance = affil_y - h2_y
+                    closest_h2 = h2
+        if closest_h2:
+            text = closest_h2['text']
+            if not is_excluded_heading(text.lower(), NOM_EXCLUDED_H2) and is_plausible_nom(text):
+                return text
+
+    # Tous les h2, filtrés
+    for h2 in h2_list:
+        text = h2['text']
+        if not is_excluded_heading(text.lower(), NOM_EXCLUDED_H2_ALL) and is_plausible_nom(text):
+            return text
+
+    # Autres éléments
+    candidates = snapshot.get('candidates') or {}
+    for selector in NOM_SELECTORS:
+        for text in candidates.get(selector) or []:
+            if not is_excluded_heading(text.lower(), NOM_EXCLUDED_H2) and is_plausible_nom(text):
+                return text
+
+    # Stratégie 3: titre de la page
+    return extract_nom_from_title(snapshot.get('title'))
+
+
+def fields_text(snapshot: Dict[str, Any]) -> str:
+    """Texte compact "Libellé : valeur" des champs de contact étiquetés"""
+    return "\n".join(f"{label} : {value}" for label, value in snapshot.get('fields') or [])
+
+
+def club_from_snapshot(snapshot: Dict[str, Any], url: str) -> Optional[ClubData]:
+    """
+    Construit ClubData à partir d'un snapshot de page.
+
+    Args:
+        snapshot: Résultat de SNAPSHOT_JS (ou équivalent construit hors navigateur)
+        url: URL de la page club
+
+    Returns:
+        ClubData, ou None si la page ne contient pas de club
+    """
+    page_text = snapshot.get('html') or ''
+
+    # Un seul passage sur la page pour repérer tous les libellés
+    page_scan = LabelScan(page_text)
+
+    # Chercher le numéro d'affiliation dans la page
+    numero_affiliation = extract_affiliation(page_text, page_scan)
+    if not numero_affiliation:
+        # Pas de club trouvé à ce numéro
+        return None
+
+    # Le numéro d'affiliation "0" est valide si un nom de club est trouvé
+    # (ex: "CLUB FEDERATION FRANCAISE DE FOOTBALL" a affiliation 0)
+    nom = nom_from_snapshot(snapshot, page_scan)
+    if not nom:
+        return None
+
+    # Emails et téléphone: d'abord sur les champs étiquetés (texte court), sinon sur tout le HTML
+    fields = fields_text(snapshot)
+    fields_scan = LabelScan(fields)
+    email, email_principal, email_officiel = extract_emails(fields, fields_scan)
+    if not email:
+        email, email_principal, email_officiel = extract_emails(page_text, page_scan)
+    telephone = extract_telephone(fields, fields_scan) or extract_telephone(page_text, page_scan)
+
+    # Adresse du siège social
+    adresse = snapshot.get('siege_address')
+    if adresse:
+        adresse = _SPACES_RE.sub(' ', adresse).strip()
+    if not adresse:
+        adresse = extract_adresse(page_text, page_scan)
+
+    return ClubData(
+        nom=nom,
+        numero_affiliation=numero_affiliation,
+        email=email,  # Coalesce: email_principal ou email_officiel
+        telephone=telephone,
+        adresse=adresse,
+        url_detail=url,
+        email_officiel=email_officiel,  # Gardé pour référence interne
+        email_principal=email_principal  # Gardé pour référence interne
+    )
@@ -0,0 +1,150 @@
+"""
+Parseur de pages club indépendant du navigateur.
+
+`ClubPageParser.parse(html, url)` reproduit l'extraction du scraper
+(nom, affiliation, email, téléphone, adresse) à partir du HTML seul, avec
+lxml. Il construit le même snapshot que SNAPSHOT_JS dans le navigateur,
+avec l'ordre dans le document à la place des positions à l'écran, puis
+applique les mêmes heuristiques (club_extraction.club_from_snapshot).
+Comme dans le navigateur, le snapshot est limité au composant club
+(CLUB_SCOPE_SELECTORS) quand il porte le numéro d'affiliation.
+
+Les scrapers Playwright ne font plus que récupérer la page: le parsing
+peut ainsi tourner hors ligne et sur tous les cœurs.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import lxml.html
+
+from club_data import ClubData
+from club_extraction import CLUB_SCOPE_SELECTORS, NOM_SELECTORS, SCOPE_DOCUMENT, club_from_snapshot
+
+# Équivalents XPath (relatifs à la portée) des sélecteurs CSS de NOM_SELECTORS
+NOM_SELECTORS_XPATH = {
+    'h1:not([class*="title"]):not([class*="slogan"])':
+        './/h1[not(contains(@class, "title")) and not(contains(@class, "slogan"))]',
+    '[class*="club-name"]': './/*[contains(@class, "club-name")]',
+    '[class*="name-club"]': './/*[contains(@class, "name-club")]',
+    'strong': './/strong',
+}
+
+# Équivalents XPath des sélecteurs CSS de CLUB_SCOPE_SELECTORS
+CLUB_SCOPE_XPATH = {
+    'app-club': '//app-club',
+}
+
+SIEGE_LABELS_XPATH = './/*[contains(concat(" ", normalize-space(@class), " "), " txt-map-siege ")]//b'
+
+AFFILIATION_RE = re.compile(r'N[°\s]*affiliation', re.IGNORECASE)
+
+# Balises qui terminent la valeur d'un champ étiqueté
+FIELD_STOP_TAGS = ('b', 'strong', 'br')
+
+
+def _text(element) -> str:
+    """Texte d'un élément, espaces normalisés (équivalent de innerText)"""
+    return ' '.join(element.text_content().split())
+
+
+class ClubPageParser:
+    """Extrait un ClubData d'une page club (HTML ou snapshot navigateur)"""
+
+    def parse(self, html: str, url: str) -> Optional[ClubData]:
+        """
+        Parse le HTML d'une page club.
+
+        Args:
+            html: HTML complet de la page
+            url: URL de la page club
+
+        Returns:
+            ClubData, ou None si la page ne contient pas de club
+        """
+        # Sortie rapide: sans numéro d'affiliation, pas besoin de construire l'arbre
+        if not html or not AFFILIATION_RE.search(html):
+            return None
+        return club_from_snapshot(self.snapshot(html), url)
+
+    def parse_snapshot(self, snapshot: Dict[str, Any], url: str) -> Optional[ClubData]:
+        """Parse un snapshot produit dans le navigateur par SNAPSHOT_JS"""
+        return club_from_snapshot(snapshot, url)
+
+    def snapshot(self, html: str) -> Dict[str, Any]:
+        """
+        Construit à partir du HTML le même snapshot que SNAPSHOT_JS.
+
+        Les positions (`y`, `affil_y`) sont des indices dans l'ordre du document.
+        """
+        doc = lxml.html.document_fromstring(html)
+        root, scope = self._scope(doc)
+
+        positions = {}
+        affil_y = None
+        for index, element in enumerate(root.iter()):
+            positions[element] = index
+            if affil_y is None and isinstance(element.tag, str):
+                if element.text and AFFILIATION_RE.search(element.text):
+                    affil_y = index
+                elif element.tail and AFFILIATION_RE.search(element.tail):
+                    # Texte qui suit l'élément: appartient au parent, juste après l'élément
+                    affil_y = index + 0.5
+
+        candidates = {
+            selector: [_text(el) for el in root.xpath(NOM_SELECTORS_XPATH[selector])[:50]]
+            for selector in NOM_SELECTORS
+        }
+
+        return {
+            'html': html if root is doc else lxml.html.tostring(root, encoding='unicode', with_tail=False),
+            'title': (doc.findtext('.//title') or '').strip(),
+            'scope': scope,
+            'positions': 'order',
+            'h1': [_text(el) for el in root.iter('h1')],
+            'h2': [{'text': _text(el), 'y': positions[el]} for el in root.iter('h2')],
+            'affil_y': affil_y,
+            'candidates': candidates,
+            'siege_address': self._siege_address(root),
+            'fields': self._fields(root),
+        }
+
+    def _scope(self, doc):
+        """Composant club portant le numéro d'affiliation, sinon le document entier"""
+        for selector in CLUB_SCOPE_SELECTORS:
+            for element in doc.xpath(CLUB_SCOPE_XPATH[selector])[:1]:
+                if AFFILIATION_RE.search(element.text_content()):
+                    return element, selector
+        return doc, SCOPE_DOCUMENT
+
+    def _siege_address(self, root) -> Optional[str]:
+        """<b>Adresse :</b><span> ... </span> dans .txt-map-siege"""
+        for label in root.xpath(SIEGE_LABELS_XPATH):
+            if 'adresse' in label.text_content().lower():
+                span = label.getnext()
+                if span is not None and span.tag == 'span':
+                    return span.text_content().strip()
+                return None
+        return None
+
+    def _fields(self, root) -> List[List[str]]:
+        """Champs étiquetés: texte du <b> puis texte qui suit jusqu'au prochain <b>/<br>"""
+        fields = []
+        for label_element in root.iter('b', 'strong'):
+            label = re.sub(r'\s*:\s*$', '', label_element.text_content()).strip()
+            if not label or len(label) > 40:
+                continue
+            parts = [label_element.tail or '']
+            for sibling in label_element.itersiblings():
+                if not isinstance(sibling.tag, str):
+                    # Commentaire HTML: seul le texte qui le suit compte
+                    parts.append(sibling.tail or '')
+                    continue
+                if sibling.tag in FIELD_STOP_TAGS:
+                    break
+                parts.append(sibling.text_content())
+                parts.append(sibling.tail or '')
+            value = re.sub(r'^\s*:\s*', '', ''.join(parts)).strip()
+            if value:
+                fields.append([label, value])
+        return fields
@@ -0,0 +1,239 @@
+"""
+Stockage des clubs dans une base SQLite indexée.
+
+Alternative (ou complément) au CSV pour la production: une ligne par scl
+dans la table `clubs`, avec les champs de ClubData, `temps_extraction` et
+la date de récupération (`fetched_at`, secondes depuis l'epoch).
+
+- Écritures groupées: les lignes s'accumulent en mémoire et sont écrites
+  par `INSERT ... ON CONFLICT(scl) DO UPDATE` dans une seule transaction
+  tous les `batch_size` résultats ou toutes les `commit_interval` secondes
+  (et à la fermeture). Une absence confirmée supprime la ligne du scl.
+- Mode WAL: les lectures (autre processus, analyse) ne bloquent pas le
+  scraper et inversement.
+- Index sur le numéro d'affiliation, le domaine de l'email et le code
+  postal (colonnes dérivées à l'écriture): recherche en O(log n) au lieu
+  de relire tout le CSV.
+
+    python src/club_store.py clubs.db --import clubs_france.csv
+    python src/club_store.py clubs.db --affiliation 500650
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from itertools import groupby
+from typing import Dict, List, Optional
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from club_data import STATUS_ABSENT, STATUS_FOUND, ScrapeResult
+
+CLUB_FIELDS = ['nom', 'numero_affiliation', 'email', 'telephone', 'adresse', 'url_detail']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    scl INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    numero_affiliation TEXT,
+    email TEXT,
+    telephone TEXT,
+    adresse TEXT,
+    url_detail TEXT,
+    email_domain TEXT,
+    code_postal TEXT,
+    temps_extraction REAL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clubs_affiliation ON clubs (numero_affiliation);
+CREATE INDEX IF NOT EXISTS clubs_email_domain ON clubs (email_domain);
+CREATE INDEX IF NOT EXISTS clubs_code_postal ON clubs (code_postal);
+"""
+
+_UPSERT = """
+INSERT INTO clubs (scl, nom, numero_affiliation, email, telephone, adresse, url_detail,
+                   email_domain, code_postal, temps_extraction, fetched_at)
+VALUES (:scl, :nom, :numero_affiliation, :email, :telephone, :adresse, :url_detail,
+        :email_domain, :code_postal, :temps_extraction, :fetched_at)
+ON CONFLICT(scl) DO UPDATE SET
+    nom = excluded.nom, numero_affiliation = excluded.numero_affiliation, email = excluded.email,
+    telephone = excluded.telephone, adresse = excluded.adresse, url_detail = excluded.url_detail,
+    email_domain = excluded.email_domain, code_postal = excluded.code_postal,
+    temps_extraction = excluded.temps_extraction, fetched_at = excluded.fetched_at
+"""
+
+# Dernier groupe de 5 chiffres de l'adresse ("... 33000 BORDEAUX")
+POSTCODE_RE = re.compile(r'\b(\d{5})\b')
+
+
+def email_domain(email: Optional[str]) -> Optional[str]:
+    """Domaine d'un email, en minuscules (None si pas d'email)"""
+    if not email or '@' not in email:
+        return None
+    return email.rsplit('@', 1)[1].strip().lower() or None
+
+
+def postcode(adresse: Optional[str]) -> Optional[str]:
+    """Code postal d'une adresse (dernier nombre à 5 chiffres)"""
+    matches = POSTCODE_RE.findall(adresse or '')
+    return matches[-1] if matches else None
+
+
+class ClubStore:
+    """Table SQLite des clubs, écrite par lots transactionnels"""
+
+    def __init__(self, path: str, batch_size: int = 500, commit_interval: float = 2.0):
+        """
+        Args:
+            path: Fichier SQLite (créé s'il n'existe pas)
+            batch_size: Résultats accumulés avant une transaction
+            commit_interval: Délai maximal (s) avant l'écriture des résultats accumulés
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.upserted = 0
+        self.deleted = 0
+        self.commits = 0
+        self._pending: List[tuple] = []
+        self._last_commit = time.time()
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        # En WAL, NORMAL ne perd au pire que les dernières transactions en cas de coupure de courant
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(_SCHEMA)
+
+    def upsert_row(self, row: Dict[str, str], fetched_at: Optional[float] = None):
+        """Ajoute ou remplace un club à partir d'une ligne au format CSV (scl, nom, ...)"""
+        if not row.get('nom'):
+            # Ligne vide de scrape_range.py: pas de club pour ce scl
+            self.discard(int(row['scl']))
+            return
+        values = {field: row.get(field) or None for field in CLUB_FIELDS}
+        elapsed = row.get('temps_extraction')
+        values.update(scl=int(row['scl']), email_domain=email_domain(values['email']),
+                      code_postal=postcode(values['adresse']),
+                      temps_extraction=float(elapsed) if elapsed not in (None, '') else None,
+                      fetched_at=fetched_at if fetched_at is not None else time.time())
+        self._queue('upsert', values)
+
+    def discard(self, scl: int):
+        """Absence confirmée: le scl n'a plus de club"""
+        self._queue('delete', {'scl': scl})
+
+    def record(self, result: ScrapeResult, elapsed: Optional[float] = None):
+        """Enregistre un résultat de fetch_club: club trouvé ajouté, absence supprimée, erreur ignorée"""
+        if result.status == STATUS_FOUND and result.club is not None:
+            row = {field: getattr(result.club, field) for field in CLUB_FIELDS}
+            row.update(scl=result.scl, temps_extraction=elapsed)
+            self.upsert_row(row)
+        elif result.status == STATUS_ABSENT:
+            self.discard(result.scl)
+
+    def _queue(self, operation: str, values: dict):
+        self._pending.append((operation, values))
+        if len(self._pending) >= self.batch_size or time.time() - self._last_commit >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """Écrit les résultats accumulés dans une seule transaction"""
+        self._last_commit = time.time()
+        if not self._pending:
+            return
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            # Ordre conservé: un scl supprimé puis retrouvé dans le même lot reste présent
+            for operation, group in groupby(self._pending, key=lambda item: item[0]):
+                params = [values for _, values in group]
+                if operation == 'upsert':
+                    self.db.executemany(_UPSERT, params)
+                    self.upserted += len(params)
+                else:
+                    self.deleted += self.db.executemany('DELETE FROM clubs WHERE scl = :scl', params).rowcount
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self._pending = []
+        self.commits += 1
+
+    def _query(self, where: str, value) -> List[Dict]:
+        self.flush()
+        return [dict(row) for row in self.db.execute(f'SELECT * FROM clubs WHERE {where} ORDER BY scl', (value,))]
+
+    def get(self, scl: int) -> Optional[Dict]:
+        rows = self._query('scl = ?', scl)
+        return rows[0] if rows else None
+
+    def find_by_affiliation(self, numero_affiliation: str) -> List[Dict]:
+        return self._query('numero_affiliation = ?', str(numero_affiliation))
+
+    def find_by_email_domain(self, domain: str) -> List[Dict]:
+        return self._query('email_domain = ?', domain.lower())
+
+    def find_by_postcode(self, code_postal: str) -> List[Dict]:
+        return self._query('code_postal = ?', code_postal)
+
+    def count(self) -> int:
+        self.flush()
+        return self.db.execute('SELECT COUNT(*) FROM clubs').fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def summary(self) -> str:
+        return (f"{self.count()} clubs, {self.upserted} écrits, {self.deleted} supprimés "
+                f"en {self.commits} transactions")
+
+
+def main():
+    import argparse
+    from record_log import read_records
+
+    parser = argparse.ArgumentParser(description="Base SQLite des clubs: import d'un CSV et recherches indexées")
+    parser.add_argument('database', type=str, help='Fichier SQLite')
+    parser.add_argument('--import', dest='import_csv', type=str, default=None,
+                        help='CSV à importer (format scrape_range.py, journal <csv>.log compris)')
+    parser.add_argument('--scl', type=int, default=None, help='Club d\'un numéro scl')
+    parser.add_argument('--affiliation', type=str, default=None, help='Clubs d\'un numéro d\'affiliation')
+    parser.add_argument('--domain', type=str, default=None, help='Clubs dont l\'email est sur ce domaine')
+    parser.add_argument('--postcode', type=str, default=None, help='Clubs d\'un code postal')
+    args = parser.parse_args()
+
+    with ClubStore(args.database) as store:
+        if args.import_csv:
+            fetched_at = os.path.getmtime(args.import_csv)
+            for row in read_records(args.import_csv).values():
+                store.upsert_row(row, fetched_at)
+            store.flush()
+            print(f"📥 {args.import_csv} importé")
+        if args.scl is not None:
+            club = store.get(args.scl)
+            rows = [club] if club else []
+        elif args.affiliation:
+            rows = store.find_by_affiliation(args.affiliation)
+        elif args.domain:
+            rows = store.find_by_email_domain(args.domain)
+        elif args.postcode:
+            rows = store.find_by_postcode(args.postcode)
+        else:
+            rows = []
+        for row in rows:
+            print(f"  scl={row['scl']}: {row['nom']} | {row['numero_affiliation'] or 'N/A'} | "
+                  f"{row['email'] or 'N/A'} | {row['adresse'] or 'N/A'}")
+        print(f"🗄️  {args.database}: {store.summary()}")
+
+
+if __name__ == "__main__":
+    main()
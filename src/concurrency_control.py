@@ -0,0 +1,149 @@
+"""
+Contrôle adaptatif du nombre d'extractions simultanées (AIMD).
+
+Un nombre fixe de workers est soit trop prudent, soit assez élevé pour se
+faire ralentir par le site selon l'heure. Le contrôleur observe la durée de
+chaque navigation (`goto`) et ses échecs (timeouts), et toutes les `window`
+navigations:
+- augmente la limite de `increase` si le p95 et le taux de timeouts restent
+  sous leurs cibles (augmentation additive),
+- la multiplie par `decrease` sinon (diminution multiplicative), sans
+  attendre la fin de la fenêtre si les timeouts s'accumulent.
+
+Les scrapers appellent `record` après chaque navigation; les drivers lisent
+`limit` pour décider combien d'extractions lancer et affichent les décisions
+(`drain_decisions`) dans leur progression.
+"""
+
+import threading
+from typing import List, Tuple
+
+
+class AIMDController:
+    """Limite de concurrence ajustée selon la latence p95 et le taux de timeouts"""
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 32,
+                 target_p95: float = 3.0, max_timeout_rate: float = 0.05,
+                 window: int = 40, increase: int = 1, decrease: float = 0.5):
+        """
+        Args:
+            initial: Limite de départ
+            min_limit: Limite minimale
+            max_limit: Limite maximale (pages du pool, processus...)
+            target_p95: Latence p95 de navigation à ne pas dépasser (s)
+            max_timeout_rate: Proportion de navigations en échec à ne pas dépasser
+            window: Nombre de navigations observées par décision
+            increase: Augmentation de la limite quand tout va bien
+            decrease: Facteur appliqué à la limite quand la cible est dépassée
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(self.max_limit, max(self.min_limit, initial))
+        self.target_p95 = target_p95
+        self.max_timeout_rate = max_timeout_rate
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.increases = 0
+        self.decreases = 0
+        self.peak = self.limit
+        self._samples: List[Tuple[float, bool]] = []
+        self._decisions: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, timed_out: bool = False):
+        """Enregistre une navigation (durée en s, échec ou non)"""
+        with self._lock:
+            self._samples.append((duration, timed_out))
+            timeouts = sum(1 for _, failed in self._samples if failed) if timed_out else 0
+            # Fenêtre pleine, ou déjà plus de timeouts que la fenêtre entière n'en tolère: baisse immédiate
+            if len(self._samples) >= self.window or timeouts > self.max_timeout_rate * self.window:
+                self._decide()
+
+    def _decide(self):
+        durations = sorted(d for d, timed_out in self._samples if not timed_out)
+        timeout_rate = sum(1 for _, timed_out in self._samples if timed_out) / len(self._samples)
+        p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))] if durations else None
+        # Mesures prises à l'ancienne limite: repartir d'une fenêtre vide
+        self._samples = []
+
+        old_limit = self.limit
+        if p95 is None or p95 > self.target_p95 or timeout_rate > self.max_timeout_rate:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease))
+            icon = '📉'
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            icon = '📈'
+        if self.limit == old_limit:
+            return
+        if self.limit > old_limit:
+            self.increases += 1
+        else:
+            self.decreases += 1
+        self.peak = max(self.peak, self.limit)
+        p95_text = f"{p95:.2f}s" if p95 is not None else "-"
+        self._decisions.append(f"{icon} Concurrence {old_limit} → {self.limit} "
+                               f"(p95 {p95_text}, timeouts {timeout_rate * 100:.0f}%)")
+
+    def drain_decisions(self) -> List[str]:
+        """Décisions prises depuis le dernier appel (pour l'affichage)"""
+        with self._lock:
+            decisions, self._decisions = self._decisions, []
+        return decisions
+
+    def summary(self) -> str:
+        return (f"limite finale {self.limit} (pic {self.peak}, bornes {self.min_limit}-{self.max_limit}), "
+                f"{self.increases} hausses, {self.decreases} baisses")
+
+
+class NavigationSamples:
+    """
+    Même interface `record` qu'AIMDController, mais se contente de collecter
+    les mesures (dans un processus worker, pour les renvoyer au contrôleur du
+    processus principal avec les résultats du lot).
+    """
+
+    def __init__(self):
+        self.samples: List[Tuple[float, bool]] = []
+
+    def record(self, duration: float, timed_out: bool = False):
+        self.samples.append((duration, timed_out))
+
+    def drain(self) -> List[Tuple[float, bool]]:
+        samples, self.samples = self.samples, []
+        return samples
+
+
+class InFlightGate:
+    """
+    Limite le nombre de tâches en cours d'un pool de processus à la limite
+    du contrôleur: le générateur de tâches attend une place avant chaque lot.
+    """
+
+    def __init__(self, controller: AIMDController):
+        self.controller = controller
+        self.in_flight = 0
+        self.stopped = False
+        self._condition = threading.Condition()
+
+    def gate(self, tasks):
+        """Générateur des tâches, bloquant tant que la limite est atteinte"""
+        for task in tasks:
+            with self._condition:
+                while self.in_flight >= self.controller.limit and not self.stopped:
+                    self._condition.wait(timeout=0.5)
+                if self.stopped:
+                    return
+                self.in_flight += 1
+            yield task
+
+    def done(self):
+        """Une tâche est terminée: libère une place"""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def stop(self):
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
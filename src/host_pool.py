@@ -0,0 +1,192 @@
+"""
+Répartition des requêtes entre les hôtes de district vérifiés.
+
+Le scl est unique: `https://<district>.fff.fr/recherche-clubs?scl=N` donne
+le même club quel que soit le district. Plutôt que de tout envoyer à
+gironde.fff.fr, chaque extraction choisit un hôte parmi ceux de
+`districts_urls.json` (généré par scripts/verify_districts.py):
+
+- "round-robin": à tour de rôle;
+- "least-loaded": deux hôtes tirés au hasard, on garde celui dont
+  (requêtes en cours + 1) x latence moyenne est la plus faible. La
+  latence d'un hôte inutilisé décroît avec le temps: un hôte lent un
+  instant finit par être réessayé.
+
+Chaque hôte a son état de santé: latence moyenne (EWMA), échecs
+consécutifs. Après `max_failures` échecs transitoires d'affilée (timeout,
+429/5xx), l'hôte est écarté pendant `ejection_time` secondes (doublé à
+chaque nouvelle éjection), puis réintégré à l'essai: un seul échec
+l'écarte de nouveau. Le dernier hôte disponible n'est jamais écarté.
+
+Avec le limiteur de débit (rate_limit), `--rate` s'applique par hôte:
+le débit total augmente avec le nombre d'hôtes.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+HOST_STRATEGIES = ('round-robin', 'least-loaded')
+
+
+def load_hosts(districts_file: str) -> List[str]:
+    """URLs de base (https://hôte) des districts d'un fichier districts_urls.json"""
+    with open(districts_file, 'r', encoding='utf-8') as f:
+        districts = json.load(f)
+    urls = districts.values() if isinstance(districts, dict) else districts
+    hosts = []
+    for url in urls:
+        parsed = urlparse(url)
+        if parsed.scheme and parsed.netloc:
+            base_url = f"{parsed.scheme}://{parsed.netloc}"
+            if base_url not in hosts:
+                hosts.append(base_url)
+    if not hosts:
+        raise ValueError(f"Aucun hôte valide dans {districts_file}")
+    return hosts
+
+
+@dataclass
+class HostState:
+    """Santé et charge d'un hôte"""
+    base_url: str
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency: Optional[float] = None  # moyenne mobile exponentielle (s)
+    last_release: float = 0.0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def load(self, now: float, decay_time: float) -> float:
+        # Hôte jamais mesuré: essayé en priorité
+        if self.latency is None:
+            return 0.0
+        latency = self.latency * math.exp(-max(0.0, now - self.last_release) / decay_time)
+        return (self.in_flight + 1) * latency
+
+
+class HostPool:
+    """Choix de l'hôte de chaque requête, avec suivi de santé et éjection"""
+
+    def __init__(self, base_urls: Iterable[str], strategy: str = 'least-loaded',
+                 max_failures: int = 3, ejection_time: float = 30.0, max_ejection_time: float = 600.0,
+                 alpha: float = 0.3, decay_time: float = 30.0, seed: Optional[int] = None):
+        """
+        Args:
+            base_urls: URLs de base des hôtes (https://gironde.fff.fr, ...)
+            strategy: "round-robin" ou "least-loaded"
+            max_failures: Échecs transitoires consécutifs avant éjection
+            ejection_time: Durée de la première éjection (s), doublée à chaque récidive
+            max_ejection_time: Durée maximale d'une éjection (s)
+            alpha: Poids de la dernière mesure dans la latence moyenne
+            decay_time: Constante de temps de l'oubli de la latence d'un hôte inutilisé (s)
+            seed: Graine des tirages (ordre de départ du tourniquet, choix aléatoires)
+        """
+        if strategy not in HOST_STRATEGIES:
+            raise ValueError(f"Stratégie de répartition inconnue: {strategy} "
+                             f"(choix: {', '.join(HOST_STRATEGIES)})")
+        self.hosts: Dict[str, HostState] = {url.rstrip('/'): HostState(url.rstrip('/')) for url in base_urls}
+        if not self.hosts:
+            raise ValueError("Aucun hôte")
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.alpha = alpha
+        self.decay_time = decay_time
+        self._rng = random.Random(seed)
+        self._order = list(self.hosts.values())
+        # Départ décalé: les workers d'un pool ne commencent pas tous par le même hôte
+        self._next = self._rng.randrange(len(self._order))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, districts_file: str, **kwargs) -> 'HostPool':
+        """Pool construit à partir de districts_urls.json"""
+        return cls(load_hosts(districts_file), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def _candidates(self, now: float) -> List[HostState]:
+        available = [host for host in self._order if host.available(now)]
+        if available:
+            return available
+        # Tous écartés: le moins longtemps, plutôt que de bloquer
+        return [min(self._order, key=lambda host: host.ejected_until)]
+
+    def acquire(self) -> str:
+        """Choisit l'hôte de la prochaine requête; retourne son URL de base"""
+        with self._lock:
+            now = time.time()
+            if self.strategy == 'round-robin':
+                for _ in range(len(self._order)):
+                    host = self._order[self._next]
+                    self._next = (self._next + 1) % len(self._order)
+                    if host.available(now):
+                        break
+                else:
+                    host = self._candidates(now)[0]
+            else:
+                candidates = self._candidates(now)
+                pair = self._rng.sample(candidates, 2) if len(candidates) > 1 else candidates
+                host = min(pair, key=lambda candidate: candidate.load(now, self.decay_time))
+            host.in_flight += 1
+            host.requests += 1
+            return host.base_url
+
+    def release(self, base_url: str, duration: float, failed: bool = False):
+        """
+        Enregistre l'issue d'une requête.
+
+        Args:
+            base_url: Hôte retourné par acquire
+            duration: Durée de la requête (s)
+            failed: Échec transitoire (timeout, 429/5xx): compte pour l'éjection
+        """
+        with self._lock:
+            host = self.hosts[base_url]
+            host.in_flight = max(0, host.in_flight - 1)
+            host.latency = duration if host.latency is None else (
+                self.alpha * duration + (1 - self.alpha) * host.latency)
+            host.last_release = time.time()
+            if not failed:
+                host.consecutive_failures = 0
+                return
+            host.failures += 1
+            host.consecutive_failures += 1
+            if host.consecutive_failures >= self.max_failures:
+                self._eject(host)
+
+    def _eject(self, host: HostState):
+        now = time.time()
+        if not host.available(now):
+            return
+        if not any(other.available(now) for other in self._order if other is not host):
+            return  # dernier hôte disponible: on le garde
+        host.ejections += 1
+        host.ejected_until = now + min(self.max_ejection_time,
+                                       self.ejection_time * 2 ** (host.ejections - 1))
+        # Réintégré à l'essai: un seul échec suffira à l'écarter de nouveau
+        host.consecutive_failures = self.max_failures - 1
+        print(f"  🚫 Hôte écarté: {host.base_url} ({host.failures} échecs, "
+              f"{host.ejected_until - now:.0f}s)")
+
+    def summary(self) -> str:
+        now = time.time()
+        ejected = sum(1 for host in self._order if not host.available(now))
+        ejections = sum(host.ejections for host in self._order)
+        busiest = sorted(self._order, key=lambda host: host.requests, reverse=True)[:3]
+        top = ", ".join(f"{urlparse(host.base_url).hostname} {host.requests}" for host in busiest)
+        return (f"{len(self.hosts)} hôtes ({self.strategy}), {ejections} éjections, "
+                f"{ejected} écartés actuellement; plus sollicités: {top}")
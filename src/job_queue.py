@@ -0,0 +1,342 @@
+"""
+File de travaux partagée entre machines: blocs de scl avec bail (lease).
+
+La plage à rafraîchir est découpée en blocs (table `jobs` d'un fichier
+SQLite). Un worker prend un bloc libre avec `lease()`: le bloc lui est
+réservé pour `lease_seconds`, bail qu'il renouvelle avec `heartbeat()`
+tant qu'il travaille, puis il rend compte avec `complete()`. Si le worker
+meurt, son bail expire et le bloc est redonné au suivant; un bloc qui
+épuise `max_attempts` bails sans être terminé passe en échec (il ne
+bloque pas la file indéfiniment).
+
+Deux modes:
+- fichier SQLite local (`JobQueue`): plusieurs processus d'une même
+  machine; chaque opération est une transaction courte (BEGIN IMMEDIATE);
+- coordinateur HTTP (`JobServer`, `scripts/scrape_queue.py serve`): le
+  fichier reste sur une machine et les workers des autres machines
+  passent par `RemoteJobQueue`, même interface. SQLite (a fortiori en
+  mode WAL) n'est pas fiable sur un partage réseau.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Union
+
+import requests
+
+JOB_PENDING = 'pending'
+JOB_LEASED = 'leased'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+DEFAULT_BLOCK_SIZE = 500
+DEFAULT_LEASE_SECONDS = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    start INTEGER PRIMARY KEY,
+    end INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    found INTEGER,
+    tested INTEGER,
+    errors INTEGER,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    """Identifiant unique d'un worker: machine, processus, suffixe aléatoire"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def format_status(status: Dict[str, int]) -> str:
+    """Résumé lisible de JobQueue.status()"""
+    total = sum(status[state] for state in (JOB_PENDING, JOB_LEASED, JOB_DONE, JOB_FAILED))
+    return (f"{status[JOB_DONE]}/{total} blocs terminés, {status[JOB_LEASED]} en cours "
+            f"({status['expired']} bails expirés), {status[JOB_PENDING]} en attente, "
+            f"{status[JOB_FAILED]} en échec | {status['found']} clubs sur {status['tested']} numéros testés")
+
+
+@dataclass
+class Job:
+    """Bloc de scl réservé par un worker"""
+    start: int
+    end: int
+    worker: str
+    attempts: int
+    lease_expires: float
+
+
+class JobQueue:
+    """File de blocs de scl dans un fichier SQLite"""
+
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = 5):
+        """
+        Args:
+            path: Fichier SQLite de la file
+            lease_seconds: Durée d'un bail (renouvelé par heartbeat)
+            max_attempts: Bails accordés à un bloc avant de le déclarer en échec
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Une connexion par opération: utilisable depuis plusieurs threads et après un fork
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA busy_timeout=30000')
+            yield db
+        finally:
+            db.close()
+
+    def populate(self, start: int, end: int, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+        """Ajoute les blocs de la plage (les blocs existants sont conservés); retourne le nombre ajouté"""
+        blocks = [(low, min(low + block_size - 1, end), time.time()) for low in range(start, end + 1, block_size)]
+        with self._connect() as db:
+            before = db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany('INSERT OR IGNORE INTO jobs (start, end, updated) VALUES (?, ?, ?)', blocks)
+            db.execute('COMMIT')
+            return db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0] - before
+
+    def lease(self, worker: str) -> Optional[Job]:
+        """Réserve le prochain bloc libre (ou dont le bail a expiré); None si la file est vide"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            # Blocs dont tous les bails ont expiré sans résultat: abandonnés
+            db.execute("UPDATE jobs SET state = ?, worker = NULL, updated = ? "
+                       "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                       (JOB_FAILED, now, JOB_LEASED, now, self.max_attempts))
+            row = db.execute("SELECT start, end, attempts FROM jobs "
+                             "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                             "ORDER BY attempts, start LIMIT 1", (JOB_PENDING, JOB_LEASED, now)).fetchone()
+            if row is None:
+                db.execute('COMMIT')
+                return None
+            start, end, attempts = row
+            expires = now + self.lease_seconds
+            db.execute("UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, attempts = ?, updated = ? "
+                       "WHERE start = ?", (JOB_LEASED, worker, expires, attempts + 1, now, start))
+            db.execute('COMMIT')
+            return Job(start, end, worker, attempts + 1, expires)
+
+    def heartbeat(self, job: Job) -> bool:
+        """Renouvelle le bail; False si le bloc a été redonné à un autre worker"""
+        expires = time.time() + self.lease_seconds
+        with self._connect() as db:
+            changed = db.execute("UPDATE jobs SET lease_expires = ?, updated = ? "
+                                 "WHERE start = ? AND worker = ? AND state = ?",
+                                 (expires, time.time(), job.start, job.worker, JOB_LEASED)).rowcount
+        if changed:
+            job.lease_expires = expires
+        return bool(changed)
+
+    def complete(self, job: Job, found: int, tested: int, errors: int = 0) -> bool:
+        """Bloc terminé; False si le bail avait été perdu (le résultat est quand même enregistré)"""
+        with self._connect() as db:
+            db.execute('BEGIN IMMEDIATE')
+            owned = db.execute("SELECT 1 FROM jobs WHERE start = ? AND worker = ? AND state = ?",
+                               (job.start, job.worker, JOB_LEASED)).fetchone() is not None
+            db.execute("UPDATE jobs SET state = ?, worker = ?, lease_expires = NULL, found = ?, tested = ?, "
+                       "errors = ?, updated = ? WHERE start = ? AND state != ?",
+                       (JOB_DONE, job.worker, found, tested, errors, time.time(), job.start, JOB_DONE))
+            db.execute('COMMIT')
+        return owned
+
+    def release(self, job: Job) -> bool:
+        """Rend un bloc non terminé (worker arrêté proprement): il sera repris tout de suite"""
+        with self._connect() as db:
+            return bool(db.execute("UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL, "
+                                   "attempts = MAX(0, attempts - 1), updated = ? "
+                                   "WHERE start = ? AND worker = ? AND state = ?",
+                                   (JOB_PENDING, time.time(), job.start, job.worker, JOB_LEASED)).rowcount)
+
+    def status(self) -> Dict[str, int]:
+        """Nombre de blocs par état, clubs trouvés et numéros testés"""
+        with self._connect() as db:
+            counts = {state: 0 for state in (JOB_PENDING, JOB_LEASED, JOB_DONE, JOB_FAILED)}
+            for state, count in db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state'):
+                counts[state] = count
+            # Bail expiré: le bloc est de nouveau disponible
+            expired = db.execute('SELECT COUNT(*) FROM jobs WHERE state = ? AND lease_expires < ?',
+                                 (JOB_LEASED, time.time())).fetchone()[0]
+            found, tested = db.execute('SELECT COALESCE(SUM(found), 0), COALESCE(SUM(tested), 0) '
+                                       'FROM jobs WHERE state = ?', (JOB_DONE,)).fetchone()
+        counts['expired'] = expired
+        counts['found'] = found
+        counts['tested'] = tested
+        return counts
+
+    def summary(self) -> str:
+        return format_status(self.status())
+
+
+class JobServer:
+    """Coordinateur HTTP: expose une JobQueue aux workers d'autres machines"""
+
+    def __init__(self, queue: JobQueue, host: str = '0.0.0.0', port: int = 8765):
+        self.queue = queue
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def _handler_class(self):
+        queue = self.queue
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/status':
+                    self._send(200, queue.status())
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if self.path == '/lease':
+                    job = queue.lease(body['worker'])
+                    self._send(200, asdict(job) if job else None)
+                elif self.path in ('/heartbeat', '/release', '/complete'):
+                    job = Job(**body['job'])
+                    if self.path == '/heartbeat':
+                        ok = queue.heartbeat(job)
+                        self._send(200, {'ok': ok, 'lease_expires': job.lease_expires})
+                    elif self.path == '/release':
+                        self._send(200, {'ok': queue.release(job)})
+                    else:
+                        self._send(200, {'ok': queue.complete(job, body['found'], body['tested'],
+                                                              body.get('errors', 0))})
+                else:
+                    self._send(404, {'error': 'not found'})
+
+        return Handler
+
+    def start(self) -> 'JobServer':
+        """Démarre le coordinateur dans un thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class RemoteJobQueue:
+    """Client d'un JobServer, avec la même interface que JobQueue"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _post(self, path: str, payload: dict):
+        response = self.session.post(f"{self.url}{path}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def lease(self, worker: str) -> Optional[Job]:
+        data = self._post('/lease', {'worker': worker})
+        return Job(**data) if data else None
+
+    def heartbeat(self, job: Job) -> bool:
+        data = self._post('/heartbeat', {'job': asdict(job)})
+        if data['ok']:
+            job.lease_expires = data['lease_expires']
+        return data['ok']
+
+    def complete(self, job: Job, found: int, tested: int, errors: int = 0) -> bool:
+        return self._post('/complete', {'job': asdict(job), 'found': found, 'tested': tested,
+                                        'errors': errors})['ok']
+
+    def release(self, job: Job) -> bool:
+        return self._post('/release', {'job': asdict(job)})['ok']
+
+    def status(self) -> Dict[str, int]:
+        response = self.session.get(f"{self.url}/status", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def summary(self) -> str:
+        return format_status(self.status())
+
+
+def open_queue(spec: str, **kwargs) -> Union[JobQueue, RemoteJobQueue]:
+    """File à partir d'un fichier SQLite ou de l'URL d'un coordinateur (http://...)"""
+    if spec.startswith(('http://', 'https://')):
+        return RemoteJobQueue(spec)
+    return JobQueue(spec, **kwargs)
+
+
+class LeaseKeeper:
+    """Renouvelle le bail d'un bloc en arrière-plan pendant son traitement"""
+
+    def __init__(self, queue: Union[JobQueue, RemoteJobQueue], job: Job, interval: float):
+        self.queue = queue
+        self.job = job
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job):
+                    self.lost = True
+                    print(f"  ⚠️  Bail perdu pour le bloc {self.job.start}-{self.job.end} (redonné à un autre worker)")
+                    return
+            except Exception as e:
+                # Coordinateur injoignable: nouvel essai au prochain battement
+                print(f"  ⚠️  Battement impossible: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
@@ -0,0 +1,164 @@
+"""
+Cache disque des numéros scl sans club (cache négatif).
+
+La plage des scl est creuse: sans cache, chaque relance re-teste tous les
+numéros vides avec une navigation complète. Les scrapers enregistrent ici
+les absences confirmées (message "aucun résultat" ou 404 de l'API, jamais
+un timeout ni une erreur), et les drivers sautent ces numéros tant que
+l'entrée n'a pas expiré (TTL).
+
+Format: un fichier texte en ajout seul, une ligne "scl<TAB>horodatage" par
+absence ("scl<TAB>-1" quand un club est trouvé depuis). Plusieurs processus
+peuvent y ajouter des lignes en même temps; `compact` relit le fichier et le
+réécrit sans les entrées expirées ou annulées, sous verrou exclusif
+(`<cache>.lock`, flock): les ajouts des autres processus, faits sous verrou
+partagé, ne sont pas perdus et reprennent dans le nouveau fichier.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de flock, compaction sûre seulement sans autre processus
+    fcntl = None
+
+DEFAULT_CACHE_FILE = 'negative_cache.tsv'
+DEFAULT_TTL_DAYS = 30.0
+
+# Horodatage d'une entrée annulée (club trouvé depuis)
+REMOVED = -1.0
+
+
+class NegativeCache:
+    """Numéros scl sans club, avec date d'observation et durée de validité"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, ttl_days: float = DEFAULT_TTL_DAYS):
+        """
+        Charge le cache depuis le disque.
+
+        Args:
+            path: Fichier du cache
+            ttl_days: Durée de validité d'une absence (jours)
+        """
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.entries: Dict[int, float] = {}
+        self.skipped = 0
+        self.added = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Verrou inter-processus du fichier: partagé pour ajouter, exclusif pour compacter"""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)
+
+    def _replaced(self) -> bool:
+        """Vrai si le fichier ouvert en ajout a été remplacé (compaction d'un autre processus)"""
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split('\t')
+                if len(parts) != 2:
+                    continue
+                try:
+                    scl, timestamp = int(parts[0]), float(parts[1])
+                except ValueError:
+                    # Ligne tronquée (arrêt pendant l'écriture)
+                    continue
+                if timestamp == REMOVED:
+                    self.entries.pop(scl, None)
+                else:
+                    self.entries[scl] = max(timestamp, self.entries.get(scl, 0.0))
+
+    def _append(self, scl: int, timestamp: float):
+        with self._lock, self._file_lock(exclusive=False):
+            if self._file is not None and self._replaced():
+                self._file.close()
+                self._file = None
+            if self._file is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            # Une ligne par write: les ajouts concurrents de plusieurs processus ne s'entremêlent pas
+            self._file.write(f"{scl}\t{timestamp:.0f}\n")
+            self._file.flush()
+
+    def is_absent(self, scl: int, now: Optional[float] = None) -> bool:
+        """Vrai si le scl est connu sans club et que l'entrée n'a pas expiré"""
+        timestamp = self.entries.get(scl)
+        if timestamp is None:
+            return False
+        return (now if now is not None else time.time()) - timestamp < self.ttl
+
+    def add(self, scl: int, timestamp: Optional[float] = None):
+        """Enregistre une absence confirmée"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.entries[scl] = timestamp
+        self.added += 1
+        self._append(scl, timestamp)
+
+    def discard(self, scl: int):
+        """Annule une absence (un club a été trouvé à ce numéro)"""
+        if self.entries.pop(scl, None) is not None:
+            self._append(scl, REMOVED)
+
+    def should_skip(self, scl: int) -> bool:
+        """Comme is_absent, en comptant les numéros sautés"""
+        if self.is_absent(scl):
+            self.skipped += 1
+            return True
+        return False
+
+    def filter(self, scls: Iterable[int]) -> List[int]:
+        """Numéros à tester: ceux qui ne sont pas connus sans club"""
+        return [scl for scl in scls if not self.should_skip(scl)]
+
+    def compact(self):
+        """Relit le fichier et le réécrit sans les entrées expirées ni annulées (écriture atomique)"""
+        with self._lock, self._file_lock(exclusive=True):
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            # Le fichier fait foi: il contient aussi les ajouts des autres processus
+            self.entries = {}
+            self._load()
+            now = time.time()
+            self.entries = {scl: ts for scl, ts in self.entries.items() if now - ts < self.ttl}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for scl in sorted(self.entries):
+                    f.write(f"{scl}\t{self.entries[scl]:.0f}\n")
+            os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        """Résumé pour l'affichage de fin de run"""
+        return f"{self.skipped} numéros sautés, {self.added} absences ajoutées ({len(self.entries)} en cache)"
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,302 @@
+"""
+Archive compressée des pages récupérées, pour re-parser sans re-crawler.
+
+Chaque page (scl, url, horodatage, statut, contenu HTML ou JSON) est ajoutée
+à un segment en écriture seule; un index JSONL donne sa position. Chaque
+rédacteur (un par processus) a ses propres fichiers dans le répertoire:
+
+    <writer>-00000.seg   segments de données (ajout seul, nouveau segment au-delà de segment_size)
+    <writer>.idx         index: une ligne JSON par page (segment, offset, longueur, métadonnées)
+    <writer>.zdict       dictionnaire de compression
+
+Les pages du site partagent l'essentiel de leur HTML (en-tête, navigation,
+scripts, pied de page). Après les `train_samples` premières pages, un
+dictionnaire est construit avec les lignes présentes dans la plupart d'entre
+elles et passé à zlib (`zdict`): chaque page reste compressée séparément
+(lecture directe par offset) mais ne paie plus que ses parties propres.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+# Taille utile d'un dictionnaire zlib (fenêtre de 32 Ko)
+DICTIONARY_SIZE = 32 * 1024
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+SEGMENT_NAME_RE = re.compile(r'^(?P<writer>.+)-(?P<number>\d{5})\.seg$')
+
+
+@dataclass
+class ArchivedPage:
+    """Page lue depuis l'archive"""
+    scl: int
+    url: str
+    timestamp: float
+    status: str
+    content_type: str
+    content: str
+
+
+def train_dictionary(samples: List[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Construit un dictionnaire zlib à partir de pages d'exemple.
+
+    Garde, dans l'ordre du document, les lignes présentes dans au moins la
+    moitié des pages: les blocs communs restent contigus et zlib peut les
+    référencer en longues correspondances. Au-delà de `size`, seule la fin
+    est gardée (zlib ne voit que les 32 derniers Ko).
+    """
+    if not samples:
+        return b''
+    counts = Counter()
+    order = {}
+    for sample in samples:
+        seen = set()
+        for line in sample.splitlines(keepends=True):
+            if line not in seen:
+                seen.add(line)
+                counts[line] += 1
+                order.setdefault(line, len(order))
+    threshold = max(1, len(samples) // 2)
+
+    common = [line for line in sorted(order, key=order.get) if counts[line] >= threshold]
+    dictionary = b''.join(common)[-size:]
+    if not dictionary:
+        # Pages sans lignes communes (HTML minifié): fin de la première page
+        return samples[0][-size:]
+    return dictionary
+
+
+class PageArchive:
+    """Rédacteur de l'archive (sûr entre threads, un rédacteur par processus)"""
+
+    def __init__(self, directory: str, writer: str = 'main',
+                 segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 train_samples: int = 8, level: int = 6):
+        """
+        Ouvre (ou reprend) l'archive d'un rédacteur.
+
+        Args:
+            directory: Répertoire de l'archive (partagé entre rédacteurs)
+            writer: Nom du rédacteur (fichiers distincts par processus)
+            segment_size: Taille maximale d'un segment (octets)
+            train_samples: Nombre de pages utilisées pour construire le dictionnaire
+            level: Niveau de compression zlib
+        """
+        if not re.match(r'^[\w.]+$', writer):
+            raise ValueError(f"Nom de rédacteur invalide: {writer}")
+        self.directory = directory
+        self.writer = writer
+        self.segment_size = segment_size
+        self.train_samples = train_samples
+        self.level = level
+        self.pages = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self._lock = threading.Lock()
+        self._samples: List[bytes] = []
+
+        os.makedirs(directory, exist_ok=True)
+        self._dict_path = os.path.join(directory, f"{writer}.zdict")
+        self.dictionary: Optional[bytes] = None
+        if os.path.exists(self._dict_path):
+            with open(self._dict_path, 'rb') as f:
+                self.dictionary = f.read()
+
+        # Reprendre le dernier segment existant
+        numbers = [int(m.group('number')) for m in map(SEGMENT_NAME_RE.match, os.listdir(directory))
+                   if m and m.group('writer') == writer]
+        self._segment_number = max(numbers) if numbers else 0
+        self._segment = open(self._segment_path(self._segment_number), 'ab')
+        self._index = open(os.path.join(directory, f"{writer}.idx"), 'a', encoding='utf-8')
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{self.writer}-{number:05d}.seg")
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        return compressor.compress(data) + compressor.flush()
+
+    def _train(self):
+        """Construit et enregistre le dictionnaire (écriture atomique)"""
+        dictionary = train_dictionary(self._samples)
+        self._samples = []
+        if not dictionary:
+            return
+        tmp_path = self._dict_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(dictionary)
+        os.replace(tmp_path, self._dict_path)
+        self.dictionary = dictionary
+
+    def add(self, scl: int, url: str, status: str, content: str,
+            content_type: str = 'html', timestamp: Optional[float] = None):
+        """
+        Ajoute une page à l'archive.
+
+        Args:
+            scl: Numéro scl
+            url: URL de la page (ou de la réponse JSON)
+            status: État de la page ("club", "absent", "timeout") ou code HTTP
+            content: HTML de la page ou corps JSON
+            content_type: "html" ou "json"
+            timestamp: Horodatage (défaut: maintenant)
+        """
+        data = (content or '').encode('utf-8')
+        with self._lock:
+            if self.dictionary is None:
+                self._samples.append(data)
+                if len(self._samples) >= self.train_samples:
+                    self._train()
+
+            blob = self._compress(data)
+            if self._segment.tell() > 0 and self._segment.tell() + len(blob) > self.segment_size:
+                self._segment.close()
+                self._segment_number += 1
+                self._segment = open(self._segment_path(self._segment_number), 'ab')
+
+            offset = self._segment.tell()
+            self._segment.write(blob)
+            self._segment.flush()
+
+            # L'index est écrit après les données: une entrée indexée est toujours lisible
+            entry = {
+                'scl': scl,
+                'url': url,
+                'ts': round(timestamp if timestamp is not None else time.time(), 3),
+                'status': status,
+                'type': content_type,
+                'seg': self._segment_number,
+                'off': offset,
+                'len': len(blob),
+                'dict': 1 if self.dictionary else 0,
+            }
+            self._index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._index.flush()
+
+            self.pages += 1
+            self.raw_bytes += len(data)
+            self.stored_bytes += len(blob)
+
+    def summary(self) -> str:
+        """Résumé pour l'affichage de fin de run"""
+        ratio = self.raw_bytes / self.stored_bytes if self.stored_bytes else 0
+        return (f"{self.pages} pages, {self.raw_bytes / 1e6:.1f} Mo → "
+                f"{self.stored_bytes / 1e6:.1f} Mo (x{ratio:.1f})")
+
+    def close(self):
+        with self._lock:
+            if not self._segment.closed:
+                self._segment.close()
+                self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ArchiveReader:
+    """Lecture de l'archive (tous les rédacteurs du répertoire)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._dictionaries: Dict[str, Optional[bytes]] = {}
+
+    def entries(self, latest_only: bool = True) -> List[dict]:
+        """
+        Entrées de l'index, triées par fichier et offset (lecture séquentielle).
+
+        Args:
+            latest_only: Ne garder que la dernière page archivée pour chaque scl
+        """
+        entries = []
+        for index_path in sorted(glob.glob(os.path.join(self.directory, '*.idx'))):
+            writer = os.path.basename(index_path)[:-len('.idx')]
+            with open(index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Ligne tronquée (arrêt pendant l'écriture)
+                        continue
+                    entry['writer'] = writer
+                    entries.append(entry)
+
+        if latest_only:
+            latest = {}
+            for entry in entries:
+                current = latest.get(entry['scl'])
+                if current is None or entry['ts'] >= current['ts']:
+                    latest[entry['scl']] = entry
+            entries = list(latest.values())
+
+        entries.sort(key=lambda e: (e['writer'], e['seg'], e['off']))
+        return entries
+
+    def _dictionary(self, writer: str) -> Optional[bytes]:
+        if writer not in self._dictionaries:
+            path = os.path.join(self.directory, f"{writer}.zdict")
+            dictionary = None
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    dictionary = f.read()
+            self._dictionaries[writer] = dictionary
+        return self._dictionaries[writer]
+
+    def _decompress(self, entry: dict, blob: bytes) -> str:
+        if entry.get('dict'):
+            decompressor = zlib.decompressobj(zdict=self._dictionary(entry['writer']))
+        else:
+            decompressor = zlib.decompressobj()
+        return (decompressor.decompress(blob) + decompressor.flush()).decode('utf-8')
+
+    def iter_pages(self, latest_only: bool = True,
+                   entries: Optional[List[dict]] = None) -> Iterator[ArchivedPage]:
+        """Itère sur les pages archivées (un seul segment ouvert à la fois)"""
+        current_path = None
+        segment = None
+        try:
+            for entry in entries if entries is not None else self.entries(latest_only):
+                path = os.path.join(self.directory, f"{entry['writer']}-{entry['seg']:05d}.seg")
+                if path != current_path:
+                    if segment:
+                        segment.close()
+                    segment = open(path, 'rb')
+                    current_path = path
+                segment.seek(entry['off'])
+                yield self.page_from_entry(entry, segment.read(entry['len']))
+        finally:
+            if segment:
+                segment.close()
+
+    def page_from_entry(self, entry: dict, blob: bytes) -> ArchivedPage:
+        """Décompresse une page à partir de son entrée d'index et de ses octets"""
+        return ArchivedPage(
+            scl=entry['scl'],
+            url=entry['url'],
+            timestamp=entry['ts'],
+            status=entry['status'],
+            content_type=entry['type'],
+            content=self._decompress(entry, blob),
+        )
+
+    def get(self, scl: int) -> Optional[ArchivedPage]:
+        """Dernière page archivée pour un scl"""
+        matches = [e for e in self.entries(latest_only=False) if e['scl'] == scl]
+        if not matches:
+            return None
+        entry = max(matches, key=lambda e: e['ts'])
+        return next(self.iter_pages(entries=[entry]))
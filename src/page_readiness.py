@@ -0,0 +1,173 @@
+"""
+Attente de la disponibilité des pages club (remplace le délai fixe de 0.3s).
+
+Au lieu de dormir un temps arbitraire après `goto`, on attend un signal
+concret dans la page:
+- le texte "N° affiliation" apparaît (club trouvé),
+- le h1 du composant `app-club` est attaché (club trouvé),
+- un marqueur "aucun résultat" est affiché dans `app-club` (pas de club).
+
+L'absence n'est jamais déduite du reste de la page (pied de page, widget
+de recherche): ce verdict alimente le cache négatif.
+
+Le timeout est adapté par hôte à partir des durées observées, et chaque
+attente est enregistrée pour les statistiques.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+# États retournés par l'attente
+READY_CLUB = 'club'
+READY_ABSENT = 'absent'
+READY_TIMEOUT = 'timeout'
+
+# Marqueurs affichés par le site quand le scl ne correspond à aucun club
+DEFAULT_ABSENT_MARKERS = [
+    'aucun résultat',
+    'aucun club',
+    "n'existe pas",
+    'page introuvable',
+]
+
+# Prédicat évalué dans la page: retourne l'état dès qu'un signal est présent, sinon null.
+# L'absence n'est lue que dans app-club (élément .no-result d'abord): avant son rendu, le
+# pied de page ou le widget de recherche peuvent contenir les mêmes mots
+READY_PREDICATE_JS = """
+(markers) => {
+    const hasMarker = (element) => {
+        const lower = (element.innerText || '').toLowerCase();
+        return markers.some((marker) => lower.includes(marker));
+    };
+    const club = document.querySelector('app-club');
+    if (!club) {
+        // app-club pas encore rendu: un club peut être reconnu, jamais une absence
+        const text = (document.body && document.body.innerText) || '';
+        return /N[°\\s]*affiliation/i.test(text) ? 'club' : null;
+    }
+    const noResult = club.querySelector('.no-result');
+    if (noResult && hasMarker(noResult)) return 'absent';
+    if (/N[°\\s]*affiliation/i.test(club.innerText || '')) return 'club';
+    if (hasMarker(club)) return 'absent';
+    if (club.querySelector('h1')) return 'club';
+    return null;
+}
+"""
+
+
+@dataclass
+class ReadinessResult:
+    """Résultat d'une attente de disponibilité"""
+    state: str
+    duration_ms: float
+
+
+class HostReadinessStats:
+    """Durées d'attente récentes pour un hôte"""
+
+    def __init__(self, window: int = 200):
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.timeouts = 0
+        self.absent = 0
+
+    def record(self, result: ReadinessResult):
+        self.count += 1
+        if result.state == READY_TIMEOUT:
+            self.timeouts += 1
+        else:
+            self.durations.append(result.duration_ms)
+            if result.state == READY_ABSENT:
+                self.absent += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.durations:
+            return None
+        ordered = sorted(self.durations)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class PageReadiness:
+    """Attend qu'une page club soit exploitable, avec un timeout adaptatif par hôte"""
+
+    def __init__(self, initial_timeout_ms: float = 3000, min_timeout_ms: float = 500,
+                 max_timeout_ms: float = 5000, factor: float = 2.0, min_samples: int = 20,
+                 absent_markers: Optional[List[str]] = None, polling_ms: int = 50):
+        """
+        Args:
+            initial_timeout_ms: Timeout utilisé tant qu'un hôte a trop peu de mesures
+            min_timeout_ms: Borne basse du timeout adaptatif
+            max_timeout_ms: Borne haute du timeout adaptatif
+            factor: Timeout = p95 des durées observées x factor
+            min_samples: Nombre de mesures avant d'adapter le timeout
+            absent_markers: Textes indiquant qu'il n'y a pas de club (minuscules)
+            polling_ms: Intervalle de vérification du prédicat dans la page
+        """
+        self.initial_timeout_ms = initial_timeout_ms
+        self.min_timeout_ms = min_timeout_ms
+        self.max_timeout_ms = max_timeout_ms
+        self.factor = factor
+        self.min_samples = min_samples
+        self.absent_markers = [m.lower() for m in (absent_markers or DEFAULT_ABSENT_MARKERS)]
+        self.polling_ms = polling_ms
+        self.hosts: Dict[str, HostReadinessStats] = {}
+
+    def _stats(self, url: str) -> HostReadinessStats:
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostReadinessStats()
+        return self.hosts[host]
+
+    def timeout_for(self, url: str) -> float:
+        """Timeout (ms) à utiliser pour l'hôte de cette URL"""
+        stats = self._stats(url)
+        if len(stats.durations) < self.min_samples:
+            return self.initial_timeout_ms
+        p95 = stats.percentile(95)
+        return max(self.min_timeout_ms, min(self.max_timeout_ms, p95 * self.factor))
+
+    def wait(self, page, url: str) -> ReadinessResult:
+        """Attend un signal de disponibilité sur une page Playwright synchrone"""
+        timeout = self.timeout_for(url)
+        start = time.perf_counter()
+        try:
+            handle = page.wait_for_function(READY_PREDICATE_JS, arg=self.absent_markers,
+                                            timeout=timeout, polling=self.polling_ms)
+            state = handle.json_value()
+        except Exception:
+            state = READY_TIMEOUT
+        return self._record(url, state, start)
+
+    async def wait_async(self, page, url: str) -> ReadinessResult:
+        """Attend un signal de disponibilité sur une page Playwright asynchrone"""
+        timeout = self.timeout_for(url)
+        start = time.perf_counter()
+        try:
+            handle = await page.wait_for_function(READY_PREDICATE_JS, arg=self.absent_markers,
+                                                  timeout=timeout, polling=self.polling_ms)
+            state = await handle.json_value()
+        except Exception:
+            state = READY_TIMEOUT
+        return self._record(url, state, start)
+
+    def _record(self, url: str, state: str, start: float) -> ReadinessResult:
+        result = ReadinessResult(state=state, duration_ms=(time.perf_counter() - start) * 1000)
+        self._stats(url).record(result)
+        return result
+
+    def summary(self) -> str:
+        """Résumé lisible des durées d'attente par hôte"""
+        lines = []
+        for host, stats in self.hosts.items():
+            p50 = stats.percentile(50)
+            p95 = stats.percentile(95)
+            lines.append(
+                f"{host}: {stats.count} pages | p50={p50 or 0:.0f}ms p95={p95 or 0:.0f}ms | "
+                f"absents={stats.absent} timeouts={stats.timeouts} | "
+                f"timeout actuel={self.timeout_for('https://' + host):.0f}ms"
+            )
+        return "\n".join(lines)
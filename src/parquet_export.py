@@ -0,0 +1,248 @@
+"""
+Export en colonnes (Parquet) des clubs scrapés.
+
+Pour l'analyse (couverture des emails par département, présence du
+téléphone...), relire 30000 lignes CSV non typées à chaque fois est lent.
+`ParquetSink` écrit les clubs en groupes de lignes (`row_group_size`): la
+mémoire reste bornée et un outil d'analyse ne lit que les colonnes dont il
+a besoin. Pendant le scraping, les drivers (`--parquet`) écrivent au fil
+de l'eau les clubs du run dans un fichier annexe (`<sortie>.run`); en fin
+de run, `export_csv` le fusionne avec le CSV complet: une reprise ou une
+plage partielle ne remplace pas le jeu de données par un fragment.
+`fetched_at` vient de chaque enregistrement (le run pour ses clubs,
+l'export précédent pour les autres; vide si inconnu).
+
+Schéma: `scl` et `numero_affiliation` en entiers, chaînes encodées par
+dictionnaire (nom, email, ...), colonnes dérivées `email_domain`,
+`code_postal` et `departement`, `temps_extraction` et `fetched_at`
+(horodatage UTC). Le fichier est écrit sous `<sortie>.tmp` et renommé à
+la fermeture: un fichier Parquet n'est lisible qu'une fois son pied de
+page écrit. Après une interruption ou une erreur, le `.tmp` est laissé et
+l'export précédent conservé.
+
+pyarrow est une dépendance optionnelle (`pip install pyarrow`):
+
+    python src/parquet_export.py clubs_france.csv clubs_france.parquet
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from club_data import STATUS_FOUND, ScrapeResult
+from club_store import CLUB_FIELDS, email_domain, postcode
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dépendance optionnelle: l'export échoue avec un message clair
+    pa = pq = None
+
+DEFAULT_ROW_GROUP_SIZE = 5000
+
+# Colonnes texte encodées par dictionnaire (valeurs souvent répétées ou à faible cardinalité)
+DICTIONARY_COLUMNS = ['nom', 'email', 'telephone', 'adresse', 'url_detail', 'email_domain', 'code_postal',
+                      'departement']
+
+
+def require_pyarrow():
+    """Erreur explicite si pyarrow manque (à vérifier avant de scraper, pas en fin de run)"""
+    if pa is None:
+        raise ImportError("L'export Parquet nécessite pyarrow: pip install pyarrow")
+
+
+def parquet_schema():
+    return pa.schema([
+        pa.field('scl', pa.int32(), nullable=False),
+        pa.field('nom', pa.string(), nullable=False),
+        pa.field('numero_affiliation', pa.int64()),
+        pa.field('email', pa.string()),
+        pa.field('telephone', pa.string()),
+        pa.field('adresse', pa.string()),
+        pa.field('url_detail', pa.string()),
+        pa.field('email_domain', pa.string()),
+        pa.field('code_postal', pa.string()),
+        pa.field('departement', pa.string()),
+        pa.field('temps_extraction', pa.float32()),
+        pa.field('fetched_at', pa.timestamp('ms', tz='UTC')),
+    ])
+
+
+def departement(code_postal: Optional[str]) -> Optional[str]:
+    """Département d'un code postal (3 chiffres outre-mer: 971, 974...)"""
+    if not code_postal:
+        return None
+    return code_postal[:3] if code_postal.startswith(('97', '98')) else code_postal[:2]
+
+
+def run_file_path(parquet_file: str) -> str:
+    """Fichier annexe des clubs d'un run (clubs.parquet -> clubs.parquet.run)"""
+    return parquet_file + '.run'
+
+
+def _read_table(path: str, columns: Optional[List[str]] = None) -> List[Dict]:
+    """Lignes d'un fichier Parquet, fetched_at en millisecondes"""
+    if not os.path.exists(path):
+        return []
+    table = pq.read_table(path, columns=columns)
+    index = table.schema.get_field_index('fetched_at')
+    if index >= 0:
+        table = table.set_column(index, 'fetched_at', table.column('fetched_at').cast(pa.int64()))
+    return table.to_pylist()
+
+
+def _to_int(value) -> Optional[int]:
+    text = str(value).strip() if value is not None else ''
+    return int(text) if text.isdigit() else None
+
+
+class ParquetSink:
+    """Écriture en continu des clubs dans un fichier Parquet, par groupes de lignes"""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, compression: str = 'zstd'):
+        """
+        Args:
+            path: Fichier Parquet de sortie (remplacé à la fermeture, pas après une erreur)
+            row_group_size: Clubs par groupe de lignes (écrit dès qu'il est plein)
+            compression: Codec Parquet ("zstd", "snappy", "gzip" ou "none")
+        """
+        require_pyarrow()
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.row_groups = 0
+        self._schema = parquet_schema()
+        self._columns: Dict[str, list] = {name: [] for name in self._schema.names}
+        self._temp_path = path + '.tmp'
+        self._writer = pq.ParquetWriter(self._temp_path, self._schema, compression=compression,
+                                        use_dictionary=DICTIONARY_COLUMNS)
+
+    def write_row(self, row: Dict[str, str], fetched_at: Optional[float] = None):
+        """
+        Ajoute un club à partir d'une ligne au format CSV; les lignes sans club sont ignorées
+
+        Args:
+            row: Ligne au format CSV (schéma de record_log)
+            fetched_at: Horodatage de récupération (s depuis l'epoch), None si inconnu
+        """
+        if not row.get('nom'):
+            return
+        values = {field: row.get(field) or None for field in CLUB_FIELDS}
+        code_postal = postcode(values['adresse'])
+        elapsed = row.get('temps_extraction')
+        values.update(scl=int(row['scl']), numero_affiliation=_to_int(values['numero_affiliation']),
+                      email_domain=email_domain(values['email']), code_postal=code_postal,
+                      departement=departement(code_postal),
+                      temps_extraction=float(elapsed) if elapsed not in (None, '') else None,
+                      fetched_at=round(fetched_at * 1000) if fetched_at is not None else None)
+        self._append(values)
+
+    def _append(self, values: Dict):
+        """Ajoute une ligne déjà au schéma (fetched_at en millisecondes)"""
+        for name, column in self._columns.items():
+            column.append(values[name])
+        if len(self._columns['scl']) >= self.row_group_size:
+            self.flush()
+
+    def record(self, result: ScrapeResult, elapsed: Optional[float] = None):
+        """Ajoute le club d'un résultat de fetch_club, récupéré maintenant (absences et erreurs ignorées)"""
+        if result.status == STATUS_FOUND and result.club is not None:
+            row = {field: getattr(result.club, field) for field in CLUB_FIELDS}
+            row.update(scl=result.scl, temps_extraction=elapsed)
+            self.write_row(row, time.time())
+
+    def flush(self):
+        """Écrit les clubs en attente comme un groupe de lignes"""
+        count = len(self._columns['scl'])
+        if not count:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=count)
+        self.rows += count
+        self.row_groups += 1
+        self._columns = {name: [] for name in self._schema.names}
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Ferme sans remplacer le fichier de sortie (export incomplet laissé dans le .tmp)"""
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def summary(self) -> str:
+        return f"{self.rows} clubs en {self.row_groups} groupes de lignes dans {self.path}"
+
+
+def export_csv(csv_file: str, parquet_file: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+               run_file: Optional[str] = None) -> ParquetSink:
+    """
+    Convertit un CSV au format scrape_range.py (journal <csv>.log compris) en Parquet
+
+    Args:
+        csv_file: CSV complet (clubs de tous les runs)
+        parquet_file: Export à régénérer; son fetched_at est repris pour les clubs hors du run
+        row_group_size: Clubs par groupe de lignes
+        run_file: Clubs écrits pendant le run (ParquetSink), prioritaires puis supprimés
+    """
+    from record_log import read_records
+
+    require_pyarrow()
+    previous = {row['scl']: row['fetched_at'] for row in _read_table(parquet_file, ['scl', 'fetched_at'])}
+    run_rows = {row['scl']: row for row in _read_table(run_file)} if run_file else {}
+    records = read_records(csv_file)
+    with ParquetSink(parquet_file, row_group_size) as sink:
+        for scl in sorted(records):
+            if not records[scl]['nom']:
+                continue  # absence enregistrée après le club (ou sans club)
+            if scl in run_rows:
+                sink._append(run_rows[scl])
+            else:
+                fetched_at = previous.get(scl)
+                sink.write_row(records[scl], fetched_at / 1000 if fetched_at is not None else None)
+    if run_file and os.path.exists(run_file):
+        os.remove(run_file)
+    return sink
+
+
+def read_columns(parquet_file: str, columns: List[str]):
+    """Lit seulement quelques colonnes (table pyarrow)"""
+    if pq is None:
+        raise ImportError("La lecture Parquet nécessite pyarrow: pip install pyarrow")
+    return pq.read_table(parquet_file, columns=columns)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export Parquet des clubs (à partir du CSV)")
+    parser.add_argument('csv', type=str, nargs='?', default='clubs_france.csv',
+                        help='CSV au format scrape_range.py (défaut: clubs_france.csv)')
+    parser.add_argument('output', type=str, nargs='?', default=None,
+                        help='Fichier Parquet (défaut: <csv sans extension>.parquet)')
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help=f'Clubs par groupe de lignes (défaut: {DEFAULT_ROW_GROUP_SIZE})')
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.csv)[0] + '.parquet'
+    start = time.time()
+    sink = export_csv(args.csv, output, args.row_group_size)
+    print(f"📊 Parquet: {sink.summary()} ({time.time() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
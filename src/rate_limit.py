@@ -0,0 +1,140 @@
+"""
+Limiteur de débit par hôte (seau à jetons), partagé entre threads, tâches
+asyncio et processus.
+
+Chaque hôte a un seau de `burst` jetons rechargé à `rate` jetons/s. Une
+requête réserve un jeton et attend le temps nécessaire si le seau est vide
+(le solde peut devenir négatif: les réservations sont servies dans l'ordre,
+sans attente active).
+
+Sans `state_dir`, les seaux sont en mémoire (threads et tâches asyncio d'un
+même processus). Avec `state_dir`, chaque seau est un petit fichier
+"<hôte>.bucket" verrouillé avec flock pendant la réservation: tous les
+processus (workers d'un pool, ou commandes lancées séparément) qui
+utilisent le même répertoire partagent le même débit par hôte.
+"""
+
+import asyncio
+import os
+import re
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de flock, seaux limités au processus
+    fcntl = None
+
+# Solde de jetons et date de la dernière réservation
+_BUCKET_FORMAT = 'dd'
+_BUCKET_SIZE = struct.calcsize(_BUCKET_FORMAT)
+
+
+class RateLimiter:
+    """Seaux à jetons par hôte, en mémoire ou partagés via des fichiers verrouillés"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, state_dir: Optional[str] = None,
+                 per_domain: bool = False):
+        """
+        Args:
+            rate: Requêtes par seconde autorisées par hôte
+            burst: Taille du seau (requêtes acceptées d'un coup); défaut: max(1, rate)
+            state_dir: Répertoire des seaux partagés entre processus (None: en mémoire)
+            per_domain: Un seau par domaine (gironde.fff.fr et ain.fff.fr -> fff.fr)
+        """
+        if rate <= 0:
+            raise ValueError(f"Débit invalide: {rate} (requêtes/s > 0)")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.per_domain = per_domain
+        self.state_dir = state_dir
+        if state_dir is not None and fcntl is None:
+            print("⚠️  flock indisponible: limiteur de débit propre à chaque processus")
+            self.state_dir = None
+        if self.state_dir is not None:
+            os.makedirs(self.state_dir, exist_ok=True)
+        self.requests = 0
+        self.delayed = 0
+        self.waited = 0.0
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._fds: Dict[str, int] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def key(self, url: str) -> str:
+        """Seau d'une URL (ou d'un nom d'hôte)"""
+        host = (urlparse(url).hostname if '//' in url else url) or url
+        if self.per_domain:
+            host = '.'.join(host.split('.')[-2:])
+        return host.lower()
+
+    def _refill(self, tokens: float, last: float, now: float) -> Tuple[float, float]:
+        """Recharge le seau, réserve un jeton; retourne (nouveau solde, attente en s)"""
+        tokens = min(self.burst, tokens + (now - last) * self.rate) - 1
+        return tokens, (-tokens / self.rate if tokens < 0 else 0.0)
+
+    def _bucket_fd(self, key: str) -> int:
+        if self._pid != os.getpid():
+            # Processus forké: les descripteurs hérités partageraient le verrou du parent
+            self._fds = {}
+            self._pid = os.getpid()
+        fd = self._fds.get(key)
+        if fd is None:
+            name = re.sub(r'[^a-z0-9.-]', '_', key) + '.bucket'
+            fd = os.open(os.path.join(self.state_dir, name), os.O_RDWR | os.O_CREAT, 0o644)
+            self._fds[key] = fd
+        return fd
+
+    def reserve(self, url: str) -> float:
+        """Réserve une requête vers l'hôte de l'URL; retourne le temps à attendre (s)"""
+        key = self.key(url)
+        with self._lock:
+            now = time.time()
+            if self.state_dir is None:
+                tokens, last = self._buckets.get(key, (self.burst, now))
+                tokens, wait = self._refill(tokens, last, now)
+                self._buckets[key] = (tokens, now)
+            else:
+                fd = self._bucket_fd(key)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    data = os.pread(fd, _BUCKET_SIZE, 0)
+                    tokens, last = struct.unpack(_BUCKET_FORMAT, data) if len(data) == _BUCKET_SIZE else (self.burst, now)
+                    tokens, wait = self._refill(tokens, last, now)
+                    os.pwrite(fd, struct.pack(_BUCKET_FORMAT, tokens, now), 0)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            self.requests += 1
+            if wait > 0:
+                self.delayed += 1
+                self.waited += wait
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """Attend le droit d'envoyer une requête (threads); retourne l'attente (s)"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Comme acquire, sans bloquer la boucle asyncio"""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def summary(self) -> str:
+        shared = f", partagé via {self.state_dir}" if self.state_dir else ""
+        return (f"{self.rate:g} req/s par hôte (rafale {self.burst:g}{shared}): {self.requests} requêtes, "
+                f"{self.delayed} retardées, {self.waited:.1f}s d'attente")
+
+    def close(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                for fd in self._fds.values():
+                    os.close(fd)
+            self._fds = {}
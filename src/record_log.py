@@ -0,0 +1,210 @@
+"""
+Sortie CSV mise à jour par journal d'ajouts et compaction.
+
+Au lieu de relire tout `clubs_france.csv` puis de le réécrire trié en fin
+de plage, chaque résultat est ajouté dès qu'il arrive à un journal
+(`<sortie>.log`, lignes CSV sans en-tête, même schéma). Le CSV trié n'est
+réécrit que par la compaction: fusion CSV + journal, la dernière ligne de
+chaque scl l'emporte, écriture dans un fichier temporaire puis
+remplacement atomique.
+
+La compaction tourne en arrière-plan dès que le journal dépasse
+`compact_ratio` fois la taille du CSV (et au moins `min_compact_bytes`):
+un rafraîchissement de 100 numéros n'ajoute que 100 lignes au journal
+sans réécrire les 30000 lignes du CSV. Pendant une compaction, le journal
+est mis de côté (`<sortie>.log.1`) et les ajouts continuent dans un
+nouveau journal; après un arrêt brutal, les deux sont repris à la
+compaction suivante. `read_records` donne l'état à jour (CSV + journaux)
+sans compacter; `python src/record_log.py clubs_france.csv` force une
+compaction.
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+FIELDNAMES = ['scl', 'nom', 'numero_affiliation', 'email', 'telephone', 'adresse', 'url_detail', 'temps_extraction']
+
+
+def default_log_path(output_file: str) -> str:
+    """Journal associé à un fichier de sortie (clubs_france.csv -> clubs_france.csv.log)"""
+    return output_file + '.log'
+
+
+def _iter_log(path: str) -> Iterator[Dict[str, str]]:
+    """Lignes d'un journal; une dernière ligne tronquée (arrêt en pleine écriture) est ignorée"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        data = f.read()
+    data = data[:data.rfind('\n') + 1]
+    for values in csv.reader(io.StringIO(data, newline='')):
+        if len(values) == len(FIELDNAMES) and values[0].isdigit():
+            yield dict(zip(FIELDNAMES, values))
+
+
+def _iter_csv(path: str) -> Iterator[Dict[str, str]]:
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            scl = (row.get('scl') or '').strip()
+            if scl.isdigit():
+                yield {field: row.get(field) or '' for field in FIELDNAMES}
+
+
+def read_records(output_file: str, log_file: Optional[str] = None) -> Dict[int, Dict[str, str]]:
+    """État à jour de la sortie: CSV puis journaux, la dernière ligne de chaque scl l'emporte"""
+    log_file = log_file or default_log_path(output_file)
+    records = {}
+    for path_rows in (_iter_csv(output_file), _iter_log(log_file + '.1'), _iter_log(log_file)):
+        for row in path_rows:
+            records[int(row['scl'])] = row
+    return records
+
+
+class RecordLog:
+    """Ajouts au fil de l'eau et compaction en arrière-plan d'une sortie CSV"""
+
+    def __init__(self, output_file: str, log_file: Optional[str] = None, compact_ratio: float = 0.5,
+                 min_compact_bytes: int = 1 << 20, check_interval: float = 30.0, sync_interval: float = 5.0):
+        """
+        Args:
+            output_file: CSV trié par scl
+            log_file: Journal des ajouts (défaut: <sortie>.log)
+            compact_ratio: Taille du journal, relative au CSV, qui déclenche une compaction
+            min_compact_bytes: Taille minimale du journal pour déclencher une compaction
+            check_interval: Intervalle de vérification du seuil en arrière-plan (s), 0 pour désactiver
+            sync_interval: Intervalle de synchronisation du journal sur disque (s)
+        """
+        self.output_file = output_file
+        self.log_file = log_file or default_log_path(output_file)
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self.sync_interval = sync_interval
+        self.appended = 0
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._file = open(self.log_file, 'a', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES)
+        self._last_sync = time.time()
+        self._stop = threading.Event()
+        self._thread = None
+        if check_interval > 0:
+            self._thread = threading.Thread(target=self._run, args=(check_interval,), daemon=True)
+            self._thread.start()
+
+    def append(self, row: Dict[str, str]):
+        """Ajoute une ligne (remplace toute ligne précédente du même scl)"""
+        with self._lock:
+            self._writer.writerow({field: row.get(field, '') for field in FIELDNAMES})
+            # Écrit à chaque ligne: conservé par le système même si le processus est tué
+            self._file.flush()
+            self.appended += 1
+            if time.time() - self._last_sync >= self.sync_interval:
+                os.fsync(self._file.fileno())
+                self._last_sync = time.time()
+
+    def pending_bytes(self) -> int:
+        """Taille des journaux pas encore fusionnés dans le CSV"""
+        return sum(os.path.getsize(path) for path in (self.log_file, self.log_file + '.1')
+                   if os.path.exists(path))
+
+    def needs_compaction(self) -> bool:
+        pending = self.pending_bytes()
+        if not os.path.exists(self.output_file):
+            return pending > 0  # premier run: le CSV est créé
+        return pending >= self.min_compact_bytes and pending >= self.compact_ratio * os.path.getsize(self.output_file)
+
+    def _run(self, check_interval: float):
+        while not self._stop.wait(check_interval):
+            try:
+                if self.needs_compaction():
+                    self.compact()
+            except Exception as e:
+                print(f"  ⚠️  Compaction de {self.output_file} impossible: {e}")
+
+    def compact(self) -> int:
+        """Fusionne les journaux dans le CSV trié; retourne le nombre de lignes écrites"""
+        with self._compact_lock:
+            rotated = self.log_file + '.1'
+            with self._lock:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                # Un journal déjà mis de côté (compaction interrompue) est fusionné d'abord
+                if not os.path.exists(rotated) and self._file.tell() > 0:
+                    self._file.close()
+                    os.replace(self.log_file, rotated)
+                    self._file = open(self.log_file, 'a', encoding='utf-8', newline='')
+                    self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES)
+
+            # Le journal courant n'est pas lu: il reste pour la compaction suivante
+            records = {}
+            for rows in (_iter_csv(self.output_file), _iter_log(rotated)):
+                for row in rows:
+                    records[int(row['scl'])] = row
+
+            temp_file = self.output_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+                for scl in sorted(records):
+                    writer.writerow(records[scl])
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.output_file)
+            if os.path.exists(rotated):
+                os.remove(rotated)
+            self.compactions += 1
+            return len(records)
+
+    def close(self, compact: Optional[bool] = None):
+        """
+        Arrête la compaction en arrière-plan et ferme le journal
+
+        Args:
+            compact: True pour compacter, False pour laisser le journal, None selon le seuil
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        if compact or (compact is None and self.needs_compaction()):
+            self.compact()
+            # Rien n'a pu s'ajouter depuis: le journal courant est fusionné aussi
+            if self.pending_bytes():
+                self.compact()
+        with self._lock:
+            self._file.close()
+        if os.path.exists(self.log_file) and not os.path.getsize(self.log_file):
+            os.remove(self.log_file)
+
+    def summary(self) -> str:
+        pending = self.pending_bytes()
+        state = f"{pending / 1024:.0f} Kio en attente de compaction" if pending else "CSV à jour"
+        return f"{self.appended} lignes ajoutées, {self.compactions} compactions, {state}"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fusionne le journal des ajouts dans le CSV trié")
+    parser.add_argument('output', type=str, nargs='?', default='clubs_france.csv',
+                        help='Fichier CSV de sortie (défaut: clubs_france.csv)')
+    args = parser.parse_args()
+
+    log = RecordLog(args.output, check_interval=0)
+    pending = log.pending_bytes()
+    rows = log.compact()
+    log.close(compact=False)
+    print(f"🗜️  {args.output}: {pending / 1024:.0f} Kio de journal fusionnés, {rows} lignes")
+
+
+if __name__ == "__main__":
+    main()
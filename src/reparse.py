@@ -0,0 +1,339 @@
+"""
+Re-parsing hors ligne des pages sauvegardées (sans réseau).
+
+Sources acceptées:
+- une archive `page_archive` (répertoire contenant des fichiers .idx),
+- un répertoire de pages HTML/JSON nommées par scl (ex: 6504.html, scl_6504.html),
+- une archive tar (.tar, .tar.gz, .tgz...) avec les mêmes noms de fichiers.
+
+Les pages sont lues au fil de l'eau et envoyées par lots à un pool de
+processus; le nombre de lots en cours est borné, la mémoire ne dépend donc
+pas de la taille de l'entrée. La sortie (CSV ou JSONL) a le même schéma que
+scripts/scrape_range.py, triée par scl: tri externe par morceaux triés
+fusionnés (`heapq.merge`), sans charger toute la sortie en mémoire.
+"""
+
+import csv
+import heapq
+import json
+import os
+import re
+import sys
+import tarfile
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from club_api import club_from_payload
+from club_data import ClubData
+from club_page_parser import ClubPageParser
+from page_archive import ArchiveReader
+
+# Schéma de sortie de scripts/scrape_range.py
+FIELDNAMES = ['scl', 'nom', 'numero_affiliation', 'email', 'telephone', 'adresse', 'url_detail', 'temps_extraction']
+
+# Numéro scl dans un nom de fichier: dernier groupe de chiffres (6504.html, scl_6504.html, scl=6504.html)
+SCL_FILENAME_RE = re.compile(r'(\d+)(?!.*\d)')
+PAGE_EXTENSIONS = {'.html': 'html', '.htm': 'html', '.json': 'json'}
+
+# Lignes triées en mémoire à la fois lors du tri de la sortie
+SORT_CHUNK_ROWS = 100000
+
+# Page à re-parser: (scl, url, type de contenu, contenu)
+PageTask = Tuple[int, str, str, str]
+
+_parser: Optional[ClubPageParser] = None
+
+
+def _content_type(name: str) -> Optional[str]:
+    """Type de contenu d'après l'extension, None si le fichier n'est pas une page"""
+    return PAGE_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def _scl_from_name(name: str) -> Optional[int]:
+    """Numéro scl tiré du nom de fichier (sans extension)"""
+    match = SCL_FILENAME_RE.search(os.path.splitext(os.path.basename(name))[0])
+    return int(match.group(1)) if match else None
+
+
+def iter_archive(directory: str, base_url: str) -> Iterator[PageTask]:
+    """Dernière page archivée de chaque scl"""
+    for page in ArchiveReader(directory).iter_pages():
+        if page.content_type == 'json' and page.status == '404':
+            # Pas de club: réponse de l'API sans contenu utile
+            yield page.scl, page.url, 'absent', ''
+        else:
+            yield page.scl, page.url, page.content_type, page.content
+
+
+def iter_directory(directory: str, base_url: str) -> Iterator[PageTask]:
+    """Pages d'un répertoire (récursif), nommées par scl"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            content_type = _content_type(name)
+            scl = _scl_from_name(name)
+            if content_type is None or scl is None:
+                continue
+            with open(os.path.join(root, name), 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+            yield scl, f"{base_url}/recherche-clubs?scl={scl}", content_type, content
+
+
+def iter_tarball(path: str, base_url: str) -> Iterator[PageTask]:
+    """Pages d'une archive tar, lue en flux (compression détectée automatiquement)"""
+    with tarfile.open(path, 'r|*') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            content_type = _content_type(member.name)
+            scl = _scl_from_name(member.name)
+            if content_type is None or scl is None:
+                continue
+            content = tar.extractfile(member).read().decode('utf-8', errors='replace')
+            yield scl, f"{base_url}/recherche-clubs?scl={scl}", content_type, content
+
+
+def iter_pages(source: str, base_url: str = "https://gironde.fff.fr") -> Iterator[PageTask]:
+    """Choisit le lecteur selon la source (archive, répertoire ou tar)"""
+    if os.path.isdir(source):
+        if any(name.endswith('.idx') for name in os.listdir(source)):
+            return iter_archive(source, base_url)
+        return iter_directory(source, base_url)
+    if tarfile.is_tarfile(source):
+        return iter_tarball(source, base_url)
+    raise ValueError(f"Source non reconnue (archive, répertoire ou tar attendu): {source}")
+
+
+def parse_page(parser: ClubPageParser, content_type: str, content: str, url: str) -> Optional[ClubData]:
+    """Extrait le club d'une page HTML ou d'une réponse JSON de l'API"""
+    if content_type == 'html':
+        return parser.parse(content, url)
+    if content_type == 'json':
+        try:
+            return club_from_payload(json.loads(content), url)
+        except ValueError:
+            return None
+    return None
+
+
+def _row(scl: int, club_data: Optional[ClubData], elapsed: float) -> Dict[str, str]:
+    """Ligne au format de scrape_range.py (ligne vide si pas de club)"""
+    if club_data is None:
+        return {'scl': str(scl), 'nom': '', 'numero_affiliation': '', 'email': '', 'telephone': '',
+                'adresse': '', 'url_detail': '', 'temps_extraction': f"{elapsed:.2f}"}
+    return {
+        'scl': str(scl),
+        'nom': club_data.nom,
+        'numero_affiliation': club_data.numero_affiliation or '',
+        'email': club_data.email or '',
+        'telephone': club_data.telephone or '',
+        'adresse': club_data.adresse or '',
+        'url_detail': club_data.url_detail or '',
+        'temps_extraction': f"{elapsed:.2f}"
+    }
+
+
+def _parse_batch(batch: List[PageTask]) -> List[Dict[str, str]]:
+    """Parse un lot de pages dans un processus worker"""
+    global _parser
+    if _parser is None:
+        _parser = ClubPageParser()
+    rows = []
+    for scl, url, content_type, content in batch:
+        start = time.time()
+        try:
+            club_data = parse_page(_parser, content_type, content, url)
+        except Exception as e:
+            print(f"  ⚠️  Erreur pour scl={scl}: {e}")
+            club_data = None
+        rows.append(_row(scl, club_data, time.time() - start))
+    return rows
+
+
+def _batches(pages: Iterable[PageTask], batch_size: int) -> Iterator[List[PageTask]]:
+    batch = []
+    for page in pages:
+        batch.append(page)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _RowWriter:
+    """Écriture des lignes au fil de l'eau, en CSV ou JSONL selon l'extension"""
+
+    def __init__(self, path: str):
+        self.jsonl = path.endswith('.jsonl')
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        if not self.jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDNAMES)
+            self.writer.writeheader()
+
+    def write(self, rows: List[Dict[str, str]]):
+        if self.jsonl:
+            for row in rows:
+                self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        else:
+            self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+def _write_chunk(directory: str, index: int, chunk: List[Tuple[int, int, Dict[str, str]]]) -> str:
+    """Écrit un morceau trié par (scl, ordre de lecture) dans un fichier temporaire JSONL"""
+    chunk.sort(key=lambda item: item[:2])
+    path = os.path.join(directory, f"chunk_{index:05d}.jsonl")
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in chunk:
+            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+    return path
+
+
+def _iter_chunk(path: str) -> Iterator[Tuple[int, int, Dict[str, str]]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def _sort_output(path: str, chunk_rows: int = SORT_CHUNK_ROWS):
+    """
+    Trie la sortie par scl, une ligne par scl (la dernière lue gagne)
+
+    Tri externe: morceaux de `chunk_rows` lignes triés en mémoire et écrits à
+    part, puis fusionnés par heapq.merge; seule la ligne courante de chaque
+    morceau est en mémoire pendant la fusion.
+    """
+    jsonl = path.endswith('.jsonl')
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory, prefix='.sort_') as chunk_dir:
+        chunk_paths = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = map(json.loads, f) if jsonl else csv.DictReader(f)
+            chunk = []
+            for position, row in enumerate(rows):
+                chunk.append((int(row['scl']), position, row))
+                if len(chunk) >= chunk_rows:
+                    chunk_paths.append(_write_chunk(chunk_dir, len(chunk_paths), chunk))
+                    chunk = []
+            if chunk:
+                chunk_paths.append(_write_chunk(chunk_dir, len(chunk_paths), chunk))
+
+        merged = heapq.merge(*(_iter_chunk(chunk_path) for chunk_path in chunk_paths), key=lambda item: item[:2])
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', dir=directory,
+                                         suffix='.tmp', delete=False) as f:
+            writer = None
+            if not jsonl:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+            last, last_scl = None, None
+            for scl, position, row in merged:
+                # Lignes d'un même scl consécutives, par ordre de lecture: seule la dernière est écrite
+                if last is not None and scl != last_scl:
+                    _write_sorted_row(f, writer, last)
+                last, last_scl = row, scl
+            if last is not None:
+                _write_sorted_row(f, writer, last)
+    os.replace(f.name, path)
+
+
+def _write_sorted_row(f, writer: Optional[csv.DictWriter], row: Dict[str, str]):
+    if writer is None:
+        f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        writer.writerow(row)
+
+
+def reparse(source: str, output_file: str = "clubs_reparsed.csv", workers: Optional[int] = None,
+            batch_size: int = 64, base_url: str = "https://gironde.fff.fr",
+            progress_interval: int = 1000) -> Dict[str, int]:
+    """
+    Re-parse toutes les pages d'une source et écrit un CSV/JSONL au format de scrape_range.py.
+
+    Args:
+        source: Archive page_archive, répertoire de pages ou fichier tar
+        output_file: Fichier de sortie (.csv ou .jsonl)
+        workers: Nombre de processus (défaut: nombre de cœurs)
+        batch_size: Nombre de pages par lot envoyé à un worker
+        base_url: URL de base pour url_detail (répertoire et tar)
+        progress_interval: Afficher le progrès tous les N pages
+
+    Returns:
+        Statistiques {'pages': ..., 'clubs': ...}
+    """
+    workers = workers or os.cpu_count() or 1
+    # Lots en cours bornés: la mémoire ne dépend pas de la taille de la source
+    max_pending = workers * 2
+    pages = iter_pages(source, base_url)
+    stats = {'pages': 0, 'clubs': 0}
+    start_time = time.time()
+    next_progress = progress_interval
+
+    print(f"🔁 Re-parsing de {source} ({workers} processus, lots de {batch_size})")
+
+    output = _RowWriter(output_file)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for batch in _batches(pages, batch_size):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _collect(future.result(), output, stats)
+                pending.add(executor.submit(_parse_batch, batch))
+                if stats['pages'] >= next_progress:
+                    rate = stats['pages'] / (time.time() - start_time)
+                    print(f"  📊 {stats['pages']} pages - {stats['clubs']} clubs - {rate:.0f} pages/s")
+                    next_progress += progress_interval
+            for future in pending:
+                _collect(future.result(), output, stats)
+    finally:
+        output.close()
+
+    _sort_output(output_file)
+
+    total_time = time.time() - start_time
+    rate = stats['pages'] / total_time if total_time > 0 else 0
+    print(f"\n✅ Re-parsing terminé: {stats['clubs']} clubs sur {stats['pages']} pages "
+          f"({total_time:.1f}s, {rate:.0f} pages/s)")
+    print(f"💾 Résultats sauvegardés dans: {output_file}")
+    return stats
+
+
+def _collect(rows: List[Dict[str, str]], output: _RowWriter, stats: Dict[str, int]):
+    output.write(rows)
+    stats['pages'] += len(rows)
+    stats['clubs'] += sum(1 for row in rows if row['nom'])
+
+
+def main():
+    """Fonction principale du re-parsing"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-parse des pages club sauvegardées, sans réseau")
+    parser.add_argument('source', type=str,
+                       help='Archive (--archive des scrapers), répertoire de pages <scl>.html ou fichier tar')
+    parser.add_argument('--output', type=str, default='clubs_reparsed.csv',
+                       help='Fichier de sortie .csv ou .jsonl (défaut: clubs_reparsed.csv)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Nombre de processus (défaut: nombre de cœurs)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                       help='Nombre de pages par lot (défaut: 64)')
+    parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                       help='URL de base pour url_detail (répertoire et tar)')
+
+    args = parser.parse_args()
+
+    reparse(args.source, args.output, workers=args.workers, batch_size=args.batch_size,
+            base_url=args.base_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Profils d'interception des requêtes pour les pages club.
+
+Le scraper n'a besoin que du bundle Angular et des données du club:
+images, polices, CSS, publicités et analytics sont annulés via `page.route`
+pour économiser bande passante et CPU à chaque navigation.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Union
+from urllib.parse import urlparse
+
+# Hôtes tiers connus (publicité, analytics, réseaux sociaux)
+THIRD_PARTY_DENY_HOSTS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'doubleclick.net',
+    'googleadservices.com',
+    'facebook.net',
+    'facebook.com',
+    'twitter.com',
+    'hotjar.com',
+    'xiti.com',
+    'atinternet.com',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'didomi.io',
+    'youtube.com',
+    'dailymotion.com',
+]
+
+
+def _host_matches(host: str, suffixes: List[str]) -> bool:
+    """Vrai si l'hôte est égal à un des suffixes ou en est un sous-domaine"""
+    return any(host == suffix or host.endswith('.' + suffix) for suffix in suffixes)
+
+
+@dataclass
+class BlockingProfile:
+    """Règles d'annulation des requêtes non essentielles"""
+    name: str
+    # Types de ressources Playwright annulés (image, font, stylesheet, media...)
+    blocked_resource_types: Set[str] = field(default_factory=set)
+    # Hôtes toujours annulés (suffixes de domaine)
+    deny_hosts: List[str] = field(default_factory=list)
+    # Hôtes toujours autorisés, prioritaires sur tout le reste
+    allow_hosts: List[str] = field(default_factory=list)
+    # Annuler tout hôte qui n'est pas dans allow_hosts
+    first_party_only: bool = False
+    blocked: int = 0
+    allowed: int = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Indique si une requête doit être annulée"""
+        host = urlparse(url).hostname or ''
+        if resource_type == 'document':
+            return False
+        if _host_matches(host, self.allow_hosts):
+            return resource_type in self.blocked_resource_types
+        if _host_matches(host, self.deny_hosts):
+            return True
+        if self.first_party_only and host:
+            return True
+        return resource_type in self.blocked_resource_types
+
+    def _decide(self, route) -> bool:
+        request = route.request
+        block = self.should_block(request.url, request.resource_type)
+        if block:
+            self.blocked += 1
+        else:
+            self.allowed += 1
+        return block
+
+    def handle_route(self, route):
+        """Handler pour `page.route` (API synchrone)"""
+        if self._decide(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_route_async(self, route):
+        """Handler pour `page.route` / `context.route` (API asynchrone)"""
+        if self._decide(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+def safe_profile() -> BlockingProfile:
+    """Annule images, médias, polices et hôtes publicitaires/analytics connus"""
+    return BlockingProfile(
+        name='safe',
+        blocked_resource_types={'image', 'media', 'font'},
+        deny_hosts=list(THIRD_PARTY_DENY_HOSTS),
+        allow_hosts=['fff.fr'],
+    )
+
+
+def strict_profile() -> BlockingProfile:
+    """N'autorise que le document, les scripts et les XHR des domaines fff.fr"""
+    return BlockingProfile(
+        name='strict',
+        blocked_resource_types={'image', 'media', 'font', 'stylesheet', 'texttrack',
+                                'eventsource', 'websocket', 'manifest', 'ping', 'other'},
+        deny_hosts=list(THIRD_PARTY_DENY_HOSTS),
+        allow_hosts=['fff.fr'],
+        first_party_only=True,
+    )
+
+
+PROFILES = {
+    'safe': safe_profile,
+    'strict': strict_profile,
+}
+
+
+def get_profile(profile: Union[str, BlockingProfile, None]) -> Optional[BlockingProfile]:
+    """
+    Retourne un profil à partir de son nom ("safe", "strict") ou d'une instance.
+
+    Raises:
+        ValueError: si le nom de profil est inconnu
+    """
+    if profile is None or isinstance(profile, BlockingProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Profil de blocage inconnu: {profile} (choix: {', '.join(PROFILES)})")
+    return PROFILES[profile]()
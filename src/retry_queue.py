@@ -0,0 +1,151 @@
+"""
+Nouvelles tentatives différées des scl en échec transitoire.
+
+Un timeout ou une erreur 5xx ne veut pas dire "pas de club": le scl est mis
+dans une file et retenté après le balayage principal, avec un délai
+exponentiel (base * 2^(tentatives - 1), plafonné) et une gigue aléatoire
+pour ne pas renvoyer toutes les requêtes en même temps. Le balayage
+principal n'attend donc jamais un scl lent.
+
+Les fonctions `transient_http_error`, `result_without_club` et
+`result_from_exception` classent les échecs des scrapers (transitoire ou
+durable).
+"""
+
+import asyncio
+import heapq
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from club_data import STATUS_ERROR, STATUS_TRANSIENT, ScrapeResult
+from page_readiness import READY_TIMEOUT
+
+# Messages d'exception qui signalent un problème passager (réseau, navigateur surchargé)
+TRANSIENT_ERROR_MARKERS = ('timeout', 'net::', 'connection', 'target closed', 'crash')
+
+
+def transient_http_error(status: Optional[int]) -> Optional[str]:
+    """Cause d'échec transitoire pour un statut HTTP (429, 5xx), sinon None"""
+    if status is not None and (status == 429 or status >= 500):
+        return f"HTTP {status}"
+    return None
+
+
+def result_without_club(scl: int, state: str) -> ScrapeResult:
+    """Page chargée sans club extrait: pas encore rendue (transitoire) ou non reconnue (durable)"""
+    if state == READY_TIMEOUT:
+        return ScrapeResult(scl, STATUS_TRANSIENT, error="page non rendue à temps")
+    return ScrapeResult(scl, STATUS_ERROR, error="page club non reconnue")
+
+
+def result_from_exception(scl: int, error: Exception) -> ScrapeResult:
+    """Classe une exception d'extraction"""
+    message = f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+    lower = message.lower()
+    status = STATUS_TRANSIENT if any(marker in lower for marker in TRANSIENT_ERROR_MARKERS) else STATUS_ERROR
+    return ScrapeResult(scl, status, error=message)
+
+
+@dataclass
+class RetryPolicy:
+    """Nombre de tentatives et délais entre elles"""
+    max_attempts: int = 4
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    jitter: float = 0.5
+
+    def delay(self, attempts: int) -> float:
+        """Délai avant la tentative suivante, après `attempts` tentatives (s)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class RetryQueue:
+    """File des scl à retenter, ordonnée par date de la prochaine tentative"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None):
+        self.policy = policy or RetryPolicy()
+        self.attempts: Dict[int, int] = {}
+        self.given_up: Dict[int, Optional[str]] = {}
+        self.retried = 0
+        self.recovered = 0
+        self._heap: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, result: ScrapeResult) -> bool:
+        """
+        Programme une nouvelle tentative pour un échec transitoire.
+
+        Returns:
+            False si le nombre maximal de tentatives est atteint (scl abandonné)
+        """
+        attempts = self.attempts.get(result.scl, 0) + 1
+        self.attempts[result.scl] = attempts
+        if attempts >= self.policy.max_attempts:
+            self.given_up[result.scl] = result.error
+            return False
+        heapq.heappush(self._heap, (time.time() + self.policy.delay(attempts), result.scl))
+        return True
+
+    def record(self, result: ScrapeResult) -> bool:
+        """
+        Traite le résultat d'une tentative (première ou nouvelle).
+
+        Returns:
+            True si le résultat est définitif (club, absence, erreur durable ou abandon)
+        """
+        if result.status == STATUS_TRANSIENT:
+            return not self.push(result)
+        if result.scl in self.attempts:
+            self.recovered += 1
+        return True
+
+    def _pop(self) -> Tuple[int, float]:
+        ready_at, scl = heapq.heappop(self._heap)
+        self.retried += 1
+        return scl, max(0.0, ready_at - time.time())
+
+    def pop(self) -> Optional[int]:
+        """Prochain scl à retenter, après avoir attendu son délai (None si la file est vide)"""
+        if not self._heap:
+            return None
+        scl, wait = self._pop()
+        time.sleep(wait)
+        return scl
+
+    async def pop_async(self) -> Optional[int]:
+        """Comme pop, sans bloquer la boucle asyncio"""
+        if not self._heap:
+            return None
+        scl, wait = self._pop()
+        await asyncio.sleep(wait)
+        return scl
+
+    def pop_due(self) -> List[int]:
+        """Attend la première échéance puis retire tous les scl dus (pour un envoi par lots)"""
+        if not self._heap:
+            return []
+        scl, wait = self._pop()
+        time.sleep(wait)
+        due = [scl]
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            due.append(self._pop()[0])
+        return due
+
+    def drain(self, fetch: Callable[[int], ScrapeResult]) -> Iterator[ScrapeResult]:
+        """Retente les scl de la file un par un; produit les résultats définitifs"""
+        scl = self.pop()
+        while scl is not None:
+            result = fetch(scl)
+            if self.record(result):
+                yield result
+            scl = self.pop()
+
+    def summary(self) -> str:
+        return (f"{self.retried} nouvelles tentatives, {self.recovered} scl récupérés, "
+                f"{len(self.given_up)} abandonnés après {self.policy.max_attempts} tentatives")
@@ -0,0 +1,137 @@
+"""
+Point de reprise exact d'un balayage scl.
+
+Un octet par numéro scl dans un fichier projeté en mémoire (mmap):
+en attente, club trouvé, absent ou en erreur. Chaque résultat est écrit
+dès qu'il arrive (écriture d'un octet, sans réécrire le fichier); le
+système le conserve même si le processus est tué, et le fichier est
+synchronisé sur disque toutes les `flush_interval` secondes.
+
+À la relance, les numéros trouvés ou absents sont sautés; les numéros en
+erreur ou jamais traités (y compris sous le plus grand scl déjà vu) sont
+retestés. Le fichier est supprimé à la fin d'un balayage complet: le run
+suivant repart de zéro.
+
+Format: en-tête de 16 octets (signature, version), puis l'octet du scl N
+à la position 16 + N. Le fichier grandit par tranches de 64 Kio.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Iterator
+
+from club_data import STATUS_ABSENT, STATUS_FOUND
+
+PENDING = 0
+FOUND = 1
+ABSENT = 2
+ERROR = 3
+
+STATE_NAMES = {PENDING: 'en attente', FOUND: 'trouvés', ABSENT: 'absents', ERROR: 'en erreur'}
+
+_MAGIC = b'SCLCKPT'
+_HEADER = struct.Struct('<7sBQ')  # signature, version, réservé
+_GROWTH = 64 * 1024
+
+
+def default_checkpoint_path(output_file: str) -> str:
+    """Point de reprise associé à un fichier de sortie (clubs_france.csv -> clubs_france.csv.ckpt)"""
+    return output_file + '.ckpt'
+
+
+class ScanCheckpoint:
+    """État de chaque numéro scl d'un balayage, projeté en mémoire"""
+
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        """
+        Args:
+            path: Fichier du point de reprise (créé s'il n'existe pas)
+            flush_interval: Intervalle de synchronisation sur disque (s)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.resumed = os.path.exists(path) and os.path.getsize(path) > _HEADER.size
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < _HEADER.size:
+            os.pwrite(self._fd, _HEADER.pack(_MAGIC, 1, 0), 0)
+            size = _HEADER.size + _GROWTH
+            os.ftruncate(self._fd, size)
+        else:
+            magic, version, _ = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+            if magic != _MAGIC or version != 1:
+                os.close(self._fd)
+                raise ValueError(f"{path} n'est pas un point de reprise scl")
+        self._mm = mmap.mmap(self._fd, size)
+        self._last_flush = time.time()
+
+    @property
+    def capacity(self) -> int:
+        """Plus grand scl représentable sans agrandir le fichier, plus un"""
+        return len(self._mm) - _HEADER.size
+
+    def _grow(self, scl: int):
+        size = _HEADER.size + (scl // _GROWTH + 1) * _GROWTH
+        self._mm.flush()
+        self._mm.close()
+        os.ftruncate(self._fd, size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    def get(self, scl: int) -> int:
+        """État d'un numéro (PENDING s'il n'a jamais été traité)"""
+        if scl >= self.capacity:
+            return PENDING
+        return self._mm[_HEADER.size + scl]
+
+    def set(self, scl: int, state: int):
+        """Enregistre l'état d'un numéro (un octet écrit en place)"""
+        with self._lock:
+            if scl >= self.capacity:
+                self._grow(scl)
+            self._mm[_HEADER.size + scl] = state
+            if time.time() - self._last_flush >= self.flush_interval:
+                self._mm.flush()
+                self._last_flush = time.time()
+
+    def record(self, scl: int, status: str):
+        """Enregistre le résultat définitif d'un numéro (statut ScrapeResult)"""
+        self.set(scl, FOUND if status == STATUS_FOUND else ABSENT if status == STATUS_ABSENT else ERROR)
+
+    def is_done(self, scl: int) -> bool:
+        """Vrai si le numéro n'est pas à retester (club trouvé ou absence confirmée)"""
+        return self.get(scl) in (FOUND, ABSENT)
+
+    def scls(self, state: int) -> Iterator[int]:
+        """Numéros dans un état donné (hors PENDING), par ordre croissant"""
+        data = self._mm[_HEADER.size:]
+        marker = bytes([state])
+        position = data.find(marker)
+        while position != -1:
+            yield position
+            position = data.find(marker, position + 1)
+
+    def counts(self) -> Counter:
+        data = self._mm[_HEADER.size:]
+        return Counter({state: data.count(bytes([state])) for state in (FOUND, ABSENT, ERROR)})
+
+    def summary(self) -> str:
+        counts = self.counts()
+        return ", ".join(f"{counts[state]} {STATE_NAMES[state]}" for state in (FOUND, ABSENT, ERROR))
+
+    def close(self):
+        with self._lock:
+            if not self._mm.closed:
+                self._mm.flush()
+                self._mm.close()
+                os.close(self._fd)
+
+    def remove(self):
+        """Balayage complet: le point de reprise n'a plus lieu d'être"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,301 @@
+"""
+Index de densité des scl valides et planification des numéros à tester.
+
+`DensityIndex` résume les runs précédents par blocs de scl (numéros testés,
+clubs trouvés) et garde le plus grand scl valide vu. Il se construit à
+partir des CSV de sortie (et du cache négatif) puis est mis à jour par
+chaque run.
+
+`ScanPlanner` en déduit l'ordre des numéros, par phases:
+1. blocs denses en entier (les plus denses d'abord), échantillon des blocs clairsemés;
+2. reste des blocs clairsemés dont l'échantillon a trouvé un club;
+3. sans --max-scl: exploration au-delà du plus grand scl valide, par
+   échantillons, jusqu'à `frontier_empty_blocks` blocs vides consécutifs
+   (borne supérieure détectée automatiquement);
+4. reste des blocs clairsemés (sauf avec sweep_sparse=False).
+"""
+
+import csv
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_BLOCK_SIZE = 100
+DEFAULT_INDEX_FILE = 'scl_density.json'
+
+
+class DensityIndex:
+    """Nombre de numéros testés et de clubs trouvés par bloc de scl"""
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.blocks: Dict[int, List[int]] = {}
+        self.max_valid_scl = 0
+
+    def block_of(self, scl: int) -> int:
+        return scl // self.block_size
+
+    def block_range(self, block: int) -> range:
+        return range(block * self.block_size, (block + 1) * self.block_size)
+
+    def record(self, scl: int, found: bool):
+        """Ajoute le résultat d'un numéro testé"""
+        counts = self.blocks.setdefault(self.block_of(scl), [0, 0])
+        counts[0] += 1
+        if found:
+            counts[1] += 1
+            self.max_valid_scl = max(self.max_valid_scl, scl)
+
+    def global_density(self) -> float:
+        probed = sum(c[0] for c in self.blocks.values())
+        found = sum(c[1] for c in self.blocks.values())
+        return found / probed if probed else 0.0
+
+    def density(self, block: int, prior: Optional[float] = None) -> Optional[float]:
+        """
+        Densité estimée du bloc (lissée vers la densité globale).
+
+        Returns:
+            Densité entre 0 et 1, ou None si le bloc n'a jamais été testé
+        """
+        counts = self.blocks.get(block)
+        if not counts or not counts[0]:
+            return None
+        prior = self.global_density() if prior is None else prior
+        # Lissage: équivaut à 2 numéros fictifs à la densité globale
+        return (counts[1] + 2 * prior) / (counts[0] + 2)
+
+    @classmethod
+    def load(cls, path: str) -> 'DensityIndex':
+        """Charge l'index (index vide si le fichier n'existe pas)"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        index = cls(data.get('block_size', DEFAULT_BLOCK_SIZE))
+        index.blocks = {int(block): counts for block, counts in data.get('blocks', {}).items()}
+        index.max_valid_scl = data.get('max_valid_scl', 0)
+        return index
+
+    def save(self, path: str):
+        """Sauvegarde l'index (écriture atomique)"""
+        data = {
+            'block_size': self.block_size,
+            'max_valid_scl': self.max_valid_scl,
+            'blocks': {str(block): self.blocks[block] for block in sorted(self.blocks)},
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def build(cls, csv_files: Iterable[str], negative_cache_file: Optional[str] = None,
+              block_size: int = DEFAULT_BLOCK_SIZE) -> 'DensityIndex':
+        """
+        Construit l'index à partir de sorties de runs précédents.
+
+        Les CSV au format scrape_range.py (une ligne par scl testé, nom vide si
+        pas de club) donnent les numéros testés; les CSV qui ne contiennent que
+        les clubs trouvés (scrape_to_csv.py) sont supposés couvrir 1..max(scl).
+        Les absences du cache négatif comptent comme testées sans club.
+        """
+        found: Set[int] = set()
+        probed: Set[int] = set()
+        for path in csv_files:
+            rows_found = set()
+            rows_all = set()
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    scl = (row.get('scl') or '').strip()
+                    if not scl.isdigit():
+                        continue
+                    rows_all.add(int(scl))
+                    if (row.get('nom') or '').strip():
+                        rows_found.add(int(scl))
+            found |= rows_found
+            if rows_all - rows_found:
+                probed |= rows_all
+            elif rows_found:
+                probed |= set(range(1, max(rows_found) + 1))
+
+        if negative_cache_file and os.path.exists(negative_cache_file):
+            from negative_cache import NegativeCache
+            probed |= set(NegativeCache(negative_cache_file).entries)
+
+        index = cls(block_size)
+        for scl in sorted(probed | found):
+            index.record(scl, scl in found)
+        return index
+
+    def summary(self) -> str:
+        dense = sum(1 for block in self.blocks if (self.density(block) or 0) >= 0.2)
+        return (f"{len(self.blocks)} blocs de {self.block_size} ({dense} denses), "
+                f"densité globale {self.global_density() * 100:.1f}%, plus grand scl valide {self.max_valid_scl}")
+
+
+class ScanPlanner:
+    """Ordre des numéros à tester, par phases, d'après l'index de densité"""
+
+    def __init__(self, index: DensityIndex, start: int = 1, max_scl: Optional[int] = None,
+                 sample_size: int = 10, dense_threshold: float = 0.2,
+                 frontier_empty_blocks: int = 20, frontier_chunk: int = 5,
+                 sweep_sparse: bool = True, skip: Optional[Callable[[int], bool]] = None):
+        """
+        Args:
+            index: Index de densité (mis à jour avec les résultats du run)
+            start: Premier scl
+            max_scl: Dernier scl; None pour détecter la borne supérieure
+            sample_size: Numéros testés dans un bloc clairsemé avant de le balayer
+            dense_threshold: Densité à partir de laquelle un bloc est balayé d'emblée
+            frontier_empty_blocks: Blocs vides consécutifs qui arrêtent l'exploration
+            frontier_chunk: Blocs échantillonnés par phase d'exploration
+            sweep_sparse: Balayer à la fin les blocs clairsemés sans club dans l'échantillon
+            skip: Numéros à ne pas tester (déjà dans le CSV, cache négatif...)
+        """
+        self.index = index
+        self.start = start
+        self.max_scl = max_scl
+        self.sample_size = sample_size
+        self.dense_threshold = dense_threshold
+        self.frontier_empty_blocks = frontier_empty_blocks
+        self.frontier_chunk = frontier_chunk
+        self.sweep_sparse = sweep_sparse
+        self.skip = skip or (lambda scl: False)
+        self.done: Set[int] = set()
+        self.hit_blocks: Set[int] = set()
+        self.phase_name = ''
+        self._phases = self._plan()
+
+    @property
+    def upper_bound(self) -> int:
+        """Dernier scl planifié (borne fixe ou détectée)"""
+        return self._bound
+
+    def record(self, scl: int, found: bool):
+        """Résultat d'un numéro testé (met à jour l'index et la planification)"""
+        self.index.record(scl, found)
+        if found:
+            self.hit_blocks.add(self.index.block_of(scl))
+
+    def mark_found(self, scls: Iterable[int]):
+        """Clubs déjà connus (CSV existant): leurs blocs comptent comme ayant un club"""
+        self.hit_blocks.update(self.index.block_of(scl) for scl in scls)
+
+    def next_phase(self) -> List[int]:
+        """Numéros de la phase suivante (liste vide quand tout est planifié)"""
+        for name, scls in self._phases:
+            todo = [scl for scl in scls if scl not in self.done and not self.skip(scl)]
+            self.done.update(scls)
+            if todo:
+                self.phase_name = name
+                return todo
+        self.phase_name = ''
+        return []
+
+    def _block_scls(self, block: int) -> List[int]:
+        block_range = self.index.block_range(block)
+        low = max(block_range.start, self.start)
+        high = min(block_range.stop - 1, self._bound)
+        return list(range(low, high + 1))
+
+    def _sample(self, scls: List[int]) -> List[int]:
+        if len(scls) <= self.sample_size:
+            return scls
+        step = len(scls) / self.sample_size
+        return [scls[int(i * step)] for i in range(self.sample_size)]
+
+    def _plan(self) -> Iterator[tuple]:
+        index = self.index
+        if self.max_scl is not None:
+            self._bound = self.max_scl
+        else:
+            # Borne connue: fin du bloc du plus grand scl valide vu
+            self._bound = max(self.start - 1, index.block_range(index.block_of(index.max_valid_scl)).stop - 1
+                              if index.max_valid_scl else self.start - 1)
+
+        first_block = index.block_of(self.start)
+        known_blocks = list(range(first_block, index.block_of(self._bound) + 1)) if self._bound >= self.start else []
+        prior = index.global_density()
+
+        dense, sparse = [], []
+        for block in known_blocks:
+            density = index.density(block, prior)
+            # Bloc jamais testé: balayé en entier (rien ne permet de le supposer vide)
+            if density is None or density >= self.dense_threshold:
+                dense.append((density if density is not None else prior, block))
+            else:
+                sparse.append((density, block))
+        dense.sort(key=lambda item: -item[0])
+        sparse.sort(key=lambda item: -item[0])
+
+        phase = [scl for _, block in dense for scl in self._block_scls(block)]
+        phase += [scl for _, block in sparse for scl in self._sample(self._block_scls(block))]
+        yield 'blocs denses + échantillons', phase
+
+        yield 'blocs clairsemés avec club', [scl for _, block in sparse if block in self.hit_blocks
+                                            for scl in self._block_scls(block)]
+
+        if self.max_scl is None:
+            yield from self._explore_frontier(sparse)
+
+        if self.sweep_sparse:
+            yield 'reste des blocs clairsemés', [scl for _, block in sparse for scl in self._block_scls(block)]
+
+    def _explore_frontier(self, sparse: list) -> Iterator[tuple]:
+        """Échantillonne les blocs au-delà de la borne jusqu'à assez de blocs vides consécutifs"""
+        index = self.index
+        next_block = index.block_of(self._bound) + 1 if self._bound >= self.start else index.block_of(self.start)
+        empty_streak = 0
+        pending_hits: List[int] = []
+        while empty_streak < self.frontier_empty_blocks:
+            chunk = list(range(next_block, next_block + self.frontier_chunk))
+            next_block += self.frontier_chunk
+            self._bound = index.block_range(chunk[-1]).stop - 1
+
+            phase = [scl for block in pending_hits for scl in self._block_scls(block)]
+            phase += [scl for block in chunk for scl in self._sample(self._block_scls(block))]
+            yield 'exploration au-delà de la borne', phase
+
+            pending_hits = [block for block in chunk if block in self.hit_blocks]
+            for block in chunk:
+                if block in self.hit_blocks:
+                    empty_streak = 0
+                else:
+                    empty_streak += 1
+                    sparse.append((0.0, block))
+
+        # Reste des derniers blocs avec club, puis borne = fin du dernier bloc avec club
+        yield 'exploration au-delà de la borne', [scl for block in pending_hits for scl in self._block_scls(block)]
+        last_hit = max(self.hit_blocks) if self.hit_blocks else index.block_of(max(self.start, index.max_valid_scl))
+        self._bound = max(index.block_range(last_hit).stop - 1, self.start)
+        sparse[:] = [(d, block) for d, block in sparse if block <= last_hit]
+
+
+def main():
+    """Construit ou affiche l'index de densité"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index de densité des scl valides (par blocs)")
+    parser.add_argument('csv', nargs='*', help='CSV de runs précédents (clubs_france.csv, sorties de scrape_range.py)')
+    parser.add_argument('--output', type=str, default=DEFAULT_INDEX_FILE,
+                       help=f'Fichier de l\'index (défaut: {DEFAULT_INDEX_FILE})')
+    parser.add_argument('--negative-cache', type=str, default=None,
+                       help='Cache négatif à prendre en compte (absences confirmées)')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                       help=f'Taille des blocs (défaut: {DEFAULT_BLOCK_SIZE})')
+    args = parser.parse_args()
+
+    if args.csv:
+        index = DensityIndex.build(args.csv, args.negative_cache, args.block_size)
+        index.save(args.output)
+        print(f"💾 Index sauvegardé dans: {args.output}")
+    else:
+        index = DensityIndex.load(args.output)
+    print(f"📊 {index.summary()}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    main()
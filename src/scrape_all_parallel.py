@@ -0,0 +1,458 @@
+"""
+Script pour scraper tous les clubs en parallèle (plusieurs processus)
+et sauvegarder en CSV.
+
+La plage scl est découpée en lots de `--batch-size` numéros, distribués
+à `--workers` processus qui ont chacun leur propre SCLScraper (et donc
+leur propre navigateur). Les résultats sont fusionnés dans un seul CSV.
+
+Les numéros sont planifiés par phases (scl_density.ScanPlanner): avec
+`--density-index`, les blocs denses passent d'abord et les blocs
+clairsemés sont échantillonnés avant d'être balayés; sans `--max-scl`,
+la borne supérieure est détectée automatiquement. Les numéros en échec
+transitoire (timeout, 429/5xx) sont renvoyés aux workers après les phases,
+avec un délai exponentiel (retry_queue.RetryQueue). Le processus principal
+tient le point de reprise (scan_checkpoint): une relance saute exactement
+les numéros déjà trouvés ou absents.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing.util import Finalize
+from typing import Dict, List, Optional, Set, Tuple
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from concurrency_control import AIMDController, InFlightGate, NavigationSamples
+from host_pool import HostPool
+from negative_cache import DEFAULT_TTL_DAYS, NegativeCache
+from page_archive import PageArchive
+from parquet_export import ParquetSink, export_csv, require_pyarrow, run_file_path
+from club_data import STATUS_ABSENT, STATUS_ERROR, STATUS_FOUND, STATUS_TRANSIENT, ScrapeResult
+from club_store import ClubStore
+from rate_limit import RateLimiter
+from record_log import RecordLog, read_records
+from retry_queue import RetryPolicy, RetryQueue
+from scan_checkpoint import FOUND, ScanCheckpoint
+from scl_density import DensityIndex, ScanPlanner
+from scraper_by_scl import SCLScraper
+from scraper_options import ScraperOptions, add_scraper_arguments
+
+# Scraper propre à chaque processus worker (initialisé par _init_worker)
+_scraper: Optional[SCLScraper] = None
+
+
+def _close_worker_scraper():
+    """Ferme le navigateur du worker à la fin du processus"""
+    global _scraper
+    if _scraper is not None:
+        try:
+            _scraper.__exit__(None, None, None)
+        except Exception:
+            pass
+        _scraper = None
+
+
+def _init_worker(headless: bool, block_profile: Optional[str], extraction_strategy: str,
+                 archive_dir: Optional[str] = None, negative_cache_file: Optional[str] = None,
+                 cache_ttl: float = DEFAULT_TTL_DAYS, adaptive: bool = False,
+                 rate: Optional[float] = None, burst: Optional[float] = None,
+                 rate_state_dir: Optional[str] = None, hosts_file: Optional[str] = None,
+                 host_strategy: str = 'least-loaded'):
+    """Initialise un SCLScraper (avec archive, cache négatif, limiteur de débit et hôtes) par processus worker"""
+    global _scraper
+    archive = PageArchive(archive_dir, writer=f"w{os.getpid()}") if archive_dir else None
+    if archive is not None:
+        Finalize(None, archive.close, exitpriority=5)
+    # Les workers ne font qu'ajouter des absences au fichier partagé
+    negative_cache = NegativeCache(negative_cache_file, cache_ttl) if negative_cache_file else None
+    if negative_cache is not None:
+        Finalize(None, negative_cache.close, exitpriority=5)
+    # Mesures de navigation renvoyées avec chaque lot au contrôleur du processus principal
+    samples = NavigationSamples() if adaptive else None
+    # Seaux partagés par tous les workers (fichiers verrouillés dans rate_state_dir)
+    rate_limiter = RateLimiter(rate, burst, rate_state_dir) if rate else None
+    if rate_limiter is not None:
+        Finalize(None, rate_limiter.close, exitpriority=5)
+    # Santé des hôtes suivie par chaque worker; départ du tourniquet tiré au hasard
+    hosts = HostPool.from_file(hosts_file, strategy=host_strategy) if hosts_file else None
+    _scraper = SCLScraper(headless=headless, slow_mo=0, block_profile=block_profile,
+                          extraction_strategy=extraction_strategy, archive=archive,
+                          negative_cache=negative_cache, controller=samples,
+                          rate_limiter=rate_limiter, hosts=hosts).__enter__()
+    Finalize(None, _close_worker_scraper, exitpriority=10)
+
+
+def _scrape_batch(task: Tuple[List[int], str]) -> Tuple[List[int], List[Dict[str, str]], List[int],
+                                                     List[Tuple[int, str]], list]:
+    """
+    Scrape un lot de numéros scl dans le processus worker.
+
+    Returns:
+        Tuple (numéros du lot, lignes CSV des clubs trouvés, numéros en erreur,
+        échecs transitoires (scl, cause) à retenter, mesures de navigation
+        (durée, échec) si la concurrence est adaptative)
+    """
+    scls, base_url = task
+    rows = []
+    failed = []
+    transient = []
+    for scl in scls:
+        result = _scraper.fetch_club(scl, base_url)
+        if result.status == STATUS_TRANSIENT:
+            transient.append((scl, result.error))
+            continue
+        if result.status == STATUS_ERROR:
+            print(f"  ⚠️  Erreur pour scl={scl}: {result.error}")
+            failed.append(scl)
+            continue
+        club_data = result.club
+        if club_data:
+            rows.append({
+                'scl': scl,
+                'nom': club_data.nom,
+                'numero_affiliation': club_data.numero_affiliation or '',
+                'email': club_data.email or '',
+                'telephone': club_data.telephone or '',
+                'adresse': club_data.adresse or '',
+                'url_detail': club_data.url_detail or ''
+            })
+    samples = _scraper.controller.drain() if _scraper.controller is not None else []
+    return scls, rows, failed, transient, samples
+
+
+def _read_existing_scls(output_file: str) -> Tuple[Set[int], Set[int]]:
+    """
+    Numéros déjà traités dans la sortie, journal de record_log compris
+
+    Returns:
+        Tuple (tous les scl présents, scl avec un club); les lignes sans nom
+        sont les absences écrites par scrape_range.py
+    """
+    try:
+        records = read_records(output_file)
+    except Exception as e:
+        print(f"   ⚠️  Impossible de lire le fichier ({e}), démarrage depuis le début")
+        return set(), set()
+    return set(records), {scl for scl, row in records.items() if row['nom']}
+
+
+def scrape_all_parallel(max_scl: Optional[int] = None, workers: int = 4, batch_size: int = 200,
+                        output_file: str = "clubs_france.csv", resume_from: int = 1,
+                        base_url: str = "https://gironde.fff.fr", headless: bool = True,
+                        block_profile: Optional[str] = None, extraction_strategy: str = 'dom',
+                        archive_dir: Optional[str] = None, negative_cache_file: Optional[str] = None,
+                        cache_ttl: float = DEFAULT_TTL_DAYS, density_index_file: Optional[str] = None,
+                        sweep_sparse: bool = True, adaptive: bool = False, target_p95: float = 3.0,
+                        max_timeout_rate: float = 0.05, rate: Optional[float] = None,
+                        burst: Optional[float] = None, rate_state_dir: Optional[str] = None,
+                        retry_policy: Optional[RetryPolicy] = None, hosts_file: Optional[str] = None,
+                        host_strategy: str = 'least-loaded', checkpoint_file: Optional[str] = None,
+                        sqlite_file: Optional[str] = None, parquet_file: Optional[str] = None):
+    """
+    Scrape tous les clubs avec plusieurs processus et sauvegarde en CSV
+
+    Args:
+        max_scl: Numéro scl maximum; None pour détecter la borne supérieure
+        workers: Nombre de processus (un navigateur par processus)
+        batch_size: Nombre de numéros scl par lot envoyé à un worker
+        output_file: Fichier CSV de sortie (les scl déjà présents sont ignorés)
+        resume_from: Premier numéro scl à traiter
+        base_url: URL de base du district (peu importe, le scl est unique)
+        headless: Mode headless des navigateurs
+        block_profile: Profil d'interception des requêtes ("safe" ou "strict")
+        extraction_strategy: "dom" (page rendue) ou "xhr" (réponse JSON, repli sur "dom")
+        archive_dir: Répertoire où archiver les pages récupérées (un rédacteur par worker)
+        negative_cache_file: Cache des scl sans club (numéros sautés, absences ajoutées par les workers)
+        cache_ttl: Durée de validité du cache négatif (jours)
+        density_index_file: Index de densité des scl (blocs denses d'abord, mis à jour en fin de run)
+        sweep_sparse: Balayer aussi les blocs clairsemés dont l'échantillon n'a rien trouvé
+        adaptive: Ajuster le nombre de lots en cours (AIMD); `workers` devient le maximum
+        target_p95: Latence p95 de navigation visée (s, concurrence adaptative)
+        max_timeout_rate: Taux de timeouts de navigation toléré (concurrence adaptative)
+        rate: Débit maximal par hôte (requêtes/s), tous workers confondus
+        burst: Rafale tolérée par hôte
+        rate_state_dir: Répertoire des seaux partagés (défaut: répertoire temporaire du run)
+        retry_policy: Tentatives et délais pour les numéros en échec transitoire
+        hosts_file: districts_urls.json, pour répartir les requêtes entre les hôtes (remplace base_url)
+        host_strategy: "round-robin" ou "least-loaded"
+        checkpoint_file: Point de reprise exact (état de chaque scl, supprimé en fin de balayage)
+        sqlite_file: Base SQLite des clubs, écrite par le processus principal en plus du CSV
+        parquet_file: Export Parquet de tout le CSV: clubs du run écrits au fil de l'eau, fusionnés en fin de balayage
+    """
+    existing_scls, existing_clubs = _read_existing_scls(output_file)
+    if existing_scls:
+        print(f"📂 Fichier existant trouvé: {output_file}")
+        print(f"   ✅ {len(existing_clubs)} clubs et {len(existing_scls) - len(existing_clubs)} "
+              f"absences déjà dans le fichier (ignorés)")
+
+    negative_cache = NegativeCache(negative_cache_file, cache_ttl) if negative_cache_file else None
+    checkpoint = ScanCheckpoint(checkpoint_file) if checkpoint_file else None
+    if checkpoint is not None and checkpoint.resumed:
+        print(f"🧾 Reprise depuis {checkpoint_file}: {checkpoint.summary()}")
+    store = ClubStore(sqlite_file) if sqlite_file else None
+    if parquet_file:
+        require_pyarrow()
+    index = DensityIndex.load(density_index_file) if density_index_file else DensityIndex()
+    planner = ScanPlanner(index, start=resume_from, max_scl=max_scl, sweep_sparse=sweep_sparse,
+                          skip=lambda scl: (scl in existing_scls
+                                            or (checkpoint is not None and checkpoint.is_done(scl))
+                                            or (negative_cache is not None and negative_cache.should_skip(scl))))
+    planner.mark_found(existing_clubs)
+    if checkpoint is not None:
+        planner.mark_found(checkpoint.scls(FOUND))
+
+    print("=" * 60)
+    print("🏆 SCRAPING PARALLÈLE DE TOUS LES CLUBS DE FRANCE")
+    print("=" * 60)
+    bound = max_scl if max_scl is not None else "borne détectée automatiquement"
+    print(f"📊 Plage: {resume_from} - {bound}")
+    if density_index_file:
+        print(f"🧭 Index de densité: {index.summary()}")
+    controller = AIMDController(initial=max(1, workers // 4), max_limit=workers, target_p95=target_p95,
+                                max_timeout_rate=max_timeout_rate, window=max(10, batch_size // 2)) if adaptive else None
+    print(f"⚙️  Workers: {workers}{' max (adaptatif)' if adaptive else ''} | Lots de {batch_size}")
+    temp_rate_dir = None
+    if rate and rate_state_dir is None:
+        temp_rate_dir = rate_state_dir = tempfile.mkdtemp(prefix='rate_')
+    if hosts_file:
+        print(f"🌐 Hôtes: {len(HostPool.from_file(hosts_file))} districts de {hosts_file} ({host_strategy})")
+    if rate:
+        print(f"🚦 Débit: {rate:g} req/s par hôte pour l'ensemble des workers")
+    print(f"💾 Fichier de sortie: {output_file}")
+    print("=" * 60)
+    print()
+
+    start_time = datetime.now()
+    total_found = 0
+    total_errors = 0
+    tested = 0
+    retry_queue = RetryQueue(retry_policy)
+
+    # Résultats ajoutés au journal de la sortie, comme scrape_range.py (compaction en fin de balayage)
+    records = RecordLog(output_file)
+    # Clubs du run écrits au fil de l'eau, fusionnés dans l'export en fin de balayage
+    run_sink = ParquetSink(run_file_path(parquet_file)) if parquet_file else None
+    completed = False
+
+    pool = multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                                initargs=(headless, block_profile, extraction_strategy, archive_dir,
+                                          negative_cache_file, cache_ttl, adaptive,
+                                          rate, burst, rate_state_dir, hosts_file, host_strategy))
+    gate = InFlightGate(controller) if controller is not None else None
+
+    def run_batches(todo: List[int]):
+        """Envoie des numéros aux workers par lots et enregistre les résultats au fil de l'eau"""
+        nonlocal tested, total_found, total_errors
+        batches = [(todo[i:i + batch_size], base_url) for i in range(0, len(todo), batch_size)]
+        phase_tested = 0
+        tasks = gate.gate(batches) if gate is not None else batches
+        for done, (scls, rows, failed, transient, samples) in enumerate(pool.imap_unordered(_scrape_batch, tasks), 1):
+            if gate is not None:
+                for duration, timed_out in samples:
+                    controller.record(duration, timed_out)
+                gate.done()
+                for decision in controller.drain_decisions():
+                    print(f"  {decision}")
+            # Écrire directement dans le journal dès qu'un lot est terminé
+            for row in rows:
+                records.append(row)
+            if store is not None:
+                for row in rows:
+                    store.upsert_row(row)
+            if run_sink is not None:
+                fetched_at = time.time()
+                for row in rows:
+                    run_sink.write_row(row, fetched_at)
+
+            found_scls = {row['scl'] for row in rows}
+            transient_errors = dict(transient)
+            retrying = set()
+            for scl in scls:
+                if scl in failed:
+                    status = STATUS_ERROR
+                elif scl in transient_errors:
+                    # Ni club ni absence: retenté après les phases (ou abandonné)
+                    status = STATUS_TRANSIENT
+                    if not retry_queue.record(ScrapeResult(scl, status, error=transient_errors[scl])):
+                        retrying.add(scl)
+                        continue
+                    total_errors += 1
+                else:
+                    found = scl in found_scls
+                    status = STATUS_FOUND if found else STATUS_ABSENT
+                    retry_queue.record(ScrapeResult(scl, status))
+                    planner.record(scl, found)
+                    if store is not None and not found:
+                        store.discard(scl)
+                # Après l'écriture du lot dans le journal: un club marqué trouvé y est forcément
+                if checkpoint is not None:
+                    checkpoint.record(scl, status)
+
+            tested += len(scls) - len(retrying)
+            phase_tested += len(scls)
+            total_found += len(rows)
+            total_errors += len(failed)
+
+            elapsed = (datetime.now() - start_time).total_seconds()
+            speed = tested / elapsed if elapsed > 0 else 0
+            eta_seconds = (len(todo) - phase_tested) / speed if speed > 0 else 0
+            limit = f" | Lots en cours: {controller.limit}" if controller is not None else ""
+            print(f"  📦 Lot {min(scls)}-{max(scls)} [{done}/{len(batches)}]: {len(rows)} clubs | "
+                  f"Total: {total_found} | Vitesse: {speed:.1f} scl/s | ETA phase: {eta_seconds/60:.1f} min{limit}")
+
+    try:
+        # Une phase à la fois: la suivante dépend des clubs trouvés (échantillons, exploration)
+        todo = planner.next_phase()
+        while todo:
+            print(f"\n🧭 Phase: {planner.phase_name} ({len(todo)} numéros, "
+                  f"{(len(todo) + batch_size - 1) // batch_size} lots)")
+            run_batches(todo)
+            todo = planner.next_phase()
+        # Puis les échecs transitoires, par lots de numéros dont le délai est écoulé
+        todo = retry_queue.pop_due()
+        while todo:
+            print(f"\n🔁 Nouvelles tentatives: {len(todo)} numéros en échec transitoire")
+            run_batches(todo)
+            todo = retry_queue.pop_due()
+        completed = True
+        pool.close()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interruption utilisateur")
+        if gate is not None:
+            gate.stop()
+        pool.terminate()
+        print(f"💾 {total_found} clubs sauvegardés (relancer pour reprendre)")
+        return
+    except BaseException:
+        # Sans terminate, join lèverait "Pool is still running" et masquerait l'erreur
+        if gate is not None:
+            gate.stop()
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        # Balayage terminé: CSV trié (les lots arrivent dans le désordre); sinon selon le seuil
+        records.close(compact=True if completed else None)
+        if run_sink is not None:
+            # Export précédent gardé tel quel si le balayage n'est pas allé au bout
+            if completed:
+                run_sink.close()
+            else:
+                run_sink.abort()
+        if checkpoint is not None:
+            checkpoint.close()
+        if store is not None:
+            store.close()
+        if temp_rate_dir is not None:
+            shutil.rmtree(temp_rate_dir, ignore_errors=True)
+        if density_index_file:
+            index.save(density_index_file)
+
+    if not tested:
+        if checkpoint is not None:
+            checkpoint.remove()
+        if run_sink is not None:
+            os.remove(run_sink.path)
+        print("✅ Rien à faire")
+        return
+
+    # Export du CSV complet (clubs des runs précédents compris)
+    parquet = export_csv(output_file, parquet_file, run_file=run_sink.path) if run_sink is not None else None
+    if checkpoint is not None:
+        checkpoint.remove()
+    if negative_cache is not None:
+        print(f"🚫 Cache négatif: {negative_cache.skipped} numéros sans club sautés")
+        # Relire les absences ajoutées par les workers, puis retirer les entrées expirées
+        NegativeCache(negative_cache_file, cache_ttl).compact()
+
+    total_time = (datetime.now() - start_time).total_seconds()
+
+    print("\n" + "=" * 60)
+    print("✅ SCRAPING TERMINÉ")
+    print("=" * 60)
+    print(f"📊 Statistiques:")
+    print(f"   Clubs trouvés: {total_found}")
+    print(f"   Numéros testés: {tested}")
+    print(f"   Borne supérieure: {planner.upper_bound}")
+    print(f"   Erreurs: {total_errors}")
+    if retry_queue.attempts:
+        print(f"   Reprises: {retry_queue.summary()}")
+        if retry_queue.given_up:
+            print(f"   ⚠️  Non résolus (à relancer): {sorted(retry_queue.given_up)[:10]}")
+    if controller is not None:
+        print(f"   Concurrence adaptative: {controller.summary()}")
+    print(f"   Taux de réussite: {(total_found/tested*100) if tested else 0:.2f}%")
+    print(f"   Temps total: {total_time/60:.1f} minutes")
+    print(f"   Vitesse moyenne: {tested/total_time:.2f} scl/s")
+    print(f"\n💾 Fichier CSV sauvegardé: {output_file}")
+    if store is not None:
+        print(f"🗄️  Base SQLite: {sqlite_file} ({store.upserted} clubs écrits, {store.deleted} supprimés)")
+    if parquet is not None:
+        print(f"📊 Parquet: {parquet.summary()}")
+    if density_index_file:
+        print(f"🧭 Index de densité mis à jour: {density_index_file}")
+    if archive_dir:
+        print(f"📦 Pages archivées dans: {archive_dir}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape tous les clubs de France en CSV (multi-processus)")
+    parser.add_argument('--workers', type=int, default=4,
+                       help='Nombre de processus/navigateurs (défaut: 4)')
+    parser.add_argument('--batch-size', type=int, default=200,
+                       help='Nombre de numéros scl par lot (défaut: 200)')
+    parser.add_argument('--max-scl', type=int, default=0,
+                       help='Numéro scl maximum (défaut: 0, borne supérieure détectée automatiquement)')
+    parser.add_argument('--resume-from', type=int, default=1,
+                       help='Premier numéro scl à traiter (défaut: 1)')
+    parser.add_argument('--output', type=str, default='clubs_france.csv',
+                       help='Fichier CSV de sortie (défaut: clubs_france.csv)')
+    parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                       help='URL de base (peu importe, le scl est unique)')
+    parser.add_argument('--block', type=str, choices=['safe', 'strict'], default=None,
+                       help='Annuler les ressources non essentielles (safe ou strict)')
+    parser.add_argument('--strategy', type=str, choices=['dom', 'xhr'], default='dom',
+                       help="Extraction depuis la page rendue (dom) ou la réponse JSON (xhr)")
+    parser.add_argument('--archive', type=str, default=None,
+                       help='Répertoire où archiver les pages récupérées (re-parsing hors ligne)')
+    add_scraper_arguments(parser)
+    parser.add_argument('--density-index', type=str, default=None,
+                       help='Index de densité des scl (blocs denses d\'abord, mis à jour en fin de run)')
+    parser.add_argument('--no-sparse-sweep', action='store_true',
+                       help='Ne pas balayer les blocs clairsemés dont l\'échantillon n\'a rien trouvé')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Ajuster le nombre de lots en cours (AIMD) selon la latence et les timeouts; '
+                            '--workers devient le maximum')
+    parser.add_argument('--target-p95', type=float, default=3.0,
+                       help='Latence p95 de navigation visée en s (défaut: 3.0)')
+    parser.add_argument('--max-timeout-rate', type=float, default=0.05,
+                       help='Taux de timeouts de navigation toléré (défaut: 0.05)')
+
+    args = parser.parse_args()
+
+    scrape_all_parallel(
+        max_scl=args.max_scl or None,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        output_file=args.output,
+        resume_from=args.resume_from,
+        base_url=args.base_url,
+        block_profile=args.block,
+        extraction_strategy=args.strategy,
+        archive_dir=args.archive,
+        density_index_file=args.density_index,
+        sweep_sparse=not args.no_sparse_sweep,
+        adaptive=args.adaptive,
+        target_p95=args.target_p95,
+        max_timeout_rate=args.max_timeout_rate,
+        **ScraperOptions.from_args(args).as_kwargs()
+    )
@@ -2,96 +2,244 @@
 Script pour scraper tous les clubs et sauvegarder en CSV
 """
 
-import csv
 import time
 import os
 import sys
 from datetime import datetime
+from typing import Optional
 
 # Ajouter le répertoire parent au path pour les imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from club_data import STATUS_ERROR, STATUS_TRANSIENT
+from club_store import ClubStore
+from host_pool import HostPool
+from negative_cache import DEFAULT_TTL_DAYS, NegativeCache
+from parquet_export import ParquetSink, export_csv, require_pyarrow, run_file_path
+from rate_limit import RateLimiter
+from record_log import RecordLog, default_log_path
+from retry_queue import RetryPolicy, RetryQueue
+from scan_checkpoint import FOUND, ScanCheckpoint
+from scl_density import DensityIndex, ScanPlanner
 from scraper_by_scl import SCLScraper
+from scrape_all_parallel import _read_existing_scls
+from scraper_options import ScraperOptions, add_scraper_arguments
 
-def scrape_all_to_csv(max_scl: int = 30000, batch_size: int = 1000, 
+def scrape_all_to_csv(max_scl: Optional[int] = None, batch_size: int = 1000, 
                      output_file: str = "clubs_france.csv",
                      resume_from: int = 1,
-                     workers: int = 1):
+                     workers: int = 1,
+                     negative_cache_file: str = None,
+                     cache_ttl: float = DEFAULT_TTL_DAYS,
+                     density_index_file: str = None,
+                     sweep_sparse: bool = True,
+                     rate: Optional[float] = None,
+                     burst: Optional[float] = None,
+                     rate_state_dir: str = None,
+                     retry_policy: Optional[RetryPolicy] = None,
+                     hosts_file: str = None,
+                     host_strategy: str = 'least-loaded',
+                     checkpoint_file: str = None,
+                     sqlite_file: str = None,
+                     parquet_file: str = None):
     """
     Scrape tous les clubs et sauvegarde en CSV
     
     Args:
-        max_scl: Numéro scl maximum
+        max_scl: Numéro scl maximum; None pour détecter la borne supérieure
         batch_size: Taille des lots pour affichage du progrès
         output_file: Fichier CSV de sortie
         resume_from: Reprendre depuis ce numéro scl
+        workers: Nombre de processus; au-delà de 1, délègue à scrape_all_parallel
+        negative_cache_file: Cache des scl sans club (numéros sautés tant que valides)
+        cache_ttl: Durée de validité du cache négatif (jours)
+        density_index_file: Index de densité des scl (blocs denses d'abord, mis à jour en fin de run)
+        sweep_sparse: Balayer aussi les blocs clairsemés dont l'échantillon n'a rien trouvé
+        rate: Débit maximal par hôte (requêtes/s)
+        burst: Rafale tolérée par hôte
+        rate_state_dir: Répertoire des seaux partagés avec d'autres processus
+        retry_policy: Tentatives et délais pour les numéros en échec transitoire
+        hosts_file: districts_urls.json, pour répartir les requêtes entre les hôtes
+        host_strategy: "round-robin" ou "least-loaded"
+        checkpoint_file: Point de reprise exact (état de chaque scl, supprimé en fin de balayage)
+        sqlite_file: Base SQLite des clubs mise à jour en plus du CSV (voir club_store)
+        parquet_file: Export Parquet de tout le CSV: clubs du run écrits au fil de l'eau, fusionnés en fin de balayage (voir parquet_export)
     """
     
+    if workers > 1:
+        from scrape_all_parallel import scrape_all_parallel
+        scrape_all_parallel(max_scl=max_scl, workers=workers, batch_size=batch_size,
+                            output_file=output_file, resume_from=resume_from,
+                            negative_cache_file=negative_cache_file, cache_ttl=cache_ttl,
+                            density_index_file=density_index_file, sweep_sparse=sweep_sparse,
+                            rate=rate, burst=burst, rate_state_dir=rate_state_dir,
+                            retry_policy=retry_policy, hosts_file=hosts_file,
+                            host_strategy=host_strategy, checkpoint_file=checkpoint_file,
+                            sqlite_file=sqlite_file, parquet_file=parquet_file)
+        return
+    
     # Vérifier si le fichier existe déjà pour reprendre
-    existing_scls = set()
-    if os.path.exists(output_file) and resume_from == 1:
+    # (CSV et journal des ajouts: les résultats de scrape_range.py pas encore compactés comptent)
+    existing_scls, existing_clubs = set(), set()
+    if (os.path.exists(output_file) or os.path.exists(default_log_path(output_file))) and resume_from == 1:
         print(f"📂 Fichier existant trouvé: {output_file}")
         print("   Lecture des numéros déjà traités...")
-        try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get('scl'):
-                        existing_scls.add(int(row['scl']))
-            print(f"   ✅ {len(existing_scls)} clubs déjà dans le fichier")
-            if existing_scls:
-                resume_from = max(existing_scls) + 1
-                print(f"   🔄 Reprise depuis scl={resume_from}")
-        except:
-            print("   ⚠️  Impossible de lire le fichier, démarrage depuis le début")
+        existing_scls, existing_clubs = _read_existing_scls(output_file)
+        print(f"   ✅ {len(existing_clubs)} clubs et {len(existing_scls) - len(existing_clubs)} "
+              f"absences déjà dans le fichier")
+    
+    negative_cache = NegativeCache(negative_cache_file, cache_ttl) if negative_cache_file else None
+    rate_limiter = RateLimiter(rate, burst, rate_state_dir) if rate else None
+    hosts = HostPool.from_file(hosts_file, strategy=host_strategy) if hosts_file else None
+    store = ClubStore(sqlite_file) if sqlite_file else None
+    if parquet_file:
+        require_pyarrow()
+    # Numéros déjà trouvés ou absents lors d'un run interrompu: sautés, les autres retestés
+    checkpoint = ScanCheckpoint(checkpoint_file) if checkpoint_file else None
+    if checkpoint is not None and checkpoint.resumed:
+        print(f"🧾 Reprise depuis {checkpoint_file}: {checkpoint.summary()}")
+    index = DensityIndex.load(density_index_file) if density_index_file else DensityIndex()
+    planner = ScanPlanner(index, start=resume_from, max_scl=max_scl, sweep_sparse=sweep_sparse,
+                          skip=lambda scl: (scl in existing_scls
+                                            or (checkpoint is not None and checkpoint.is_done(scl))
+                                            or (negative_cache is not None and negative_cache.should_skip(scl))))
+    planner.mark_found(existing_clubs)
+    if checkpoint is not None:
+        planner.mark_found(checkpoint.scls(FOUND))
     
     print("=" * 60)
     print("🏆 SCRAPING TOUS LES CLUBS DE FRANCE")
     print("=" * 60)
-    print(f"📊 Plage: {resume_from} - {max_scl}")
+    print(f"📊 Plage: {resume_from} - {max_scl if max_scl is not None else 'borne détectée automatiquement'}")
+    if density_index_file:
+        print(f"🧭 Index de densité: {index.summary()}")
     print(f"💾 Fichier de sortie: {output_file}")
     print("=" * 60)
     print()
     
     start_time = datetime.now()
-    total_found = len(existing_scls)
+    total_found = len(existing_clubs)
+    tested = 0
+    # Échecs transitoires retentés après les phases, pas enregistrés comme absences
+    retry_queue = RetryQueue(retry_policy)
     
-    # Créer le fichier CSV avec les en-têtes si nouveau
-    file_exists = os.path.exists(output_file) and len(existing_scls) > 0
-    mode = 'a' if file_exists else 'w'
+    def save_interrupted():
+        """Ctrl+C: garder le travail fait (lots SQLite, point de reprise); l'export Parquet reste inchangé"""
+        print("\n\n⚠️  Interruption utilisateur")
+        print(f"💾 Fichier sauvegardé ({tested} numéros testés, relancer pour reprendre)")
+        if negative_cache is not None:
+            negative_cache.close()
+        if density_index_file:
+            index.save(density_index_file)
+        if checkpoint is not None:
+            checkpoint.close()
+        if store is not None:
+            store.close()
+        records.close()
+        if run_sink is not None:
+            run_sink.abort()
     
-    with open(output_file, mode, encoding='utf-8', newline='') as csvfile:
-        fieldnames = ['scl', 'nom', 'numero_affiliation', 'email', 'telephone', 'adresse', 'url_detail']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        # Écrire les en-têtes si nouveau fichier
-        if not file_exists:
-            writer.writeheader()
-        
-        with SCLScraper(headless=True, slow_mo=0) as scraper:
-            current_batch = []
-            
-            for start_scl in range(resume_from, max_scl + 1, batch_size):
-                end_scl = min(start_scl + batch_size - 1, max_scl)
-                
-                print(f"\n📦 Lot {start_scl}-{end_scl} ({end_scl - start_scl + 1} numéros)")
-                print("-" * 60)
-                
-                batch_start_time = time.time()
-                batch_clubs = 0
+    # Résultats ajoutés au journal de la sortie, comme scrape_range.py (compaction en fin de balayage)
+    records = RecordLog(output_file)
+    # Clubs du run écrits au fil de l'eau, fusionnés dans l'export en fin de balayage
+    run_sink = ParquetSink(run_file_path(parquet_file)) if parquet_file else None
+    
+    try:
+        with SCLScraper(headless=True, slow_mo=0, negative_cache=negative_cache,
+                        rate_limiter=rate_limiter, hosts=hosts) as scraper:
+            todo = planner.next_phase()
+            while todo:
+                print(f"\n🧭 Phase: {planner.phase_name} ({len(todo)} numéros)")
                 
-                for scl in range(start_scl, end_scl + 1):
-                    # Vérifier si déjà traité
-                    if scl in existing_scls:
-                        continue
+                for batch_start in range(0, len(todo), batch_size):
+                    batch = todo[batch_start:batch_start + batch_size]
+                    
+                    print(f"\n📦 Lot {min(batch)}-{max(batch)} ({len(batch)} numéros)")
+                    print("-" * 60)
+                    
+                    batch_start_time = time.time()
+                    batch_clubs = 0
+                    
+                    for position, scl in enumerate(batch):
+                        try:
+                            result = scraper.fetch_club(scl)
+                            if result.status == STATUS_TRANSIENT:
+                                if retry_queue.record(result) and checkpoint is not None:
+                                    checkpoint.record(scl, result.status)
+                                continue
+                            club_data = result.club
+                            planner.record(scl, club_data is not None)
+                            tested += 1
+                            if store is not None:
+                                store.record(result)
+                            if run_sink is not None:
+                                run_sink.record(result)
+                            
+                            if club_data:
+                                # Écrire directement dans le journal
+                                records.append({
+                                    'scl': scl,
+                                    'nom': club_data.nom,
+                                    'numero_affiliation': club_data.numero_affiliation or '',
+                                    'email': club_data.email or '',
+                                    'telephone': club_data.telephone or '',
+                                    'adresse': club_data.adresse or '',
+                                    'url_detail': club_data.url_detail or ''
+                                })
+                                batch_clubs += 1
+                                total_found += 1
+                                
+                                if batch_clubs <= 3:  # Afficher les 3 premiers
+                                    print(f"  ✅ scl={scl}: {club_data.nom}")
+                            # Après l'écriture du journal: un club marqué trouvé y est forcément
+                            if checkpoint is not None:
+                                checkpoint.record(scl, result.status)
+                            
+                            # Afficher le progrès tous les 100
+                            if position % 100 == 0:
+                                progress = (position / len(batch)) * 100
+                                print(f"  📊 {progress:.0f}% - {batch_clubs} clubs trouvés dans ce lot")
+                            
+                        except KeyboardInterrupt:
+                            save_interrupted()
+                            return
+                        except Exception as e:
+                            print(f"  ⚠️  Erreur pour scl={scl}: {e}")
+                            if checkpoint is not None:
+                                checkpoint.record(scl, STATUS_ERROR)
+                            continue
+                    
+                    batch_time = time.time() - batch_start_time
+                    print(f"\n  ✅ Lot terminé: {batch_clubs} clubs trouvés en {batch_time:.1f}s")
                     
-                    try:
-                        club_data = scraper.extract_club_by_scl(scl)
-                        
-                        if club_data:
-                            # Écrire directement dans le CSV
-                            writer.writerow({
-                                'scl': scl,
+                    # Statistiques
+                    elapsed = (datetime.now() - start_time).total_seconds()
+                    rate = tested / elapsed if elapsed > 0 else 0
+                    remaining = len(todo) - (batch_start + len(batch))
+                    eta_seconds = remaining / rate if rate > 0 else 0
+                    
+                    print(f"  📊 Total: {total_found} clubs | Vitesse: {rate:.1f} scl/s | ETA phase: {eta_seconds/3600:.1f}h")
+                
+                todo = planner.next_phase()
+            
+            if len(retry_queue):
+                print(f"\n🔁 Nouvelles tentatives pour {len(retry_queue)} numéros en échec transitoire...")
+                try:
+                    for result in retry_queue.drain(scraper.fetch_club):
+                        if result.status == STATUS_TRANSIENT:
+                            if checkpoint is not None:
+                                checkpoint.record(result.scl, result.status)
+                            continue
+                        planner.record(result.scl, result.club is not None)
+                        tested += 1
+                        if store is not None:
+                            store.record(result)
+                        if run_sink is not None:
+                            run_sink.record(result)
+                        if result.club:
+                            club_data = result.club
+                            records.append({
+                                'scl': result.scl,
                                 'nom': club_data.nom,
                                 'numero_affiliation': club_data.numero_affiliation or '',
                                 'email': club_data.email or '',
@@ -99,70 +247,95 @@ def scrape_all_to_csv(max_scl: int = 30000, batch_size: int = 1000,
                                 'adresse': club_data.adresse or '',
                                 'url_detail': club_data.url_detail or ''
                             })
-                            csvfile.flush()  # Sauvegarder immédiatement
-                            batch_clubs += 1
                             total_found += 1
-                            
-                            if batch_clubs <= 3:  # Afficher les 3 premiers
-                                print(f"  ✅ scl={scl}: {club_data.nom}")
-                        
-                        # Afficher le progrès tous les 100
-                        if (scl - start_scl) % 100 == 0:
-                            progress = ((scl - start_scl) / (end_scl - start_scl + 1)) * 100
-                            print(f"  📊 {progress:.0f}% - {batch_clubs} clubs trouvés dans ce lot")
-                        
-                    except KeyboardInterrupt:
-                        print("\n\n⚠️  Interruption utilisateur")
-                        print(f"💾 Fichier sauvegardé jusqu'à scl={scl-1}")
-                        return
-                    except Exception as e:
-                        print(f"  ⚠️  Erreur pour scl={scl}: {e}")
-                        continue
-                
-                batch_time = time.time() - batch_start_time
-                print(f"\n  ✅ Lot terminé: {batch_clubs} clubs trouvés en {batch_time:.1f}s")
-                
-                # Statistiques
-                elapsed = (datetime.now() - start_time).total_seconds()
-                rate = (end_scl - resume_from + 1) / elapsed if elapsed > 0 else 0
-                remaining = max_scl - end_scl
-                eta_seconds = remaining / rate if rate > 0 else 0
-                
-                print(f"  📊 Total: {total_found} clubs | Vitesse: {rate:.1f} scl/s | ETA: {eta_seconds/3600:.1f}h")
+                            print(f"  ✅ scl={result.scl}: {club_data.nom}")
+                        if checkpoint is not None:
+                            checkpoint.record(result.scl, result.status)
+                except KeyboardInterrupt:
+                    save_interrupted()
+                    return
+    except BaseException:
+        records.close(compact=False)
+        if run_sink is not None:
+            run_sink.abort()
+        raise
     
     total_time = (datetime.now() - start_time).total_seconds()
+    # Les phases ne suivent pas l'ordre des scl: fusion du journal dans le CSV trié
+    records.close(compact=True)
+    if negative_cache is not None:
+        negative_cache.compact()
+    if density_index_file:
+        index.save(density_index_file)
+    if checkpoint is not None:
+        checkpoint.remove()
+    if store is not None:
+        store.close()
+    # Export du CSV complet (clubs des runs précédents compris)
+    parquet = None
+    if run_sink is not None:
+        run_sink.close()
+        parquet = export_csv(output_file, parquet_file, run_file=run_sink.path)
     
     print("\n" + "=" * 60)
     print("✅ SCRAPING TERMINÉ")
     print("=" * 60)
     print(f"📊 Statistiques:")
     print(f"   Clubs trouvés: {total_found}")
-    print(f"   Numéros testés: {max_scl - resume_from + 1}")
-    print(f"   Taux de réussite: {(total_found/(max_scl-resume_from+1)*100):.2f}%")
+    print(f"   Numéros testés: {tested}")
+    print(f"   Borne supérieure: {planner.upper_bound}")
+    print(f"   Taux de réussite: {(total_found/tested*100) if tested else 0:.2f}%")
+    if retry_queue.attempts:
+        print(f"   Reprises: {retry_queue.summary()}")
+        if retry_queue.given_up:
+            print(f"   ⚠️  Non résolus (à relancer): {sorted(retry_queue.given_up)[:10]}")
     print(f"   Temps total: {total_time/3600:.2f} heures")
-    print(f"   Vitesse moyenne: {(max_scl-resume_from+1)/total_time:.2f} scl/s")
+    print(f"   Vitesse moyenne: {tested/total_time if total_time else 0:.2f} scl/s")
+    if negative_cache is not None:
+        print(f"   Cache négatif: {negative_cache.summary()}")
+    if rate_limiter is not None:
+        print(f"   Débit: {rate_limiter.summary()}")
+    if hosts is not None:
+        print(f"   Hôtes: {hosts.summary()}")
+    if density_index_file:
+        print(f"🧭 Index de densité mis à jour: {density_index_file}")
     print(f"\n💾 Fichier CSV sauvegardé: {output_file}")
+    if store is not None:
+        print(f"🗄️  Base SQLite: {sqlite_file} ({store.upserted} clubs écrits, {store.deleted} supprimés)")
+    if parquet is not None:
+        print(f"📊 Parquet: {parquet.summary()}")
 
 
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Scrape tous les clubs de France en CSV")
-    parser.add_argument('--max-scl', type=int, default=30000, 
-                       help='Numéro scl maximum (défaut: 30000)')
+    parser.add_argument('--max-scl', type=int, default=0, 
+                       help='Numéro scl maximum (défaut: 0, borne supérieure détectée automatiquement)')
     parser.add_argument('--batch-size', type=int, default=1000,
                        help='Taille des lots pour affichage (défaut: 1000)')
     parser.add_argument('--output', type=str, default='clubs_france.csv',
                        help='Fichier CSV de sortie (défaut: clubs_france.csv)')
     parser.add_argument('--resume-from', type=int, default=1,
                        help='Reprendre depuis ce numéro scl (défaut: 1)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Nombre de processus en parallèle (défaut: 1)')
+    add_scraper_arguments(parser)
+    parser.add_argument('--density-index', type=str, default=None,
+                       help='Index de densité des scl (blocs denses d\'abord, mis à jour en fin de run)')
+    parser.add_argument('--no-sparse-sweep', action='store_true',
+                       help='Ne pas balayer les blocs clairsemés dont l\'échantillon n\'a rien trouvé')
     
     args = parser.parse_args()
     
     scrape_all_to_csv(
-        max_scl=args.max_scl,
+        max_scl=args.max_scl or None,
         batch_size=args.batch_size,
         output_file=args.output,
-        resume_from=args.resume_from
+        resume_from=args.resume_from,
+        workers=args.workers,
+        density_index_file=args.density_index,
+        sweep_sparse=not args.no_sparse_sweep,
+        **ScraperOptions.from_args(args).as_kwargs()
     )
 
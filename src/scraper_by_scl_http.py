@@ -0,0 +1,391 @@
+"""
+Scraper sans navigateur: interroge directement l'endpoint JSON des clubs.
+
+Une session `requests` avec un pool de connexions keep-alive est partagée
+par tous les threads. Si l'endpoint répond avec une forme non reconnue
+(ou ne répond pas), le scl est extrait avec SCLScraper (Playwright),
+lancé à la demande seulement. L'API sync de Playwright est liée au thread
+qui l'a démarrée: le navigateur vit dans un thread dédié, alimenté par une
+file, et y est fermé.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from club_api import DEFAULT_API_URL_TEMPLATE, api_url, club_from_payload
+from club_data import STATUS_ABSENT, STATUS_ERROR, STATUS_FOUND, STATUS_TRANSIENT, ClubData, ScrapeResult
+from negative_cache import NegativeCache
+from page_archive import PageArchive
+from rate_limit import RateLimiter
+from retry_queue import RetryPolicy, RetryQueue, transient_http_error
+from scan_checkpoint import ScanCheckpoint
+from scraper_options import ScraperOptions, add_scraper_arguments
+
+
+class BrowserFallback:
+    """SCLScraper possédé par un seul thread, qui traite les scl de sa file un par un"""
+
+    def __init__(self, **scraper_options):
+        """
+        Args:
+            scraper_options: Paramètres de SCLScraper (archive, negative_cache, rate_limiter)
+        """
+        self.scraper_options = scraper_options
+        self._requests: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def fetch_club(self, scl: int, base_url: str) -> ScrapeResult:
+        """Confie le scl au thread du navigateur (démarré au premier appel) et attend le résultat"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='browser-fallback', daemon=True)
+                self._thread.start()
+        future: Future = Future()
+        self._requests.put((scl, base_url, future))
+        return future.result()
+
+    def _run(self):
+        from scraper_by_scl import SCLScraper
+
+        scraper = None
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                scl, base_url, future = request
+                try:
+                    if scraper is None:
+                        scraper = SCLScraper(headless=True, slow_mo=0, **self.scraper_options).__enter__()
+                    future.set_result(scraper.fetch_club(scl, base_url))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            # Fermé dans le thread qui l'a lancé
+            if scraper is not None:
+                scraper.__exit__(None, None, None)
+
+    def close(self):
+        """Arrête le thread du navigateur après les scl déjà confiés"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._requests.put(None)
+            thread.join()
+
+
+class HttpSCLScraper:
+    """Scraper utilisant l'API JSON des clubs, avec repli sur Playwright"""
+
+    def __init__(self, api_url_template: str = DEFAULT_API_URL_TEMPLATE,
+                 pool_size: int = 64, timeout: float = 5.0, fallback: bool = True,
+                 archive: Optional[PageArchive] = None,
+                 negative_cache: Optional[NegativeCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Initialise le scraper.
+
+        Args:
+            api_url_template: URL de l'endpoint club, avec {scl}
+            pool_size: Nombre de connexions keep-alive par hôte
+            timeout: Timeout des requêtes HTTP (s)
+            fallback: Utiliser Playwright si la réponse n'est pas reconnue
+            archive: Archive où enregistrer chaque réponse (et page du repli navigateur)
+            negative_cache: Cache où enregistrer les scl confirmés sans club (404)
+            rate_limiter: Limiteur de débit par hôte (requêtes API et repli navigateur)
+            retry_policy: Tentatives et délais pour les échecs transitoires (429, 5xx, réseau)
+        """
+        self.api_url_template = api_url_template
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.fallback = fallback
+        self.archive = archive
+        self.negative_cache = negative_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_queue: Optional[RetryQueue] = None
+        self.session: Optional[requests.Session] = None
+        self.fallback_scraper: Optional[BrowserFallback] = None
+        self._fallback_lock = threading.Lock()
+        self.stats = {'api': 0, 'absent': 0, 'fallback': 0, 'unconfirmed': 0}
+        # Un 404 ne vaut absence qu'une fois l'endpoint vu répondre avec un club reconnu
+        self.endpoint_confirmed = False
+
+    def __enter__(self):
+        """Context manager entry"""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'application/json',
+        })
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        if self.session:
+            self.session.close()
+        if self.fallback_scraper:
+            self.fallback_scraper.close()
+
+    def extract_club_by_scl(self, scl: int, base_url: str = "https://gironde.fff.fr") -> Optional[ClubData]:
+        """
+        Extrait les données d'un club par son numéro d'affiliation.
+
+        Args:
+            scl: Numéro d'affiliation du club
+            base_url: URL de base du district, utilisée pour url_detail et le repli navigateur
+
+        Returns:
+            Objet ClubData avec les informations extraites, ou None si le club n'existe pas
+        """
+        return self.fetch_club(scl, base_url).club
+
+    def fetch_club(self, scl: int, base_url: str = "https://gironde.fff.fr") -> ScrapeResult:
+        """
+        Interroge l'API pour un scl et classe le résultat: club trouvé, absent
+        (404), échec transitoire (429, 5xx, erreur réseau: à retenter, sans
+        repli navigateur) ou forme non reconnue (repli navigateur).
+
+        Tant que l'endpoint n'a renvoyé aucun club reconnu, un 404 peut venir
+        d'une mauvaise URL d'API: il passe par le navigateur, ou, sans repli,
+        est retenté après le balayage (jamais mis dans le cache négatif).
+        """
+        url_detail = f"{base_url}/recherche-clubs?scl={scl}"
+
+        try:
+            url = api_url(scl, self.api_url_template)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            response = self.session.get(url, timeout=self.timeout)
+            if self.archive is not None:
+                self.archive.add(scl, url_detail, str(response.status_code), response.text,
+                                 content_type='json')
+            if response.status_code == 404 and not self.endpoint_confirmed:
+                self.stats['unconfirmed'] += 1
+                if not self.fallback:
+                    return ScrapeResult(scl, STATUS_TRANSIENT, error="HTTP 404 (endpoint non confirmé)")
+                return self._extract_with_browser(scl, base_url)
+            if response.status_code == 404:
+                self.stats['absent'] += 1
+                if self.negative_cache is not None:
+                    self.negative_cache.add(scl)
+                return ScrapeResult(scl, STATUS_ABSENT)
+            error = transient_http_error(response.status_code)
+            if error:
+                return ScrapeResult(scl, STATUS_TRANSIENT, error=error)
+            if response.status_code == 200:
+                club_data = club_from_payload(response.json(), url_detail)
+                if club_data:
+                    self.endpoint_confirmed = True
+                    self.stats['api'] += 1
+                    if self.negative_cache is not None:
+                        self.negative_cache.discard(scl)
+                    return ScrapeResult(scl, STATUS_FOUND, club_data)
+        except ValueError:
+            # Corps non JSON (requests.JSONDecodeError hérite aussi de RequestException)
+            pass
+        except requests.RequestException as e:
+            return ScrapeResult(scl, STATUS_TRANSIENT, error=type(e).__name__)
+
+        # Forme non reconnue: extraction par le navigateur
+        if not self.fallback:
+            return ScrapeResult(scl, STATUS_ERROR, error="réponse API non reconnue")
+        return self._extract_with_browser(scl, base_url)
+
+    def _extract_with_browser(self, scl: int, base_url: str) -> ScrapeResult:
+        """Repli sur SCLScraper (un seul navigateur, dans son propre thread)"""
+        with self._fallback_lock:
+            self.stats['fallback'] += 1
+            if self.fallback_scraper is None:
+                self.fallback_scraper = BrowserFallback(archive=self.archive, negative_cache=self.negative_cache,
+                                                        rate_limiter=self.rate_limiter)
+        return self.fallback_scraper.fetch_club(scl, base_url)
+
+    def scrape_scls(self, scls: Iterable[int], base_url: str = "https://gironde.fff.fr",
+                    workers: int = 32,
+                    on_result: Optional[Callable[[int, Optional[ClubData], float], None]] = None,
+                    checkpoint: Optional[ScanCheckpoint] = None) -> List[ClubData]:
+        """
+        Scrape une liste de numéros scl avec `workers` requêtes simultanées.
+        Les échecs transitoires sont retentés par lots après le balayage (self.retry_queue).
+
+        Args:
+            scls: Numéros scl à tester
+            base_url: URL de base du district
+            workers: Nombre de threads
+            on_result: Callback appelé une fois par scl, au résultat définitif (scl, club ou None, durée en s)
+            checkpoint: Point de reprise où noter les absences et les échecs définitifs (les clubs
+                trouvés sont marqués par l'appelant, une fois écrits dans sa sortie)
+
+        Returns:
+            Liste des clubs trouvés, triée par scl
+        """
+        def fetch(scl: int):
+            club_start = time.time()
+            result = self.fetch_club(scl, base_url)
+            return result, time.time() - club_start
+
+        found = {}
+        self.retry_queue = retry_queue = RetryQueue(self.retry_policy)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch = scls
+            while batch:
+                for result, elapsed in executor.map(fetch, batch):
+                    # Échec transitoire: remis en file, retenté après le balayage principal
+                    if not retry_queue.record(result):
+                        continue
+                    if result.club:
+                        found[result.scl] = result.club
+                    elif checkpoint is not None:
+                        checkpoint.record(result.scl, result.status)
+                    if on_result:
+                        on_result(result.scl, result.club, elapsed)
+                batch = retry_queue.pop_due()
+        return [found[scl] for scl in sorted(found)]
+
+    def scrape_range(self, start_scl: int, end_scl: int, base_url: str = "https://gironde.fff.fr",
+                     progress_interval: int = 100, workers: int = 32,
+                     checkpoint: Optional[ScanCheckpoint] = None) -> List[ClubData]:
+        """
+        Scrape une plage de numéros d'affiliation.
+
+        Args:
+            start_scl: Numéro de début
+            end_scl: Numéro de fin
+            base_url: URL de base du district
+            progress_interval: Afficher le progrès tous les N clubs
+            workers: Nombre de requêtes simultanées
+            checkpoint: Point de reprise (absences confirmées d'un run interrompu sautées)
+
+        Returns:
+            Liste des clubs trouvés
+        """
+        scls = range(start_scl, end_scl + 1)
+        if checkpoint is not None and checkpoint.resumed:
+            scls = [scl for scl in scls if not checkpoint.is_done(scl)]
+            print(f"🧾 Reprise depuis {checkpoint.path}: {checkpoint.summary()}")
+        if self.negative_cache is not None:
+            # Numéros déjà connus sans club (cache négatif non expiré)
+            scls = self.negative_cache.filter(scls)
+        total = len(scls)
+        done = 0
+        start_time = time.time()
+
+        print(f"🔢 Scraping HTTP des numéros scl de {start_scl} à {end_scl} ({total} clubs à tester, "
+              f"{workers} requêtes en parallèle)\n")
+
+        def on_result(scl: int, club_data: Optional[ClubData], elapsed: float):
+            nonlocal done
+            done += 1
+            if done % progress_interval == 0:
+                rate = done / (time.time() - start_time)
+                print(f"  📊 Progression: {done / total * 100:.1f}% ({done}/{total}) - {rate:.1f} scl/s "
+                      f"(api={self.stats['api']}, repli navigateur={self.stats['fallback']})")
+
+        clubs_data = self.scrape_scls(scls, base_url, workers, on_result, checkpoint)
+
+        print(f"\n✅ Scraping terminé: {len(clubs_data)} clubs trouvés sur {total} testés")
+        print(f"   API: {self.stats['api']} | Absents: {self.stats['absent']} | "
+              f"Repli navigateur: {self.stats['fallback']}")
+        if self.retry_queue.attempts:
+            print(f"🔁 Reprises: {self.retry_queue.summary()}")
+            if self.retry_queue.given_up:
+                print(f"   ⚠️  Non résolus (à relancer): {sorted(self.retry_queue.given_up)[:10]}")
+        if self.rate_limiter is not None:
+            print(f"🚦 Débit: {self.rate_limiter.summary()}")
+        if self.archive is not None:
+            print(f"📦 Archive: {self.archive.summary()}")
+        if self.negative_cache is not None:
+            print(f"🚫 Cache négatif: {self.negative_cache.summary()}")
+        return clubs_data
+
+
+def main():
+    """Fonction principale pour le scraper HTTP"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape les clubs FFF par scl via l'API JSON (sans navigateur)")
+    parser.add_argument('--start', type=int, default=1, help='Numéro scl de début')
+    parser.add_argument('--end', type=int, default=100, help='Numéro scl de fin')
+    parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                       help='URL de base (peu importe, le scl est unique)')
+    parser.add_argument('--api-url', type=str, default=DEFAULT_API_URL_TEMPLATE,
+                       help=f'Endpoint JSON du club, avec {{scl}} (défaut: {DEFAULT_API_URL_TEMPLATE})')
+    parser.add_argument('--workers', type=int, default=32,
+                       help='Nombre de requêtes en parallèle (défaut: 32)')
+    parser.add_argument('--no-fallback', action='store_true',
+                       help='Ne pas utiliser Playwright si la réponse n\'est pas reconnue')
+    parser.add_argument('--output', type=str, default='clubs_scl_scraped.json',
+                       help='Fichier de sortie JSON')
+    parser.add_argument('--archive', type=str, default=None,
+                       help='Répertoire où archiver les réponses (re-parsing hors ligne)')
+    add_scraper_arguments(parser, hosts=False, sqlite=False, parquet=False)
+
+    args = parser.parse_args()
+    options = ScraperOptions.from_args(args)
+
+    print("=" * 60)
+    print("🏆 SCRAPING HTTP PAR NUMÉRO D'AFFILIATION (SCL)")
+    print("=" * 60)
+    print(f"Plage: {args.start} - {args.end}")
+    print(f"Endpoint: {args.api_url}")
+    print("=" * 60)
+    print()
+
+    start_time = time.time()
+    archive = PageArchive(args.archive) if args.archive else None
+    negative_cache = options.open_negative_cache()
+    rate_limiter = options.open_rate_limiter()
+    # La sortie JSON n'est écrite qu'en fin de plage: à la relance, seules les absences sont sautées
+    checkpoint = options.open_checkpoint()
+    try:
+        with HttpSCLScraper(api_url_template=args.api_url, pool_size=args.workers,
+                            fallback=not args.no_fallback, archive=archive,
+                            negative_cache=negative_cache, rate_limiter=rate_limiter,
+                            retry_policy=options.retry_policy) as scraper:
+            clubs_data = scraper.scrape_range(args.start, args.end, args.base_url, workers=args.workers,
+                                              checkpoint=checkpoint)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interruption utilisateur")
+        if checkpoint is not None:
+            print(f"🧾 Point de reprise: {options.checkpoint_file} (relancer pour reprendre)")
+        return
+    finally:
+        if archive is not None:
+            archive.close()
+        if negative_cache is not None:
+            negative_cache.close()
+        if checkpoint is not None:
+            checkpoint.close()
+    total_time = time.time() - start_time
+
+    if clubs_data:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([club.__dict__ for club in clubs_data], f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats sauvegardés dans: {args.output}")
+    else:
+        print("\n⚠️  Aucun club trouvé dans cette plage")
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    print(f"⏱️  Vitesse: {(args.end - args.start + 1) / total_time:.2f} scl/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,495 @@
+"""
+Scraper asynchrone par numéro d'affiliation (scl).
+
+Un seul navigateur Chromium, un pool de pages réparties sur un ou plusieurs
+contextes, et N extractions menées en parallèle avec asyncio.
+Produit les mêmes objets ClubData que SCLScraper.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Iterable, List, Optional, Union
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from club_api import club_from_payload, is_club_payload_url
+from club_data import STATUS_ABSENT, STATUS_FOUND, STATUS_TRANSIENT, ClubData, ScrapeResult
+from club_extraction import SNAPSHOT_ARGS, SNAPSHOT_JS
+from club_page_parser import ClubPageParser
+from concurrency_control import AIMDController
+from host_pool import HostPool
+from negative_cache import NegativeCache
+from page_archive import PageArchive
+from page_readiness import PageReadiness, READY_ABSENT
+from rate_limit import RateLimiter
+from retry_queue import RetryPolicy, RetryQueue, result_from_exception, result_without_club, transient_http_error
+from scan_checkpoint import ScanCheckpoint
+from resource_blocking import BlockingProfile, get_profile
+from scraper_by_scl import EXTRACTION_STRATEGIES
+from scraper_options import ScraperOptions, add_scraper_arguments
+
+
+class AsyncSCLScraper:
+    """Scraper asynchrone utilisant un pool de pages dans un seul navigateur"""
+
+    def __init__(self, headless: bool = True, slow_mo: int = 0,
+                 concurrency: int = 8, contexts: int = 1,
+                 readiness: Optional[PageReadiness] = None,
+                 block_profile: Union[str, BlockingProfile, None] = None,
+                 extraction_strategy: str = 'dom', xhr_timeout: int = 3000,
+                 archive: Optional[PageArchive] = None,
+                 negative_cache: Optional[NegativeCache] = None,
+                 controller: Optional[AIMDController] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 hosts: Optional[HostPool] = None):
+        """
+        Initialise le scraper.
+
+        Args:
+            headless: Mode headless du navigateur
+            slow_mo: Délai entre les actions (ms)
+            concurrency: Nombre de pages (extractions simultanées)
+            contexts: Nombre de contextes navigateur entre lesquels répartir les pages
+            readiness: Attente de disponibilité des pages (partagée par toutes les pages)
+            block_profile: Profil d'interception des requêtes ("safe", "strict" ou BlockingProfile)
+            extraction_strategy: "dom" (page rendue) ou "xhr" (réponse JSON, repli sur "dom")
+            xhr_timeout: Attente maximale de la réponse JSON du club (ms)
+            archive: Archive où enregistrer chaque page récupérée (HTML ou JSON)
+            negative_cache: Cache où enregistrer les scl confirmés sans club
+            controller: Reçoit la durée et l'issue de chaque navigation (concurrence adaptative)
+            rate_limiter: Limiteur de débit par hôte appliqué à chaque navigation
+            retry_policy: Tentatives et délais pour les échecs transitoires (scrape_scls)
+            hosts: Hôtes de district entre lesquels répartir les requêtes (remplace base_url)
+        """
+        if extraction_strategy not in EXTRACTION_STRATEGIES:
+            raise ValueError(f"Stratégie d'extraction inconnue: {extraction_strategy} "
+                             f"(choix: {', '.join(EXTRACTION_STRATEGIES)})")
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.concurrency = max(1, concurrency)
+        self.contexts_count = max(1, min(contexts, self.concurrency))
+        self.readiness = readiness or PageReadiness()
+        self.block_profile = get_profile(block_profile)
+        self.extraction_strategy = extraction_strategy
+        self.xhr_timeout = xhr_timeout
+        self.extraction_stats = {'xhr': 0, 'dom': 0}
+        # Un 404 de l'API ne vaut absence qu'une fois un club reconnu sur cet endpoint
+        # (un endpoint déplacé ou renommé répond aussi 404)
+        self.endpoint_confirmed = False
+        self.parser = ClubPageParser()
+        self.archive = archive
+        self.negative_cache = negative_cache
+        self.controller = controller
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_queue: Optional[RetryQueue] = None
+        self.hosts = hosts
+        self.browser: Optional[Browser] = None
+        self.contexts: List[BrowserContext] = []
+        self.pages: List[Page] = []
+        self._pool: Optional[asyncio.Queue] = None
+
+    async def __aenter__(self):
+        """Context manager entry"""
+        self.playwright = await async_playwright().start()
+        launch_options = {
+            'slow_mo': self.slow_mo
+        }
+        if self.headless:
+            launch_options['headless'] = True
+
+        try:
+            self.browser = await self.playwright.chromium.launch(**launch_options)
+        except Exception as e:
+            if 'headless_shell' in str(e) or 'Executable doesn\'t exist' in str(e):
+                print("⚠️  Problème avec chromium_headless_shell, utilisation de chromium normal...")
+                launch_options.pop('headless', None)
+                self.browser = await self.playwright.chromium.launch(**launch_options)
+            else:
+                raise
+
+        for _ in range(self.contexts_count):
+            context = await self.browser.new_context(
+                extra_http_headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }
+            )
+            if self.block_profile:
+                # Annuler les ressources non essentielles pour toutes les pages du contexte
+                await context.route("**/*", self.block_profile.handle_route_async)
+            self.contexts.append(context)
+
+        # Répartir les pages entre les contextes (round-robin)
+        self._pool = asyncio.Queue()
+        for i in range(self.concurrency):
+            page = await self.contexts[i % self.contexts_count].new_page()
+            self.pages.append(page)
+            self._pool.put_nowait(page)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        if self.browser:
+            await self.browser.close()
+        if hasattr(self, 'playwright'):
+            await self.playwright.stop()
+
+    async def extract_club_by_scl(self, scl: int, base_url: str = "https://gironde.fff.fr") -> Optional[ClubData]:
+        """
+        Extrait les données d'un club en empruntant une page du pool.
+
+        Args:
+            scl: Numéro d'affiliation du club
+            base_url: URL de base du district (peu importe, le scl est unique)
+
+        Returns:
+            Objet ClubData avec les informations extraites, ou None si le club n'existe pas
+            (ou n'a pas pu être extrait: voir fetch_club pour distinguer les cas)
+        """
+        return (await self.fetch_club(scl, base_url)).club
+
+    async def fetch_club(self, scl: int, base_url: str = "https://gironde.fff.fr") -> ScrapeResult:
+        """Une tentative d'extraction sur une page du pool, avec son issue (voir SCLScraper.fetch_club)"""
+        page = await self._pool.get()
+        try:
+            if self.hosts is None:
+                return await self._extract_with_page(page, scl, base_url)
+            host = self.hosts.acquire()
+            start = time.time()
+            result = await self._extract_with_page(page, scl, host)
+            self.hosts.release(host, time.time() - start, failed=result.status == STATUS_TRANSIENT)
+            return result
+        finally:
+            self._pool.put_nowait(page)
+
+    async def _goto(self, page: Page, url: str) -> Optional[str]:
+        """
+        Navigue vers l'URL en une seule tentative (les échecs sont retentés plus tard).
+
+        Returns:
+            None si la page est chargée, sinon la cause de l'échec (transitoire)
+        """
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(url)
+        started = time.time()
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=5000)
+        except Exception as e:
+            if self.controller is not None:
+                self.controller.record(time.time() - started, timed_out=True)
+            return f"navigation: {str(e).splitlines()[0]}"
+        if self.controller is not None:
+            self.controller.record(time.time() - started)
+        return transient_http_error(response.status if response is not None else None)
+
+    async def _goto_capturing_payload(self, page: Page, url: str, scl: int):
+        """
+        Navigue vers l'URL en capturant la réponse XHR qui porte les données du club.
+
+        Returns:
+            Tuple (cause de l'échec de navigation ou None, réponse JSON ou None si elle n'est pas arrivée à temps)
+        """
+        error = None
+        try:
+            async with page.expect_response(
+                lambda response: (response.request.resource_type in ('xhr', 'fetch') and
+                                  is_club_payload_url(response.url, scl)),
+                timeout=self.xhr_timeout
+            ) as response_info:
+                error = await self._goto(page, url)
+            return error, await response_info.value
+        except Exception:
+            return error, None
+
+    async def _extract_with_page(self, page: Page, scl: int, base_url: str) -> ScrapeResult:
+        """Même logique que SCLScraper.fetch_club, sur une page du pool"""
+        url = f"{base_url}/recherche-clubs?scl={scl}"
+
+        try:
+            if self.extraction_strategy == 'xhr':
+                error, payload_response = await self._goto_capturing_payload(page, url, scl)
+                if error:
+                    return ScrapeResult(scl, STATUS_TRANSIENT, error=error)
+                if payload_response is not None:
+                    if self.archive is not None:
+                        self.archive.add(scl, url, str(payload_response.status),
+                                         await payload_response.text(), content_type='json')
+                    # Pas de club à ce numéro: l'API répond 404 (sinon extraction DOM, plus bas)
+                    if payload_response.status == 404 and self.endpoint_confirmed:
+                        self._record_absent(scl)
+                        return ScrapeResult(scl, STATUS_ABSENT)
+                    try:
+                        club_data = club_from_payload(await payload_response.json(), url)
+                    except Exception:
+                        club_data = None
+                    if club_data:
+                        self.endpoint_confirmed = True
+                        self.extraction_stats['xhr'] += 1
+                        self._record_found(scl)
+                        return ScrapeResult(scl, STATUS_FOUND, club_data)
+                # Réponse absente ou non reconnue: repli sur l'extraction DOM
+            else:
+                error = await self._goto(page, url)
+                if error:
+                    return ScrapeResult(scl, STATUS_TRANSIENT, error=error)
+            self.extraction_stats['dom'] += 1
+
+            # Attendre que le composant Angular affiche le club (ou un message "aucun résultat")
+            state = (await self.readiness.wait_async(page, url)).state
+            if self.archive is not None:
+                self.archive.add(scl, url, state, await page.content())
+            if state == READY_ABSENT:
+                self._record_absent(scl)
+                return ScrapeResult(scl, STATUS_ABSENT)
+
+            # Un seul appel au navigateur: HTML, titres et positions, siège, champs étiquetés
+            snapshot = await page.evaluate(SNAPSHOT_JS, SNAPSHOT_ARGS)
+            club_data = self.parser.parse_snapshot(snapshot, url)
+            if club_data:
+                self._record_found(scl)
+                return ScrapeResult(scl, STATUS_FOUND, club_data)
+            return result_without_club(scl, state)
+
+        except Exception as e:
+            # Ne pas afficher les erreurs de timeout, c'est normal pour les numéros invalides
+            if "timeout" not in str(e).lower() and "timeout" not in str(type(e)).lower():
+                print(f"      ⚠️  Erreur pour scl={scl}: {e}")
+            return result_from_exception(scl, e)
+
+    def _record_absent(self, scl: int):
+        """Absence confirmée (pas un timeout): mémorisée dans le cache négatif"""
+        if self.negative_cache is not None:
+            self.negative_cache.add(scl)
+
+    def _record_found(self, scl: int):
+        if self.negative_cache is not None:
+            self.negative_cache.discard(scl)
+
+    async def scrape_scls(self, scls: Iterable[int], base_url: str = "https://gironde.fff.fr",
+                          on_result: Optional[Callable[[int, Optional[ClubData], float], None]] = None,
+                          checkpoint: Optional[ScanCheckpoint] = None) -> List[ClubData]:
+        """
+        Scrape une liste de numéros scl avec `concurrency` extractions simultanées
+        (au plus: avec un contrôleur, seules `controller.limit` sont actives).
+        Les échecs transitoires sont retentés après le balayage (self.retry_queue).
+
+        Args:
+            scls: Numéros scl à tester
+            base_url: URL de base du district
+            on_result: Callback appelé une fois par scl, au résultat définitif (scl, club ou None, durée en s)
+            checkpoint: Point de reprise où noter les absences et les échecs définitifs (les clubs
+                trouvés sont marqués par l'appelant, une fois écrits dans sa sortie)
+
+        Returns:
+            Liste des clubs trouvés, triée par scl
+        """
+        scl_iter = iter(scls)
+        found = {}
+        exhausted = False
+        self.retry_queue = retry_queue = RetryQueue(self.retry_policy)
+
+        async def next_from_sweep() -> Optional[int]:
+            return next(scl_iter, None)
+
+        async def worker(slot: int, next_scl: Callable):
+            nonlocal exhausted
+            while True:
+                # Au-delà de la limite du contrôleur, le worker attend qu'elle remonte
+                if self.controller is not None and slot >= self.controller.limit:
+                    if exhausted:
+                        return
+                    await asyncio.sleep(0.05)
+                    continue
+                scl = await next_scl()
+                if scl is None:
+                    exhausted = True
+                    return
+                club_start = time.time()
+                result = await self.fetch_club(scl, base_url)
+                # Échec transitoire: remis en file, retenté après le balayage principal
+                if not retry_queue.record(result):
+                    continue
+                if result.club:
+                    found[scl] = result.club
+                elif checkpoint is not None:
+                    checkpoint.record(scl, result.status)
+                if on_result:
+                    on_result(scl, result.club, time.time() - club_start)
+
+        await asyncio.gather(*(worker(slot, next_from_sweep) for slot in range(self.concurrency)))
+        if len(retry_queue):
+            print(f"\n🔁 Nouvelles tentatives pour {len(retry_queue)} scl en échec transitoire...")
+            exhausted = False
+            await asyncio.gather(*(worker(slot, retry_queue.pop_async) for slot in range(self.concurrency)))
+        return [found[scl] for scl in sorted(found)]
+
+    async def scrape_range(self, start_scl: int, end_scl: int, base_url: str = "https://gironde.fff.fr",
+                           progress_interval: int = 100,
+                           checkpoint: Optional[ScanCheckpoint] = None) -> List[ClubData]:
+        """
+        Scrape une plage de numéros d'affiliation.
+
+        Args:
+            start_scl: Numéro de début
+            end_scl: Numéro de fin
+            base_url: URL de base du district
+            progress_interval: Afficher le progrès tous les N clubs
+            checkpoint: Point de reprise (absences confirmées d'un run interrompu sautées)
+
+        Returns:
+            Liste des clubs trouvés
+        """
+        scls = range(start_scl, end_scl + 1)
+        if checkpoint is not None and checkpoint.resumed:
+            scls = [scl for scl in scls if not checkpoint.is_done(scl)]
+            print(f"🧾 Reprise depuis {checkpoint.path}: {checkpoint.summary()}")
+        if self.negative_cache is not None:
+            # Numéros déjà connus sans club (cache négatif non expiré)
+            scls = self.negative_cache.filter(scls)
+        total = len(scls)
+        done = 0
+        found = 0
+        start_time = time.time()
+
+        parallel = (f"{self.concurrency} pages en parallèle" if self.controller is None
+                    else f"concurrence adaptative {self.controller.limit}-{self.concurrency} pages")
+        print(f"🔢 Scraping des numéros scl de {start_scl} à {end_scl} ({total} clubs à tester, {parallel})\n")
+
+        def on_result(scl: int, club_data: Optional[ClubData], elapsed: float):
+            nonlocal done, found
+            done += 1
+            if club_data:
+                found += 1
+                if found <= 5:
+                    print(f"    ✅ scl={scl}: {club_data.nom}")
+            if self.controller is not None:
+                for decision in self.controller.drain_decisions():
+                    print(f"  {decision}")
+            if done % progress_interval == 0:
+                rate = done / (time.time() - start_time)
+                limit = f" - {self.controller.limit} pages actives" if self.controller is not None else ""
+                print(f"  📊 Progression: {done / total * 100:.1f}% ({done}/{total}) - "
+                      f"{found} clubs trouvés - {rate:.1f} scl/s{limit}")
+
+        clubs_data = await self.scrape_scls(scls, base_url, on_result, checkpoint)
+
+        print(f"\n✅ Scraping terminé: {len(clubs_data)} clubs trouvés sur {total} testés")
+        if self.retry_queue.attempts:
+            print(f"🔁 Reprises: {self.retry_queue.summary()}")
+            if self.retry_queue.given_up:
+                print(f"   ⚠️  Non résolus (à relancer): {sorted(self.retry_queue.given_up)[:10]}")
+        print(f"⏱️  Attente des pages: {self.readiness.summary()}")
+        if self.controller is not None:
+            print(f"🎚️  Concurrence adaptative: {self.controller.summary()}")
+        if self.hosts is not None:
+            print(f"🌐 Hôtes: {self.hosts.summary()}")
+        if self.rate_limiter is not None:
+            print(f"🚦 Débit: {self.rate_limiter.summary()}")
+        if self.archive is not None:
+            print(f"📦 Archive: {self.archive.summary()}")
+        if self.negative_cache is not None:
+            print(f"🚫 Cache négatif: {self.negative_cache.summary()}")
+        return clubs_data
+
+
+async def _run(args, options: ScraperOptions, checkpoint: Optional[ScanCheckpoint]):
+    archive = PageArchive(args.archive) if args.archive else None
+    negative_cache = options.open_negative_cache()
+    # --concurrency devient le maximum; départ au quart
+    controller = AIMDController(initial=max(1, args.concurrency // 4), max_limit=args.concurrency,
+                                target_p95=args.target_p95,
+                                max_timeout_rate=args.max_timeout_rate) if args.adaptive else None
+    rate_limiter = options.open_rate_limiter()
+    hosts = options.open_hosts()
+    try:
+        async with AsyncSCLScraper(headless=True, slow_mo=0, concurrency=args.concurrency,
+                                   contexts=args.contexts, block_profile=args.block,
+                                   extraction_strategy=args.strategy, archive=archive,
+                                   negative_cache=negative_cache, controller=controller,
+                                   rate_limiter=rate_limiter, retry_policy=options.retry_policy,
+                                   hosts=hosts) as scraper:
+            return await scraper.scrape_range(args.start, args.end, args.base_url, checkpoint=checkpoint)
+    finally:
+        if archive is not None:
+            archive.close()
+        if negative_cache is not None:
+            negative_cache.close()
+
+
+def main():
+    """Fonction principale pour le scraper asynchrone"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape les clubs FFF par scl avec un pool de pages asynchrone")
+    parser.add_argument('--start', type=int, default=1, help='Numéro scl de début')
+    parser.add_argument('--end', type=int, default=100, help='Numéro scl de fin')
+    parser.add_argument('--base-url', type=str, default='https://gironde.fff.fr',
+                       help='URL de base (peu importe, le scl est unique)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Nombre de pages en parallèle (défaut: 8)')
+    parser.add_argument('--contexts', type=int, default=1,
+                       help='Nombre de contextes navigateur (défaut: 1)')
+    parser.add_argument('--block', type=str, choices=['safe', 'strict'], default=None,
+                       help='Annuler les ressources non essentielles (safe ou strict)')
+    parser.add_argument('--strategy', type=str, choices=list(EXTRACTION_STRATEGIES), default='dom',
+                       help="Extraction depuis la page rendue (dom) ou la réponse JSON (xhr)")
+    parser.add_argument('--output', type=str, default='clubs_scl_scraped.json',
+                       help='Fichier de sortie JSON')
+    parser.add_argument('--archive', type=str, default=None,
+                       help='Répertoire où archiver les pages récupérées (re-parsing hors ligne)')
+    add_scraper_arguments(parser, sqlite=False, parquet=False)
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Ajuster le nombre de pages actives (AIMD) selon la latence et les timeouts; '
+                            '--concurrency devient le maximum')
+    parser.add_argument('--target-p95', type=float, default=3.0,
+                       help='Latence p95 de navigation visée en s (défaut: 3.0)')
+    parser.add_argument('--max-timeout-rate', type=float, default=0.05,
+                       help='Taux de timeouts de navigation toléré (défaut: 0.05)')
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏆 SCRAPING ASYNCHRONE PAR NUMÉRO D'AFFILIATION (SCL)")
+    print("=" * 60)
+    print(f"Plage: {args.start} - {args.end}")
+    print(f"Pages en parallèle: {args.concurrency}{' max (adaptatif)' if args.adaptive else ''} "
+          f"({args.contexts} contexte(s))")
+    print("=" * 60)
+    print()
+
+    options = ScraperOptions.from_args(args)
+    # La sortie JSON n'est écrite qu'en fin de plage: à la relance, seules les absences sont sautées
+    checkpoint = options.open_checkpoint()
+    start_time = time.time()
+    try:
+        clubs_data = asyncio.run(_run(args, options, checkpoint))
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interruption utilisateur")
+        if checkpoint is not None:
+            print(f"🧾 Point de reprise: {options.checkpoint_file} (relancer pour reprendre)")
+        return
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    total_time = time.time() - start_time
+
+    if clubs_data:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([club.__dict__ for club in clubs_data], f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats sauvegardés dans: {args.output}")
+    else:
+        print("\n⚠️  Aucun club trouvé dans cette plage")
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    print(f"⏱️  Vitesse: {(args.end - args.start + 1) / total_time:.2f} scl/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Options communes des scrapers en ligne de commande.
+
+Cache négatif, débit par hôte, reprises des échecs transitoires, répartition
+entre hôtes, point de reprise et sorties annexes (SQLite, Parquet) se règlent
+de la même façon dans tous les CLIs: `add_scraper_arguments` déclare ces options une seule
+fois, `ScraperOptions.from_args` les regroupe sous les noms des paramètres
+des drivers (scrape_range, scrape_all_to_csv, scrape_all_parallel).
+
+    parser = argparse.ArgumentParser(...)
+    add_scraper_arguments(parser, parquet=False)
+    options = ScraperOptions.from_args(parser.parse_args())
+    scrape_range(1, 100, **options.as_kwargs())
+"""
+
+import os
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from host_pool import HOST_STRATEGIES, HostPool
+from negative_cache import DEFAULT_TTL_DAYS, NegativeCache
+from rate_limit import RateLimiter
+from retry_queue import RetryPolicy
+from scan_checkpoint import ScanCheckpoint, default_checkpoint_path
+
+DEFAULT_HOST_STRATEGY = 'least-loaded'
+
+
+def add_scraper_arguments(parser, hosts: bool = True, sqlite: bool = True, parquet: bool = True,
+                          checkpoint: bool = True):
+    """
+    Ajoute les options communes à un parser argparse
+
+    Args:
+        parser: ArgumentParser (ou sous-commande) du CLI
+        hosts: Ajouter --hosts et --host-strategy
+        sqlite: Ajouter --sqlite
+        parquet: Ajouter --parquet
+        checkpoint: Ajouter --checkpoint et --no-checkpoint (le CLI doit avoir une sortie `output`)
+    """
+    parser.add_argument('--negative-cache', type=str, default=None,
+                        help='Fichier du cache des scl sans club (numéros sautés tant que valides)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL_DAYS,
+                        help=f'Durée de validité du cache négatif en jours (défaut: {DEFAULT_TTL_DAYS:g})')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='Débit maximal par hôte en requêtes/s, tous workers confondus (défaut: illimité)')
+    parser.add_argument('--burst', type=float, default=None,
+                        help='Rafale tolérée par hôte (défaut: max(1, débit))')
+    parser.add_argument('--rate-state', type=str, default=None,
+                        help='Répertoire des seaux partagés avec d\'autres processus')
+    parser.add_argument('--max-attempts', type=int, default=RetryPolicy.max_attempts,
+                        help=f'Tentatives par scl en cas d\'échec transitoire (défaut: {RetryPolicy.max_attempts})')
+    parser.add_argument('--retry-base-delay', type=float, default=RetryPolicy.base_delay,
+                        help=f'Délai avant la première reprise, doublé à chaque tentative (défaut: {RetryPolicy.base_delay:g}s)')
+    if hosts:
+        parser.add_argument('--hosts', type=str, default=None,
+                            help='districts_urls.json: répartir les requêtes entre les hôtes vérifiés (remplace --base-url)')
+        parser.add_argument('--host-strategy', type=str, choices=list(HOST_STRATEGIES), default=DEFAULT_HOST_STRATEGY,
+                            help=f'Choix de l\'hôte: à tour de rôle ou le moins chargé (défaut: {DEFAULT_HOST_STRATEGY})')
+    if sqlite:
+        parser.add_argument('--sqlite', type=str, default=None,
+                            help='Base SQLite des clubs à mettre à jour en plus de la sortie (upserts groupés, index)')
+    if parquet:
+        parser.add_argument('--parquet', type=str, default=None,
+                            help='Export Parquet de tout le CSV: clubs du run écrits au fil de l\'eau, fusionnés en fin de run (nécessite pyarrow)')
+    if checkpoint:
+        parser.add_argument('--checkpoint', type=str, default=None,
+                            help='Point de reprise exact (défaut: <sortie>.ckpt, supprimé en fin de balayage)')
+        parser.add_argument('--no-checkpoint', action='store_true',
+                            help='Ne pas tenir de point de reprise')
+
+
+def _checkpoint_file(args) -> Optional[str]:
+    """Point de reprise demandé (défaut: <sortie>.ckpt), None avec --no-checkpoint ou sans l'option"""
+    if not hasattr(args, 'no_checkpoint') or args.no_checkpoint:
+        return None
+    return getattr(args, 'checkpoint', None) or default_checkpoint_path(args.output)
+
+
+@dataclass
+class ScraperOptions:
+    """Options communes, sous les noms des paramètres des drivers"""
+    negative_cache_file: Optional[str] = None
+    cache_ttl: float = DEFAULT_TTL_DAYS
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    rate_state_dir: Optional[str] = None
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    hosts_file: Optional[str] = None
+    host_strategy: str = DEFAULT_HOST_STRATEGY
+    sqlite_file: Optional[str] = None
+    parquet_file: Optional[str] = None
+    checkpoint_file: Optional[str] = None
+
+    @classmethod
+    def from_args(cls, args) -> 'ScraperOptions':
+        """Options lues sur la ligne de commande (celles non déclarées gardent leur défaut)"""
+        return cls(negative_cache_file=args.negative_cache, cache_ttl=args.cache_ttl,
+                   rate=args.rate, burst=args.burst, rate_state_dir=args.rate_state,
+                   retry_policy=RetryPolicy(args.max_attempts, args.retry_base_delay),
+                   hosts_file=getattr(args, 'hosts', None),
+                   host_strategy=getattr(args, 'host_strategy', DEFAULT_HOST_STRATEGY),
+                   sqlite_file=getattr(args, 'sqlite', None), parquet_file=getattr(args, 'parquet', None),
+                   checkpoint_file=_checkpoint_file(args))
+
+    def as_kwargs(self) -> dict:
+        """Paramètres nommés pour scrape_range, scrape_all_to_csv et scrape_all_parallel"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def open_negative_cache(self) -> Optional[NegativeCache]:
+        return NegativeCache(self.negative_cache_file, self.cache_ttl) if self.negative_cache_file else None
+
+    def open_rate_limiter(self) -> Optional[RateLimiter]:
+        return RateLimiter(self.rate, self.burst, self.rate_state_dir) if self.rate else None
+
+    def open_hosts(self) -> Optional[HostPool]:
+        return HostPool.from_file(self.hosts_file, strategy=self.host_strategy) if self.hosts_file else None
+
+    def open_checkpoint(self) -> Optional[ScanCheckpoint]:
+        return ScanCheckpoint(self.checkpoint_file) if self.checkpoint_file else None
+
@@ -0,0 +1,195 @@
+"""
+Micro-benchmark de l'extraction sur le corpus de pages club (tests/fixtures/club_pages).
+
+Sans réseau ni navigateur: les chiffres ne dépendent que du code d'extraction.
+Pour chaque page du corpus:
+- par stratégie: parsing HTML complet (lxml + heuristiques), construction du
+  snapshot, heuristiques sur snapshot (partie Python de "dom"), JSON ("xhr");
+- par champ: affiliation, nom, emails, téléphone, adresse.
+
+Temps en µs/page (meilleure moyenne sur --repeat séries de --iterations
+appels) et pic de mémoire allouée par appel (tracemalloc, mesuré à part).
+Les résultats sont d'abord comparés à expected.json.
+
+Usage:
+    python tests/benchmark_extraction.py
+    python tests/benchmark_extraction.py --iterations 500 --json bench.json
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from club_api import club_from_payload
+from club_extraction import (club_from_snapshot, extract_adresse, extract_affiliation, extract_emails,
+                             extract_telephone, fields_text, nom_from_snapshot)
+from club_page_parser import ClubPageParser
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'club_pages')
+URL = "https://gironde.fff.fr/recherche-clubs?scl=0"
+COMPARED_FIELDS = ('nom', 'numero_affiliation', 'email', 'telephone', 'adresse')
+
+
+def load_corpus() -> Dict[str, dict]:
+    """Pages du corpus: {nom: {'kind': 'html'|'json', 'content': ..., 'expected': ...}}"""
+    with open(os.path.join(CORPUS_DIR, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    corpus = {}
+    for name, values in expected.items():
+        kind = 'json' if name.endswith('.json') else 'html'
+        path = os.path.join(CORPUS_DIR, name if kind == 'json' else f"{name}.html")
+        with open(path, encoding='utf-8') as f:
+            content = json.load(f) if kind == 'json' else f.read()
+        corpus[name] = {'kind': kind, 'content': content, 'expected': values}
+    return corpus
+
+
+def check_corpus(corpus: Dict[str, dict]) -> List[str]:
+    """Compare l'extraction aux valeurs attendues; retourne les écarts"""
+    parser = ClubPageParser()
+    errors = []
+    for name, page in corpus.items():
+        if page['kind'] == 'json':
+            club = club_from_payload(page['content'], URL)
+        else:
+            club = parser.parse(page['content'], URL)
+        got = None if club is None else {field: getattr(club, field) for field in COMPARED_FIELDS}
+        if got != page['expected']:
+            errors.append(f"{name}: attendu {page['expected']}, obtenu {got}")
+    return errors
+
+
+def time_us(func: Callable[[], object], iterations: int, repeat: int) -> float:
+    """Temps par appel en µs (meilleure série)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def peak_kib(func: Callable[[], object]) -> float:
+    """Pic de mémoire allouée pendant un appel (Kio)"""
+    func()  # Échauffement (caches, compilation des regex)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - base) / 1024
+
+
+def measures_for_page(page: dict, parser: ClubPageParser) -> Dict[str, Callable[[], object]]:
+    """Fonctions mesurées pour une page: stratégies puis champs"""
+    if page['kind'] == 'json':
+        payload = page['content']
+        return {'strategy:xhr': lambda: club_from_payload(payload, URL)}
+
+    html = page['content']
+    snapshot = parser.snapshot(html)
+    page_text = snapshot['html']
+    fields = fields_text(snapshot)
+
+    def emails():
+        return extract_emails(fields)[0] or extract_emails(page_text)[0]
+
+    return {
+        'strategy:html': lambda: parser.parse(html, URL),
+        'strategy:snapshot': lambda: parser.snapshot(html),
+        'strategy:dom': lambda: club_from_snapshot(snapshot, URL),
+        'field:affiliation': lambda: extract_affiliation(page_text),
+        'field:nom': lambda: nom_from_snapshot(snapshot),
+        'field:emails': emails,
+        'field:telephone': lambda: extract_telephone(fields) or extract_telephone(page_text),
+        'field:adresse': lambda: snapshot.get('siege_address') or extract_adresse(page_text),
+    }
+
+
+def run(iterations: int = 200, repeat: int = 5, only: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    Exécute le benchmark.
+
+    Returns:
+        {page: {mesure: {'us': ..., 'peak_kib': ...}}}
+    """
+    corpus = load_corpus()
+    errors = check_corpus(corpus)
+    if errors:
+        raise AssertionError("Extraction incorrecte sur le corpus:\n  " + "\n  ".join(errors))
+
+    parser = ClubPageParser()
+    results = {}
+    for name, page in corpus.items():
+        if only and name not in only:
+            continue
+        results[name] = {}
+        for measure, func in measures_for_page(page, parser).items():
+            results[name][measure] = {
+                'us': round(time_us(func, iterations, repeat), 2),
+                'peak_kib': round(peak_kib(func), 1),
+            }
+    return results
+
+
+def print_results(results: Dict[str, dict]):
+    measures = []
+    for page_results in results.values():
+        for measure in page_results:
+            if measure not in measures:
+                measures.append(measure)
+
+    width = max(len(name) for name in results) + 2
+    print(f"{'page':<{width}}" + "".join(f"{m.split(':')[1]:>14}" for m in measures))
+    print(f"{'':<{width}}" + "".join(f"{m.split(':')[0]:>14}" for m in measures))
+    for name, page_results in results.items():
+        line = f"{name:<{width}}"
+        for measure in measures:
+            value = page_results.get(measure)
+            line += f"{value['us']:>11.1f} µs" if value else f"{'-':>14}"
+        print(line)
+    print()
+    print("Pic mémoire par appel (Kio)")
+    for name, page_results in results.items():
+        line = f"{name:<{width}}"
+        for measure in measures:
+            value = page_results.get(measure)
+            line += f"{value['peak_kib']:>14.1f}" if value else f"{'-':>14}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de l'extraction sur le corpus de pages club")
+    parser.add_argument('--iterations', type=int, default=200, help='Appels par série (défaut: 200)')
+    parser.add_argument('--repeat', type=int, default=5, help='Nombre de séries, la meilleure est gardée (défaut: 5)')
+    parser.add_argument('--page', action='append', default=None, help='Limiter à une page du corpus (répétable)')
+    parser.add_argument('--json', type=str, default=None, help='Sauvegarder les résultats en JSON')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  BENCHMARK EXTRACTION (corpus local)")
+    print("=" * 60)
+    print(f"Corpus: {CORPUS_DIR}")
+    print(f"{args.iterations} appels x {args.repeat} séries par mesure\n")
+
+    results = run(args.iterations, args.repeat, args.page)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats sauvegardés dans: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Serveur local qui imite le site FFF, pour les tests de débit hors ligne.
+
+Sert `/recherche-clubs?scl=N` (pages du corpus tests/fixtures/club_pages,
+personnalisées par scl) et `/api/clubs/N` (JSON, 404 si pas de club). La
+page club déclenche aussi un `fetch` de l'API, comme l'application Angular,
+pour la stratégie "xhr".
+
+Injection de pannes configurable:
+- latence tirée d'une distribution ("fixed:50", "uniform:20:200",
+  "lognormal:80:0.5", "exp:100", en ms),
+- requêtes qui ne répondent pas (timeout),
+- erreurs 5xx aléatoires et rafales de 503 périodiques,
+- carte creuse des scl valides (blocs denses, clairsemés ou vides, graine fixe).
+
+Usage:
+    python tests/fake_fff_server.py --port 8000 --latency lognormal:80:0.5 --error-rate 0.01
+    python src/scraper_by_scl_parallel.py --start 1 --end 2000 --base-url http://127.0.0.1:8000
+    python src/scraper_by_scl_http.py --end 2000 --api-url "http://127.0.0.1:8000/api/clubs/{scl}"
+    python scripts/scrape_range.py 1 200 --base-url http://127.0.0.1:8000
+"""
+
+import os
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Set
+from urllib.parse import parse_qs, urlparse
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'club_pages')
+
+# Valeurs de la page "found" du corpus, remplacées par celles du scl demandé
+TEMPLATE_VALUES = {
+    'nom': 'US CENON RIVE DROITE',
+    'numero_affiliation': '520644',
+    'email': 'contact@uscenon.fr',
+}
+
+# Densités possibles d'un bloc de scl: vide, clairsemé, dense
+BLOCK_DENSITIES = ((0.0, 0.4), (0.05, 0.3), (0.7, 0.3))
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Distribution de latence à partir d'une spécification (valeurs en ms).
+
+    Returns:
+        Fonction (générateur aléatoire) -> latence en secondes
+    """
+    name, *params = spec.split(':')
+    values = [float(p) for p in params]
+    if name == 'none':
+        return lambda rng: 0.0
+    if name == 'fixed' and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if name == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if name == 'lognormal' and len(values) == 2:
+        # Médiane en ms et sigma: longue traîne réaliste
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+    if name == 'exp' and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) / 1000
+    raise ValueError(f"Latence invalide: {spec} (none, fixed:MS, uniform:MIN:MAX, lognormal:MEDIANE:SIGMA, exp:MOYENNE)")
+
+
+def generate_valid_scls(max_scl: int, block_size: int = 100, seed: int = 1) -> Set[int]:
+    """Carte creuse des scl valides: blocs vides, clairsemés ou denses"""
+    rng = random.Random(seed)
+    densities = [d for d, _ in BLOCK_DENSITIES]
+    weights = [w for _, w in BLOCK_DENSITIES]
+    valid = set()
+    for block_start in range(1, max_scl + 1, block_size):
+        density = rng.choices(densities, weights)[0]
+        for scl in range(block_start, min(block_start + block_size, max_scl + 1)):
+            if rng.random() < density:
+                valid.add(scl)
+    return valid
+
+
+@dataclass
+class FakeServerConfig:
+    """Comportement du serveur"""
+    latency: str = 'none'
+    timeout_rate: float = 0.0
+    hang_seconds: float = 30.0
+    error_rate: float = 0.0
+    burst_every: float = 0.0
+    burst_duration: float = 0.0
+    max_scl: int = 30000
+    block_size: int = 100
+    seed: int = 1
+    valid_scls: Optional[Set[int]] = None
+
+
+@dataclass
+class FakeServerStats:
+    """Compteurs des réponses servies"""
+    requests: int = 0
+    clubs: int = 0
+    absent: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    bursts: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, key: str):
+        with self.lock:
+            self.requests += 1
+            setattr(self, key, getattr(self, key) + 1)
+
+
+class FakeFFFServer:
+    """Serveur HTTP local (thread) imitant les pages club et l'API du site"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, config: Optional[FakeServerConfig] = None):
+        self.config = config or FakeServerConfig()
+        self.valid_scls = (self.config.valid_scls if self.config.valid_scls is not None
+                           else generate_valid_scls(self.config.max_scl, self.config.block_size, self.config.seed))
+        self.latency = parse_latency(self.config.latency)
+        self.stats = FakeServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._started_at = time.time()
+
+        with open(os.path.join(CORPUS_DIR, 'found.html'), encoding='utf-8') as f:
+            self._club_template = f.read()
+        with open(os.path.join(CORPUS_DIR, 'not_found.html'), encoding='utf-8') as f:
+            self._absent_page = f.read()
+        with open(os.path.join(CORPUS_DIR, 'found.json'), encoding='utf-8') as f:
+            self._payload_template = json.load(f)
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url_template(self) -> str:
+        return self.base_url + "/api/clubs/{scl}"
+
+    def club_for(self, scl: int) -> Optional[Dict[str, str]]:
+        """Valeurs servies pour un scl (None si pas de club)"""
+        if scl not in self.valid_scls:
+            return None
+        return {
+            'nom': f"US CLUB NUMERO {scl}",
+            'numero_affiliation': str(500000 + scl),
+            'email': f"contact{scl}@club.fr",
+        }
+
+    def club_page(self, scl: int) -> str:
+        club = self.club_for(scl)
+        page = self._club_template
+        for key, value in TEMPLATE_VALUES.items():
+            page = page.replace(value, club[key])
+        # Comme l'application Angular: les données du club sont aussi demandées à l'API
+        return page.replace('</body>', f'<script>fetch("/api/clubs/{scl}");</script>\n</body>')
+
+    def club_payload(self, scl: int) -> dict:
+        club = self.club_for(scl)
+        data = dict(self._payload_template['data'])
+        data.update({'name': club['nom'], 'affiliation_number': int(club['numero_affiliation']),
+                     'email_principal': club['email']})
+        return {'data': data}
+
+    def _draw(self):
+        """Tirages aléatoires d'une requête: (latence, timeout, erreur 5xx)"""
+        with self._rng_lock:
+            return (self.latency(self._rng),
+                    self._rng.random() < self.config.timeout_rate,
+                    self._rng.random() < self.config.error_rate,
+                    self._rng.choice((500, 502, 503)))
+
+    def in_burst(self) -> bool:
+        """Vrai pendant une rafale de 503 (burst_duration s toutes les burst_every s)"""
+        if self.config.burst_every <= 0 or self.config.burst_duration <= 0:
+            return False
+        return (time.time() - self._started_at) % self.config.burst_every < self.config.burst_duration
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str, content_type: str):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                api_match = re.match(r'^/api/clubs/(\d+)$', parsed.path)
+                if parsed.path == '/recherche-clubs':
+                    scl_values = parse_qs(parsed.query).get('scl', [''])
+                    scl = int(scl_values[0]) if scl_values[0].isdigit() else None
+                elif api_match:
+                    scl = int(api_match.group(1))
+                else:
+                    self._send(404, 'Not found', 'text/plain')
+                    return
+
+                latency, hang, error, error_status = server._draw()
+                if hang:
+                    server.stats.count('timeouts')
+                    time.sleep(server.config.hang_seconds)
+                    self.close_connection = True
+                    return
+                time.sleep(latency)
+                if server.in_burst():
+                    server.stats.count('bursts')
+                    self._send(503, 'Service Unavailable', 'text/plain')
+                    return
+                if error:
+                    server.stats.count('errors')
+                    self._send(error_status, 'Server Error', 'text/plain')
+                    return
+
+                found = scl is not None and scl in server.valid_scls
+                server.stats.count('clubs' if found else 'absent')
+                if api_match:
+                    if found:
+                        self._send(200, json.dumps(server.club_payload(scl), ensure_ascii=False), 'application/json')
+                    else:
+                        self._send(404, json.dumps({'error': 'not found'}), 'application/json')
+                else:
+                    self._send(200, server.club_page(scl) if found else server._absent_page, 'text/html')
+
+        return Handler
+
+    def start(self) -> 'FakeFFFServer':
+        """Démarre le serveur dans un thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant le site FFF (pages club et API)")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Adresse d\'écoute')
+    parser.add_argument('--port', type=int, default=8000, help='Port (défaut: 8000)')
+    parser.add_argument('--latency', type=str, default='none',
+                       help='Distribution de latence en ms: none, fixed:50, uniform:20:200, lognormal:80:0.5, exp:100')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='Proportion de requêtes sans réponse')
+    parser.add_argument('--hang-seconds', type=float, default=30.0, help='Durée d\'une requête sans réponse (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Proportion d\'erreurs 5xx')
+    parser.add_argument('--burst-every', type=float, default=0.0, help='Période des rafales de 503 (s, 0: aucune)')
+    parser.add_argument('--burst-duration', type=float, default=0.0, help='Durée d\'une rafale de 503 (s)')
+    parser.add_argument('--max-scl', type=int, default=30000, help='Aucun club au-delà de ce scl')
+    parser.add_argument('--block-size', type=int, default=100, help='Taille des blocs de la carte des scl valides')
+    parser.add_argument('--seed', type=int, default=1, help='Graine des tirages aléatoires')
+    args = parser.parse_args()
+
+    config = FakeServerConfig(latency=args.latency, timeout_rate=args.timeout_rate,
+                              hang_seconds=args.hang_seconds, error_rate=args.error_rate,
+                              burst_every=args.burst_every, burst_duration=args.burst_duration,
+                              max_scl=args.max_scl, block_size=args.block_size, seed=args.seed)
+    server = FakeFFFServer(args.host, args.port, config)
+    print(f"🧪 Faux site FFF sur {server.base_url} ({len(server.valid_scls)} clubs sur 1-{args.max_scl})")
+    print(f"   Pages: {server.base_url}/recherche-clubs?scl=N | API: {server.api_url_template}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"\n📊 {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
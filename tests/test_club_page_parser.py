@@ -0,0 +1,127 @@
+"""
+Tests du parseur hors navigateur sur des pages club construites à la main
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from club_page_parser import ClubPageParser
+
+URL = "https://gironde.fff.fr/recherche-clubs?scl=6504"
+
+NAV = """
+<header><h1>Accueil</h1><h2>District de la Gironde</h2></header>
+"""
+
+
+def club_page(nom: str, affiliation: str, contacts: str = "", siege: str = "") -> str:
+    """Page club au format Angular du site (app-club)"""
+    return f"""<!DOCTYPE html><html><head><title>Recherche clubs | District</title></head>
+<body>{NAV}
+<app-club>
+  <div class="club-title"><h1>{nom}</h1><h2>N°affiliation: {affiliation}</h2></div>
+  <div class="txt-map-siege">{siege}</div>
+  <div class="contacts">{contacts}</div>
+</app-club>
+<footer><strong>Ensemble, écrivons l'avenir</strong></footer>
+</body></html>"""
+
+
+SIEGE = ('<span class="title-ground">Siège social</span><br>'
+         '<b>Adresse :</b><span> Route de lavacant   - 32000 - AUCH </span>')
+
+
+def test_club_complet():
+    """Nom, affiliation, email, téléphone et adresse"""
+    html = club_page(
+        "CLUB DISTRICT GERS", "6504",
+        contacts=('<b>Email officiel</b> : district@lfna.fr<br>'
+                  '<b>Email principal</b> : contact@club.fr<br>'
+                  '<b>Téléphone travail</b> : 05 62 00 00 00<br>'),
+        siege=SIEGE,
+    )
+    club = ClubPageParser().parse(html, URL)
+
+    assert club is not None
+    assert club.nom == "CLUB DISTRICT GERS"
+    assert club.numero_affiliation == "6504"
+    assert club.email == "contact@club.fr"
+    assert club.email_principal == "contact@club.fr"
+    assert club.email_officiel == "district@lfna.fr"
+    assert club.telephone == "0562000000"
+    assert club.adresse == "Route de lavacant - 32000 - AUCH"
+    assert club.url_detail == URL
+
+
+def test_page_sans_club():
+    """Pas de numéro d'affiliation: pas de club"""
+    html = f"<html><body>{NAV}<app-club><p>Aucun résultat</p></app-club></body></html>"
+    assert ClubPageParser().parse(html, URL) is None
+
+
+def test_club_ligue_et_affiliation_zero():
+    """"CLUB LIGUE" n'est pas filtré, l'affiliation 0 est acceptée"""
+    club = ClubPageParser().parse(club_page("CLUB LIGUE ALSACE", "0"), URL)
+    assert club is not None
+    assert club.nom == "CLUB LIGUE ALSACE"
+    assert club.numero_affiliation == "0"
+    assert club.email is None
+    assert club.adresse is None
+
+
+def test_email_autre_et_telephone_autre():
+    """Plusieurs "Email autre": le premier est gardé; téléphone trop court ignoré"""
+    html = club_page(
+        "US SAINT MEDARD", "500123",
+        contacts=('<b>Email autre</b> : a@club.fr, b@club.fr<br>'
+                  '<b>Téléphone autre</b> : 12<br>'
+                  '<b>Téléphone autre</b> : 06 11 22 33 44<br>'),
+    )
+    club = ClubPageParser().parse(html, URL)
+    assert club.email == "a@club.fr"
+    assert club.email_principal is None
+    assert club.telephone == "0611223344"
+
+
+def test_portee_app_club():
+    """Seul le composant app-club est parcouru; sans app-club, tout le document"""
+    html = club_page("US SAINT MEDARD", "500123").replace(
+        "<footer>", "<footer><b>Email principal</b> : contact@district.fr<br>")
+    parser = ClubPageParser()
+    snapshot = parser.snapshot(html)
+    assert snapshot['scope'] == "app-club"
+    assert "<header>" not in snapshot['html']
+    assert parser.parse(html, URL).email is None
+
+    sans_composant = html.replace("<app-club>", "<div>").replace("</app-club>", "</div>")
+    assert parser.snapshot(sans_composant)['scope'] == "document"
+    club = parser.parse(sans_composant, URL)
+    assert club.nom == "US SAINT MEDARD"
+    assert club.email == "contact@district.fr"
+
+
+def test_corpus():
+    """Pages du corpus de benchmark (tests/fixtures/club_pages): valeurs attendues"""
+    corpus_dir = os.path.join(os.path.dirname(__file__), 'fixtures', 'club_pages')
+    with open(os.path.join(corpus_dir, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    parser = ClubPageParser()
+    for name, values in expected.items():
+        if name.endswith('.json'):
+            continue
+        with open(os.path.join(corpus_dir, f"{name}.html"), encoding='utf-8') as f:
+            club = parser.parse(f.read(), URL)
+        if values is None:
+            assert club is None, name
+        else:
+            assert {field: getattr(club, field) for field in values} == values, name
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
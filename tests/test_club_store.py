@@ -0,0 +1,113 @@
+"""
+Tests de la base SQLite des clubs (upserts groupés, suppressions, recherches indexées)
+"""
+
+import sys
+import os
+import sqlite3
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from club_data import STATUS_ABSENT, STATUS_ERROR, STATUS_FOUND, ClubData, ScrapeResult
+from club_store import ClubStore, email_domain, postcode
+from record_log import RecordLog
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def _club(nom: str, affiliation: str, email: str, adresse: str) -> ClubData:
+    return ClubData(nom=nom, numero_affiliation=affiliation, email=email, telephone='05 56 00 00 00',
+                    adresse=adresse, url_detail='https://gironde.fff.fr/recherche-clubs?scl=1')
+
+
+def test_champs_derives():
+    assert email_domain('Contact@Club-Foot.FR') == 'club-foot.fr'
+    assert email_domain(None) is None and email_domain('pas un email') is None
+    assert postcode('12 rue des Sports - 33000 - BORDEAUX') == '33000'
+    assert postcode('Stade 1 - 75012 PARIS 12345') == '12345'
+    assert postcode('') is None
+
+
+def test_upserts_groupes_et_suppressions():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clubs.db')
+        store = ClubStore(path, batch_size=3, commit_interval=3600)
+        store.record(ScrapeResult(1, STATUS_FOUND, _club('ES Bordeaux', '500650', 'es@orange.fr',
+                                                          '1 rue A 33000 BORDEAUX')), elapsed=0.8)
+        store.record(ScrapeResult(2, STATUS_FOUND, _club('FC Paris', '500651', 'fc@gmail.com', '75012 PARIS')))
+
+        # Pas encore de transaction: rien de visible pour un autre lecteur
+        reader = sqlite3.connect(path)
+        assert reader.execute('SELECT COUNT(*) FROM clubs').fetchone()[0] == 0
+        store.record(ScrapeResult(1, STATUS_FOUND, _club('ES Bordeaux Nord', '500650', 'es@orange.fr',
+                                                          '1 rue A 33300 BORDEAUX')))  # 3e: lot écrit
+        assert reader.execute('SELECT COUNT(*) FROM clubs').fetchone()[0] == 2
+        assert store.commits == 1
+
+        store.record(ScrapeResult(2, STATUS_ABSENT))
+        store.record(ScrapeResult(3, STATUS_ERROR, error='page non reconnue'))  # ignoré
+        store.upsert_row({'scl': '4', 'nom': '', 'numero_affiliation': ''})  # ligne vide: suppression
+        store.upsert_row({'scl': '2', 'nom': 'FC Paris', 'numero_affiliation': '500651',
+                          'email': 'fc@GMAIL.com', 'temps_extraction': '1.25'})  # retrouvé dans le même lot
+        store.close()
+
+        store = ClubStore(path)
+        club = store.get(1)
+        # La dernière version l'emporte entièrement (pas de durée mesurée pour celle-ci)
+        assert (club['nom'], club['code_postal'], club['temps_extraction']) == ('ES Bordeaux Nord', '33300', None)
+        assert store.get(2)['temps_extraction'] == 1.25 and store.get(2)['fetched_at'] > 0
+        assert [row['scl'] for row in store.find_by_email_domain('gmail.com')] == [2]
+        assert [row['scl'] for row in store.find_by_affiliation(500650)] == [1]
+        assert [row['scl'] for row in store.find_by_postcode('33300')] == [1]
+        assert store.count() == 2
+        store.close()
+        reader.close()
+
+
+def test_recherches_indexees():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clubs.db')
+        with ClubStore(path) as store:
+            for scl in range(1, 2001):
+                store.upsert_row({'scl': scl, 'nom': f"Club {scl}", 'numero_affiliation': str(500000 + scl),
+                                  'email': f"club{scl}@d{scl % 7}.fr", 'adresse': f"{scl} rue X {33000 + scl % 50} VILLE"})
+            assert store.commits >= 4
+            assert store.db.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            for column, index in (('numero_affiliation', 'clubs_affiliation'), ('email_domain', 'clubs_email_domain'),
+                                  ('code_postal', 'clubs_code_postal')):
+                plan = ' '.join(row[-1] for row in store.db.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM clubs WHERE {column} = ?", ('x',)))
+                assert f"USING INDEX {index}" in plan, plan
+            assert len(store.find_by_email_domain('d3.fr')) == len(range(3, 2001, 7))
+            assert store.find_by_affiliation('501234')[0]['scl'] == 1234
+
+
+def test_import_csv():
+    """Import du CSV de scrape_range.py, journal non compacté compris"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '10', 'nom': 'AS Test', 'numero_affiliation': '123', 'email': 'as@test.fr',
+                    'adresse': '2 place 33000 BORDEAUX', 'temps_extraction': '0.50'})
+        log.append({'scl': '11', 'nom': '', 'temps_extraction': '0.20'})
+        log.close(compact=True)
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '12', 'nom': 'US Journal', 'numero_affiliation': '124'})
+        log.close(compact=False)
+
+        database = os.path.join(directory, 'clubs.db')
+        completed = subprocess.run([sys.executable, os.path.join(SRC_DIR, 'club_store.py'), database,
+                                    '--import', output, '--affiliation', '124'],
+                                   capture_output=True, text=True, check=True)
+        assert 'US Journal' in completed.stdout
+        with ClubStore(database) as store:
+            assert store.count() == 2 and store.get(10)['code_postal'] == '33000'
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
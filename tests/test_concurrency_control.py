@@ -0,0 +1,71 @@
+"""
+Tests du contrôle adaptatif de la concurrence (AIMD)
+"""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from concurrency_control import AIMDController, InFlightGate
+
+
+def test_hausse_additive_baisse_multiplicative():
+    controller = AIMDController(initial=4, max_limit=6, target_p95=1.0, window=10)
+    for _ in range(30):
+        controller.record(0.2)
+    assert controller.limit == 6  # +1 par fenêtre, plafonné
+    for _ in range(10):
+        controller.record(2.5)  # p95 au-dessus de la cible
+    assert controller.limit == 3
+    decisions = controller.drain_decisions()
+    assert decisions[0].startswith('📈 Concurrence 4 → 5')
+    assert decisions[-1].startswith('📉 Concurrence 6 → 3')
+    assert controller.drain_decisions() == []
+
+
+def test_baisse_immediate_sur_timeouts():
+    controller = AIMDController(initial=8, max_limit=8, window=40, max_timeout_rate=0.05)
+    for _ in range(5):
+        controller.record(0.1)
+    for _ in range(3):
+        controller.record(5.0, timed_out=True)  # 3 > 5% de 40: inutile d'attendre la fenêtre
+    assert controller.limit == 4
+    assert controller.decreases == 1
+
+
+def test_porte_limite_les_taches_en_cours():
+    controller = AIMDController(initial=2, max_limit=4)
+    gate = InFlightGate(controller)
+    peak = 0
+    lock = threading.Lock()
+    running = []
+
+    def run(task):
+        nonlocal peak
+        with lock:
+            running.append(task)
+            peak = max(peak, len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(task)
+        gate.done()
+
+    threads = []
+    for task in gate.gate(range(20)):
+        thread = threading.Thread(target=run, args=(task,))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    assert peak <= 2
+    assert gate.in_flight == 0
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            func()
+            print(f"✅ {name}")
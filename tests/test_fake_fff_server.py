@@ -0,0 +1,206 @@
+"""
+Tests du faux site FFF et des scrapers sans navigateur qui l'interrogent
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import threading
+import tempfile
+
+import requests
+
+import scraper_by_scl
+from club_data import STATUS_FOUND, ClubData, ScrapeResult
+from club_page_parser import ClubPageParser
+from fake_fff_server import FakeFFFServer, FakeServerConfig, generate_valid_scls, parse_latency
+from negative_cache import NegativeCache
+from retry_queue import RetryPolicy
+from scraper_by_scl_http import HttpSCLScraper
+
+
+def test_carte_creuse_deterministe():
+    """Même graine, même carte; des blocs vides et des blocs denses"""
+    valid = generate_valid_scls(3000, block_size=100, seed=7)
+    assert valid == generate_valid_scls(3000, block_size=100, seed=7)
+    per_block = [sum(1 for scl in range(start, start + 100) if scl in valid) for start in range(1, 3001, 100)]
+    assert min(per_block) == 0
+    assert max(per_block) > 50
+
+
+def test_pages_et_api():
+    """Pages club/absent parsables, API 200/404, scraper HTTP de bout en bout"""
+    config = FakeServerConfig(valid_scls={3, 5, 8}, latency='uniform:1:3')
+    with FakeFFFServer(config=config) as server:
+        page = requests.get(f"{server.base_url}/recherche-clubs?scl=5", timeout=5)
+        club = ClubPageParser().parse(page.text, page.url)
+        assert club.nom == "US CLUB NUMERO 5"
+        assert club.numero_affiliation == "500005"
+        assert club.email == "contact5@club.fr"
+
+        absent = requests.get(f"{server.base_url}/recherche-clubs?scl=4", timeout=5)
+        assert ClubPageParser().parse(absent.text, absent.url) is None
+        assert requests.get(f"{server.base_url}/api/clubs/4", timeout=5).status_code == 404
+
+        with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False) as scraper:
+            clubs = scraper.scrape_scls(range(1, 11), server.base_url, workers=4)
+        assert [c.nom for c in clubs] == [f"US CLUB NUMERO {scl}" for scl in (3, 5, 8)]
+        assert scraper.stats['absent'] == 7
+
+
+def test_erreurs_et_rafales():
+    """5xx aléatoires et rafales de 503"""
+    with FakeFFFServer(config=FakeServerConfig(valid_scls={1}, error_rate=1.0)) as server:
+        assert requests.get(f"{server.base_url}/api/clubs/1", timeout=5).status_code in (500, 502, 503)
+        assert server.stats.errors == 1
+    with FakeFFFServer(config=FakeServerConfig(valid_scls={1}, burst_every=60, burst_duration=60)) as server:
+        assert requests.get(f"{server.base_url}/api/clubs/1", timeout=5).status_code == 503
+        assert server.stats.bursts == 1
+
+
+class _ThreadBoundScraper:
+    """Remplace SCLScraper: comme Playwright sync, refuse tout appel depuis un autre thread"""
+    instances = []
+
+    def __init__(self, **options):
+        self.thread = None
+        self.closed = False
+        _ThreadBoundScraper.instances.append(self)
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        return self
+
+    def _check_thread(self):
+        if threading.get_ident() != self.thread:
+            raise RuntimeError("cannot switch to a different thread")
+
+    def fetch_club(self, scl, base_url):
+        self._check_thread()
+        return ScrapeResult(scl, STATUS_FOUND, ClubData(nom=f"NAVIGATEUR {scl}"))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._check_thread()
+        self.closed = True
+
+
+def test_repli_navigateur_dans_son_thread():
+    """Repli appelé depuis plusieurs threads: un seul navigateur, utilisé et fermé dans son thread"""
+    original, scraper_by_scl.SCLScraper = scraper_by_scl.SCLScraper, _ThreadBoundScraper
+    _ThreadBoundScraper.instances = []
+    try:
+        # Réponses 200 non reconnues: tous les scl passent par le navigateur
+        with FakeFFFServer(config=FakeServerConfig(valid_scls=set(range(1, 21)))) as server:
+            with HttpSCLScraper(api_url_template=server.base_url + '/recherche-clubs?scl={scl}') as scraper:
+                clubs = scraper.scrape_scls(range(1, 21), server.base_url, workers=8)
+    finally:
+        scraper_by_scl.SCLScraper = original
+    assert [c.nom for c in clubs] == [f"NAVIGATEUR {scl}" for scl in range(1, 21)]
+    assert scraper.stats['fallback'] == 20
+    assert len(_ThreadBoundScraper.instances) == 1 and _ThreadBoundScraper.instances[0].closed
+
+
+def test_404_absence_apres_confirmation():
+    """404 d'un endpoint jamais vu répondre: pas d'absence en cache, repli navigateur s'il est permis"""
+    with tempfile.TemporaryDirectory() as directory:
+        with FakeFFFServer(config=FakeServerConfig(valid_scls=set())) as server:
+            cache = NegativeCache(os.path.join(directory, 'cache.tsv'))
+            with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False, negative_cache=cache,
+                                retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01)) as scraper:
+                assert scraper.scrape_scls(range(1, 6), server.base_url, workers=2) == []
+            cache.close()
+        assert not cache.entries and scraper.stats['absent'] == 0
+        assert sorted(scraper.retry_queue.given_up) == [1, 2, 3, 4, 5]
+
+    original, scraper_by_scl.SCLScraper = scraper_by_scl.SCLScraper, _ThreadBoundScraper
+    try:
+        with FakeFFFServer(config=FakeServerConfig(valid_scls={5})) as server:
+            with HttpSCLScraper(api_url_template=server.api_url_template) as scraper:
+                scraper.scrape_scls(range(1, 11), server.base_url, workers=1)
+    finally:
+        scraper_by_scl.SCLScraper = original
+    # 1-4 avant le premier club reconnu: navigateur; 6-10 ensuite: absents
+    assert scraper.stats['fallback'] == 4 and scraper.stats['absent'] == 5
+
+
+def test_reprise_du_scraper_http():
+    """Point de reprise: absences notées au fil de l'eau et sautées à la relance, clubs retestés"""
+    from scan_checkpoint import ABSENT, PENDING, ScanCheckpoint
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clubs.json.ckpt')
+        with FakeFFFServer(config=FakeServerConfig(valid_scls={2, 5})) as server:
+            checkpoint = ScanCheckpoint(path)
+            with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False) as scraper:
+                scraper.scrape_range(1, 6, server.base_url, workers=2, checkpoint=checkpoint)
+            # Clubs non marqués: la sortie JSON n'est écrite qu'en fin de plage
+            assert [checkpoint.get(scl) for scl in range(1, 7)] == [ABSENT, PENDING, ABSENT, ABSENT, PENDING, ABSENT]
+            checkpoint.close()
+
+            checkpoint = ScanCheckpoint(path)
+            assert checkpoint.resumed
+            with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False) as scraper:
+                clubs = scraper.scrape_range(1, 6, server.base_url, workers=2, checkpoint=checkpoint)
+            checkpoint.close()
+        assert [club.nom for club in clubs] == ["US CLUB NUMERO 2", "US CLUB NUMERO 5"]
+        assert scraper.stats['absent'] == 0 and scraper.stats['api'] == 2
+
+
+class _FakePayload:
+    def __init__(self, status, body):
+        self.status, self.body = status, body
+
+    def text(self):
+        return str(self.body)
+
+    def json(self):
+        return self.body
+
+
+class _AbsentPage:
+    def content(self):
+        return '<html></html>'
+
+
+def test_404_xhr_navigateur_apres_confirmation():
+    """SCLScraper en xhr: un 404 avant tout club reconnu repasse par le DOM, pas par le cache négatif"""
+    from page_readiness import READY_ABSENT, ReadinessResult
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = NegativeCache(os.path.join(directory, 'cache.tsv'))
+        scraper = scraper_by_scl.SCLScraper(extraction_strategy='xhr', negative_cache=cache)
+        responses = [_FakePayload(404, {'error': 'not found'}),
+                     _FakePayload(200, {'nom': 'US Deux', 'numero_affiliation': '500002'}),
+                     _FakePayload(404, {'error': 'not found'})]
+        scraper._goto_capturing_payload = lambda url, scl: (None, responses.pop(0))
+        waits = []
+        scraper.readiness.wait = lambda page, url: waits.append(url) or ReadinessResult(READY_ABSENT, 0.0)
+        scraper.page = _AbsentPage()
+
+        assert scraper._fetch_from(1, 'http://fff.test').status != STATUS_FOUND
+        assert len(waits) == 1 and scraper.extraction_stats == {'xhr': 0, 'dom': 1}
+        assert scraper._fetch_from(2, 'http://fff.test').status == STATUS_FOUND
+        # Endpoint confirmé: le 404 suffit, sans attente du DOM
+        assert scraper._fetch_from(3, 'http://fff.test').status != STATUS_FOUND
+        assert len(waits) == 1 and scraper.extraction_stats == {'xhr': 1, 'dom': 1}
+        cache.close()
+
+
+def test_latence():
+    assert parse_latency('fixed:50')(None) == 0.05
+    try:
+        parse_latency('gamma:1')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("distribution inconnue acceptée")
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
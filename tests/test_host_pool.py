@@ -0,0 +1,90 @@
+"""
+Tests de la répartition des requêtes entre hôtes de district (tourniquet, moins chargé, éjection)
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from host_pool import HostPool, load_hosts
+
+HOSTS = ['https://gironde.fff.fr', 'https://ain.fff.fr', 'https://sarthe.fff.fr']
+
+
+def test_chargement_districts():
+    example = os.path.join(os.path.dirname(__file__), '..', 'data', 'districts_urls.json.example')
+    assert load_hosts(example) == ['https://gironde.fff.fr', 'https://paris-idf.fff.fr', 'https://sarthe.fff.fr']
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'districts.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'A': 'https://ain.fff.fr/les-clubs/', 'B': 'https://ain.fff.fr/', 'C': 'pas une url'}, f)
+        assert load_hosts(path) == ['https://ain.fff.fr']
+
+
+def test_tourniquet():
+    pool = HostPool(HOSTS, strategy='round-robin', seed=1)
+    picks = []
+    for _ in range(9):
+        host = pool.acquire()
+        pool.release(host, 0.5)
+        picks.append(host)
+    assert Counter(picks) == {host: 3 for host in HOSTS}
+    assert picks[:3] == picks[3:6]
+
+
+def test_moins_charge_evite_l_hote_lent():
+    pool = HostPool(HOSTS, strategy='least-loaded', seed=2)
+    picks = Counter()
+    for _ in range(300):
+        host = pool.acquire()
+        pool.release(host, 3.0 if host == 'https://ain.fff.fr' else 0.3)
+        picks[host] += 1
+    # L'hôte lent reçoit moins de requêtes, mais la charge reste répartie
+    assert picks['https://ain.fff.fr'] < picks['https://gironde.fff.fr'] / 2
+    assert abs(picks['https://gironde.fff.fr'] - picks['https://sarthe.fff.fr']) < 60
+    assert 'least-loaded' in pool.summary()
+
+    # Latence oubliée avec le temps: l'hôte lent est réessayé
+    pool.decay_time = 0.01
+    time.sleep(0.1)
+    retried = set()
+    for _ in range(10):
+        host = pool.acquire()
+        pool.release(host, 0.3)
+        retried.add(host)
+    assert 'https://ain.fff.fr' in retried
+
+
+def test_ejection_et_reintegration():
+    pool = HostPool(HOSTS[:2], strategy='round-robin', max_failures=2, ejection_time=0.2, seed=3)
+    bad, good = 'https://gironde.fff.fr', 'https://ain.fff.fr'
+    pool.hosts[bad].in_flight = 2
+    pool.release(bad, 5.0, failed=True)
+    pool.release(bad, 5.0, failed=True)
+    assert pool.hosts[bad].ejections == 1
+    assert {pool.acquire() for _ in range(4)} == {good}
+
+    # Le dernier hôte disponible n'est jamais écarté
+    for _ in range(5):
+        pool.release(good, 5.0, failed=True)
+    assert pool.hosts[good].ejections == 0
+
+    # Réintégré après l'éjection, à l'essai: un échec suffit à l'écarter deux fois plus longtemps
+    time.sleep(0.25)
+    pool.release(good, 0.1)
+    assert bad in {pool.acquire() for _ in range(2)}
+    pool.release(bad, 5.0, failed=True)
+    assert pool.hosts[bad].ejections == 2
+    assert pool.hosts[bad].ejected_until - time.time() > 0.3
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
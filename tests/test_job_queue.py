@@ -0,0 +1,130 @@
+"""
+Tests de la file de blocs scl (bails, expiration, coordinateur HTTP, workers concurrents)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from job_queue import JOB_DONE, JOB_FAILED, JOB_LEASED, JOB_PENDING, JobQueue, JobServer, LeaseKeeper, RemoteJobQueue
+import scrape_queue
+
+
+def test_bails_exclusifs():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'))
+        assert queue.populate(1, 1250, block_size=500) == 3
+        assert queue.populate(1, 1250, block_size=500) == 0  # déjà présents
+
+        first, second, third = (queue.lease(f"w{i}") for i in range(3))
+        assert [(job.start, job.end) for job in (first, second, third)] == [(1, 500), (501, 1000), (1001, 1250)]
+        assert queue.lease('w3') is None
+
+        assert queue.complete(first, found=12, tested=500)
+        status = queue.status()
+        assert (status[JOB_DONE], status[JOB_LEASED], status['found'], status['tested']) == (1, 2, 12, 500)
+        assert "1/3 blocs terminés" in queue.summary()
+
+
+def test_bail_expire_redonne():
+    """Worker mort: son bloc est redonné, et l'ancien worker l'apprend à son battement"""
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'), lease_seconds=0.2)
+        queue.populate(1, 100, block_size=100)
+        dead = queue.lease('mort')
+        assert queue.lease('vivant') is None
+
+        time.sleep(0.3)
+        assert queue.status()['expired'] == 1
+        alive = queue.lease('vivant')
+        assert (alive.start, alive.attempts) == (1, 2)
+        assert not queue.heartbeat(dead)
+        assert queue.heartbeat(alive)
+
+        # Le bail renouvelé en arrière-plan survit à plusieurs durées de bail
+        with LeaseKeeper(queue, alive, interval=0.05) as keeper:
+            time.sleep(0.5)
+        assert not keeper.lost and queue.lease('autre') is None
+        # Résultat tardif de l'ancien worker: enregistré, mais signalé
+        assert not queue.complete(dead, found=3, tested=100)
+        assert queue.status()[JOB_DONE] == 1
+
+
+def test_rendu_et_echec():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'), lease_seconds=0.05, max_attempts=2)
+        queue.populate(1, 10, block_size=10)
+
+        # Rendu proprement: repris tout de suite, sans consommer de tentative
+        job = queue.lease('w1')
+        assert queue.release(job)
+        assert queue.lease('w2').attempts == 1
+
+        # Deux bails expirés sans résultat: le bloc passe en échec
+        time.sleep(0.1)
+        assert queue.lease('w3').attempts == 2
+        time.sleep(0.1)
+        assert queue.lease('w4') is None
+        status = queue.status()
+        assert (status[JOB_FAILED], status[JOB_PENDING], status[JOB_LEASED]) == (1, 0, 0)
+
+
+def test_coordinateur_http():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, 'jobs.db'), lease_seconds=30)
+        queue.populate(1, 200, block_size=100)
+        with JobServer(queue, host='127.0.0.1', port=0) as server:
+            remote = RemoteJobQueue(server.url)
+            job = remote.lease('distant')
+            assert (job.start, job.end, job.worker) == (1, 100, 'distant')
+            expires = job.lease_expires
+            time.sleep(0.01)
+            assert remote.heartbeat(job) and job.lease_expires > expires
+            other = remote.lease('distant2')
+            assert remote.release(other)
+            assert remote.complete(job, found=7, tested=100, errors=1)
+            assert remote.status()[JOB_DONE] == 1 and remote.status()['found'] == 7
+            assert "1/2 blocs terminés" in remote.summary()
+
+
+def test_workers_concurrents():
+    """Quatre workers vident la file: chaque numéro est traité une seule fois"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.db')
+        JobQueue(path).populate(1, 2000, block_size=100)
+        scraped = []
+        lock = threading.Lock()
+
+        def fake_scrape_range(start, end, output_csv, **options):
+            time.sleep(0.01)
+            with lock:
+                scraped.extend(range(start, end + 1))
+            return {'found': 1, 'tested': end - start + 1, 'errors': 0, 'interrupted': False}
+
+        original = scrape_queue.scrape_range
+        scrape_queue.scrape_range = fake_scrape_range
+        try:
+            workers = [threading.Thread(target=scrape_queue.work, args=(path, os.path.join(directory, f'w{i}.csv')),
+                                        kwargs={'worker': f'w{i}'}) for i in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            scrape_queue.scrape_range = original
+
+        assert sorted(scraped) == list(range(1, 2001))
+        status = JobQueue(path).status()
+        assert (status[JOB_DONE], status['found'], status['tested']) == (20, 20, 2000)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
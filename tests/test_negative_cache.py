@@ -0,0 +1,85 @@
+"""
+Tests du cache négatif des scl sans club
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_fff_server import FakeFFFServer, FakeServerConfig
+from negative_cache import NegativeCache
+from retry_queue import RetryPolicy
+from scraper_by_scl_http import HttpSCLScraper
+
+
+def test_ttl_annulation_et_compactage():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.tsv')
+        cache = NegativeCache(path, ttl_days=1)
+        cache.add(10)
+        cache.add(11, timestamp=time.time() - 2 * 86400)  # expirée
+        cache.add(12)
+        cache.discard(12)
+        cache.close()
+
+        cache = NegativeCache(path, ttl_days=1)
+        assert cache.filter(range(9, 14)) == [9, 11, 12, 13]
+        assert cache.skipped == 1
+
+        cache.compact()
+        with open(path, encoding='utf-8') as f:
+            assert [line.split('\t')[0] for line in f] == ['10']
+
+
+def test_compaction_partagee():
+    """Deux workers sur le même fichier: la compaction de l'un ne perd pas les ajouts de l'autre"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.tsv')
+        first, second = NegativeCache(path), NegativeCache(path)
+        first.add(1)
+        second.add(2)
+        second.discard(2)
+        second.add(3)
+        first.compact()  # le premier n'a jamais vu 2 ni 3 en mémoire
+        assert sorted(first.entries) == [1, 3]
+        # Le second écrit encore dans l'ancien fichier: il rouvre le nouveau
+        second.add(4)
+        second.compact()
+        first.add(5)
+        first.close()
+        second.close()
+        assert sorted(NegativeCache(path).entries) == [1, 3, 4, 5]
+
+
+def test_absences_confirmees_seulement():
+    """404 mis en cache, erreurs 5xx non; la relance ne re-teste que l'inconnu"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.tsv')
+        with FakeFFFServer(config=FakeServerConfig(valid_scls={2})) as server:
+            cache = NegativeCache(path)
+            with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False,
+                                negative_cache=cache) as scraper:
+                scraper.scrape_range(1, 5, server.base_url, workers=2)
+            cache.close()
+            assert sorted(cache.entries) == [1, 3, 4, 5]
+
+        with FakeFFFServer(config=FakeServerConfig(valid_scls={2}, error_rate=1.0)) as server:
+            cache = NegativeCache(path)
+            # Une seule tentative: les reprises des 5xx sont testées dans test_retry_queue
+            with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False,
+                                negative_cache=cache, retry_policy=RetryPolicy(max_attempts=1)) as scraper:
+                scraper.scrape_range(1, 8, server.base_url, workers=2)
+            cache.close()
+            assert server.stats.requests == 4  # 2, 6, 7, 8
+            assert sorted(cache.entries) == [1, 3, 4, 5]
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,63 @@
+"""
+Tests de l'archive compressée des pages
+"""
+
+import sys
+import os
+import tempfile
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from page_archive import ArchiveReader, PageArchive
+
+BOILERPLATE = "\n".join(f'<script src="/assets/chunk-{i}.js"></script>' for i in range(200))
+
+
+def page(scl: int) -> str:
+    return f"<html><head>{BOILERPLATE}</head><body><app-club><h1>CLUB {scl}</h1></app-club></body></html>"
+
+
+def test_aller_retour_et_derniere_version():
+    """Pages relues à l'identique; la dernière version d'un scl gagne"""
+    with tempfile.TemporaryDirectory() as directory:
+        with PageArchive(directory, train_samples=4) as archive:
+            for scl in range(1, 21):
+                archive.add(scl, f"https://gironde.fff.fr/recherche-clubs?scl={scl}", 'club', page(scl))
+            archive.add(3, "https://api/clubs/3", '404', '{"error": "not found"}', content_type='json')
+            assert archive.dictionary
+
+        reader = ArchiveReader(directory)
+        # Le dictionnaire partagé compresse bien mieux que zlib page par page
+        with_dict = [e for e in reader.entries() if e['dict'] and e['type'] == 'html']
+        assert max(e['len'] for e in with_dict) * 2 < len(zlib.compress(page(20).encode()))
+        pages = {p.scl: p for p in reader.iter_pages()}
+        assert len(pages) == 20
+        assert pages[7].content == page(7)
+        assert pages[7].status == 'club'
+        assert pages[3].content_type == 'json'
+        assert reader.get(3).status == '404'
+        assert len(reader.entries(latest_only=False)) == 21
+
+
+def test_segments_et_reprise():
+    """Nouveau segment au-delà de la taille maximale; reprise en ajout"""
+    with tempfile.TemporaryDirectory() as directory:
+        with PageArchive(directory, segment_size=2000, train_samples=2) as archive:
+            for scl in range(1, 11):
+                archive.add(scl, "u", 'club', page(scl) + str(os.urandom(400)))
+        with PageArchive(directory, segment_size=2000) as archive:
+            archive.add(11, "u", 'absent', page(11))
+
+        segments = [name for name in os.listdir(directory) if name.endswith('.seg')]
+        assert len(segments) > 1
+        pages = list(ArchiveReader(directory).iter_pages())
+        assert [p.scl for p in pages] == list(range(1, 12))
+        assert pages[-1].content == page(11)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,145 @@
+"""
+Tests de l'export Parquet (schéma typé, dictionnaires, groupes de lignes, conversion du CSV)
+"""
+
+import sys
+import os
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# pyarrow est optionnel: sans lui, ces tests sont signalés comme sautés (pas comme réussis)
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+import parquet_export
+from club_data import STATUS_ABSENT, STATUS_FOUND, ClubData, ScrapeResult
+from parquet_export import ParquetSink, departement, export_csv, read_columns, run_file_path
+from record_log import RecordLog
+
+
+def test_departement():
+    assert departement('33000') == '33'
+    assert departement('97400') == '974'
+    assert departement(None) is None
+
+
+def test_sans_pyarrow():
+    """pyarrow absent: erreur explicite dès l'ouverture, pas en fin de scraping"""
+    saved, parquet_export.pa = parquet_export.pa, None
+    try:
+        ParquetSink('clubs.parquet')
+    except ImportError as e:
+        assert 'pip install pyarrow' in str(e)
+    else:
+        raise AssertionError("ParquetSink sans pyarrow")
+    finally:
+        parquet_export.pa = saved
+
+
+def test_ecriture_par_groupes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clubs.parquet')
+        with ParquetSink(path, row_group_size=100) as sink:
+            for scl in range(1, 251):
+                club = ClubData(nom=f"Club {scl}", numero_affiliation=str(500000 + scl),
+                                email=f"club{scl}@{'orange' if scl % 2 else 'gmail'}.fr",
+                                adresse=f"{scl} rue X {33000 + scl % 3} VILLE")
+                sink.record(ScrapeResult(scl, STATUS_FOUND, club), elapsed=0.5)
+                if scl == 150:
+                    # Premier groupe écrit au fil du scraping, fichier final pas encore en place
+                    assert sink.row_groups == 1 and not os.path.exists(path)
+            sink.record(ScrapeResult(251, STATUS_ABSENT))
+            sink.write_row({'scl': '252', 'nom': ''})
+        assert sink.rows == 250 and sink.row_groups == 3
+
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_row_groups == 3 and metadata.num_rows == 250
+        columns = {metadata.schema.column(i).name: i for i in range(metadata.num_columns)}
+        encodings = metadata.row_group(0).column(columns['email_domain']).encodings
+        assert any('DICTIONARY' in encoding for encoding in encodings)
+
+        table = read_columns(path, ['scl', 'numero_affiliation', 'departement'])
+        assert table.column_names == ['scl', 'numero_affiliation', 'departement']
+        assert table.schema.field('scl').type == pa.int32()
+        assert table.schema.field('numero_affiliation').type == pa.int64()
+        assert table.column('numero_affiliation')[0].as_py() == 500001
+        assert set(table.column('departement').to_pylist()) == {'33'}
+
+
+def test_export_du_csv():
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '7', 'nom': 'AS Sept', 'numero_affiliation': 'inconnu', 'telephone': '',
+                    'temps_extraction': '1.50'})
+        log.append({'scl': '3', 'nom': '', 'temps_extraction': '0.20'})
+        log.close(compact=True)
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '5', 'nom': 'US Cinq', 'numero_affiliation': '42', 'adresse': '97400 SAINT-DENIS'})
+        log.close(compact=False)
+
+        path = os.path.join(directory, 'clubs.parquet')
+        sink = export_csv(output, path)
+        assert sink.rows == 2
+        rows = read_columns(path, ['scl', 'numero_affiliation', 'telephone', 'departement',
+                                   'temps_extraction']).to_pylist()
+        assert rows == [
+            {'scl': 5, 'numero_affiliation': 42, 'telephone': None, 'departement': '974', 'temps_extraction': None},
+            {'scl': 7, 'numero_affiliation': None, 'telephone': None, 'departement': None, 'temps_extraction': 1.5},
+        ]
+
+
+def test_fusion_du_run():
+    """Clubs du run pris dans le fichier annexe, fetched_at repris de chaque enregistrement"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        path = os.path.join(directory, 'clubs.parquet')
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '1', 'nom': 'AS Un'})
+        log.append({'scl': '2', 'nom': 'US Deux'})
+        log.close(compact=True)
+        # Export précédent: seul le scl 1 y a une date connue
+        with ParquetSink(path) as sink:
+            sink.write_row({'scl': '1', 'nom': 'AS Un'}, fetched_at=1000.0)
+
+        log = RecordLog(output, check_interval=0)
+        with ParquetSink(run_file_path(path)) as run_sink:
+            club = ClubData(nom='FC Trois', numero_affiliation='3')
+            log.append({'scl': '3', 'nom': club.nom, 'numero_affiliation': '3'})
+            run_sink.record(ScrapeResult(3, STATUS_FOUND, club), elapsed=0.5)
+            # Club disparu pendant le run: l'absence enregistrée l'emporte
+            log.append({'scl': '2', 'nom': ''})
+        log.close(compact=False)
+
+        sink = export_csv(output, path, run_file=run_sink.path)
+        assert sink.rows == 2 and not os.path.exists(run_sink.path)
+        rows = read_columns(path, ['scl', 'temps_extraction', 'fetched_at']).to_pylist()
+        assert [row['scl'] for row in rows] == [1, 3]
+        assert rows[0]['fetched_at'].timestamp() == 1000.0
+        assert rows[1]['temps_extraction'] == 0.5 and rows[1]['fetched_at'].timestamp() > 1000.0
+
+
+def test_interruption_garde_l_export_precedent():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'clubs.parquet')
+        with ParquetSink(path) as sink:
+            sink.write_row({'scl': '1', 'nom': 'AS Un'})
+        try:
+            with ParquetSink(path) as sink:
+                sink.write_row({'scl': '2', 'nom': 'US Deux'})
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+        # Export partiel laissé dans le .tmp, l'export complet précédent reste en place
+        assert read_columns(path, ['scl']).column('scl').to_pylist() == [1]
+        assert os.path.exists(path + '.tmp')
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,70 @@
+"""
+Tests du limiteur de débit par hôte (seau à jetons)
+"""
+
+import sys
+import os
+import asyncio
+import multiprocessing
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limit import RateLimiter
+
+
+def test_threads_et_hotes_separes():
+    limiter = RateLimiter(rate=50, burst=1)
+    started = time.time()
+    threads = [threading.Thread(target=lambda: [limiter.acquire("https://gironde.fff.fr/x") for _ in range(5)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 20 requêtes, 1 d'avance: au moins 19 intervalles de 20 ms
+    assert time.time() - started >= 19 / 50 - 0.02
+    # Autre hôte: seau plein, pas d'attente
+    assert limiter.reserve("https://ain.fff.fr/x") == 0
+    assert RateLimiter(1, per_domain=True).key("https://ain.fff.fr/x") == 'fff.fr'
+
+
+def test_asyncio():
+    limiter = RateLimiter(rate=100, burst=2)
+
+    async def run():
+        await asyncio.gather(*(limiter.acquire_async("http://127.0.0.1:8000/") for _ in range(12)))
+
+    started = time.time()
+    asyncio.run(run())
+    assert time.time() - started >= 10 / 100 - 0.02
+    assert limiter.delayed == 10
+
+
+def _acquire_in_process(state_dir, count):
+    limiter = RateLimiter(rate=40, burst=1, state_dir=state_dir)
+    for _ in range(count):
+        limiter.acquire("https://gironde.fff.fr/recherche-clubs")
+    limiter.close()
+
+
+def test_partage_entre_processus():
+    with tempfile.TemporaryDirectory() as state_dir:
+        processes = [multiprocessing.Process(target=_acquire_in_process, args=(state_dir, 6)) for _ in range(3)]
+        started = time.time()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        # Un seul seau pour les 3 processus: 18 requêtes à 40/s
+        assert time.time() - started >= 17 / 40 - 0.02
+        assert os.listdir(state_dir) == ['gironde.fff.fr.bucket']
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            func()
+            print(f"✅ {name}")
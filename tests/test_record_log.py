@@ -0,0 +1,117 @@
+"""
+Tests du journal d'ajouts de la sortie CSV (dernière ligne gagnante, arrêt brutal, compaction)
+"""
+
+import sys
+import os
+import csv
+import multiprocessing
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from record_log import RecordLog, read_records
+
+
+def _row(scl: int, nom: str = '') -> dict:
+    return {'scl': str(scl), 'nom': nom, 'numero_affiliation': '', 'email': '', 'telephone': '',
+            'adresse': '', 'url_detail': '', 'temps_extraction': '0.10'}
+
+
+def _read_csv(path: str) -> list:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def _crash_after_appends(output: str):
+    log = RecordLog(output, check_interval=0, sync_interval=3600)
+    for scl in range(100, 200):
+        log.append(_row(scl, f"Club {scl}"))
+    log._file.write('150,"Club tronqué\n')  # ligne interrompue en pleine écriture
+    log._file.flush()
+    os._exit(1)
+
+
+def test_derniere_ligne_gagnante():
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, check_interval=0)
+        log.append(_row(3, 'Ancien nom'))
+        log.append(_row(1, 'Club A'))
+        log.append(_row(3, 'Nouveau nom, "cité"\nsur deux lignes'))
+        assert read_records(output)[3]['nom'] == 'Nouveau nom, "cité"\nsur deux lignes'
+        log.close()  # premier run: le CSV est créé
+        rows = _read_csv(output)
+        assert [(row['scl'], row['nom']) for row in rows] == [('1', 'Club A'), ('3', 'Nouveau nom, "cité"\nsur deux lignes')]
+        assert not os.path.exists(output + '.log')
+
+        # Petit rafraîchissement: le CSV n'est pas réécrit, le journal suffit
+        log = RecordLog(output, check_interval=0)
+        log.append(_row(1, 'Club A renommé'))
+        log.close()
+        assert _read_csv(output)[0]['nom'] == 'Club A'
+        assert read_records(output)[1]['nom'] == 'Club A renommé'
+        assert 'en attente de compaction' in log.summary()
+
+        log = RecordLog(output, check_interval=0)
+        log.close(compact=True)
+        assert _read_csv(output)[0]['nom'] == 'Club A renommé'
+        assert not os.path.exists(output + '.log')
+
+
+def test_arret_brutal_puis_compaction():
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, check_interval=0)
+        log.append(_row(150, 'Avant'))
+        log.close(compact=True)
+
+        process = multiprocessing.get_context('fork').Process(target=_crash_after_appends, args=(output,))
+        process.start()
+        process.join()
+        assert process.exitcode == 1
+
+        # Compaction interrompue: un journal mis de côté attend encore
+        os.replace(output + '.log', output + '.log.1')
+        log = RecordLog(output, check_interval=0)
+        log.append(_row(150, 'Après la relance'))
+        records = read_records(output)
+        assert len(records) == 100 and records[150]['nom'] == 'Après la relance'
+        log.close(compact=True)
+        rows = _read_csv(output)
+        assert [int(row['scl']) for row in rows] == list(range(100, 200))
+        assert rows[50]['nom'] == 'Après la relance'
+        assert not os.path.exists(output + '.log.1') and not os.path.exists(output + '.log')
+
+
+def test_compaction_en_arriere_plan():
+    """Ajouts concurrents pendant les compactions: aucune ligne perdue"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, min_compact_bytes=2000, check_interval=0.01)
+
+        def writer(offset):
+            for scl in range(offset, 3000, 4):
+                log.append(_row(scl, f"Club {scl}"))
+                if scl % 40 == offset:
+                    time.sleep(0.002)
+
+        threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert log.compactions >= 2  # pendant les ajouts
+        log.close(compact=True)
+        rows = _read_csv(output)
+        assert [int(row['scl']) for row in rows] == list(range(3000))
+        assert all(row['nom'] == f"Club {row['scl']}" for row in rows)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
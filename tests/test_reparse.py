@@ -0,0 +1,121 @@
+"""
+Tests du re-parsing hors ligne (archive, répertoire et tar)
+"""
+
+import sys
+import os
+import csv
+import io
+import json
+import tarfile
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from page_archive import PageArchive
+from reparse import FIELDNAMES, _sort_output, reparse
+
+URL = "https://gironde.fff.fr/recherche-clubs?scl={scl}"
+
+
+def club_page(scl: int) -> str:
+    return (f"<html><head><title>Recherche clubs</title></head><body><app-club>"
+            f"<h1>US CLUB NUMERO {scl}</h1><h2>N°affiliation: {500000 + scl}</h2>"
+            f"<b>Email principal</b> : club{scl}@club.fr<br></app-club></body></html>")
+
+
+ABSENT_PAGE = "<html><body><app-club><p>Aucun résultat</p></app-club></body></html>"
+
+
+def read_csv(path: str):
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == FIELDNAMES
+        return list(reader)
+
+
+def test_reparse_archive():
+    """Archive: dernière page par scl, réponses JSON, sortie triée au format scrape_range"""
+    with tempfile.TemporaryDirectory() as directory:
+        archive_dir = os.path.join(directory, 'archive')
+        with PageArchive(archive_dir, writer='w2') as archive:
+            archive.add(3, URL.format(scl=3), 'club', club_page(3))
+            archive.add(2, URL.format(scl=2), 'absent', ABSENT_PAGE)
+        with PageArchive(archive_dir, writer='w1') as archive:
+            archive.add(1, URL.format(scl=1), '200', json.dumps(
+                {'name': 'FC JSON', 'affiliation_number': '42'}), content_type='json')
+            archive.add(4, URL.format(scl=4), '404', '', content_type='json')
+            archive.add(3, URL.format(scl=3), 'absent', ABSENT_PAGE, timestamp=0)
+
+        output = os.path.join(directory, 'out.csv')
+        stats = reparse(archive_dir, output, workers=2, batch_size=1)
+        rows = read_csv(output)
+
+        assert stats == {'pages': 4, 'clubs': 2}
+        assert [row['scl'] for row in rows] == ['1', '2', '3', '4']
+        assert rows[0]['nom'] == 'FC JSON'
+        assert rows[1]['nom'] == ''
+        assert rows[2]['nom'] == 'US CLUB NUMERO 3'
+        assert rows[2]['email'] == 'club3@club.fr'
+
+
+def test_reparse_repertoire_et_tar():
+    """Répertoire de pages <scl>.html et la même chose en .tar.gz, sortie JSONL"""
+    with tempfile.TemporaryDirectory() as directory:
+        pages_dir = os.path.join(directory, 'pages')
+        os.makedirs(pages_dir)
+        tar_path = os.path.join(directory, 'pages.tar.gz')
+        with tarfile.open(tar_path, 'w:gz') as tar:
+            for scl in range(10, 0, -1):
+                content = club_page(scl) if scl % 2 else ABSENT_PAGE
+                with open(os.path.join(pages_dir, f"scl_{scl}.html"), 'w', encoding='utf-8') as f:
+                    f.write(content)
+                data = content.encode('utf-8')
+                info = tarfile.TarInfo(f"pages/{scl}.html")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+        for source in (pages_dir, tar_path):
+            output = os.path.join(directory, 'out.jsonl')
+            reparse(source, output, workers=2, batch_size=3)
+            with open(output, encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+            assert [int(row['scl']) for row in rows] == list(range(1, 11))
+            assert [row['nom'] for row in rows if row['nom']] == [f"US CLUB NUMERO {scl}" for scl in (1, 3, 5, 7, 9)]
+            assert rows[4]['numero_affiliation'] == '500005'
+
+
+def test_tri_externe():
+    """Morceaux triés fusionnés: ordre des scl, la dernière ligne lue d'un scl gagne"""
+    order = [9, 3, 7, 3, 1, 9, 5, 2, 7, 3]
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('clubs.csv', 'clubs.jsonl'):
+            path = os.path.join(directory, name)
+            rows = [{field: '' for field in FIELDNAMES} for _ in order]
+            for position, (row, scl) in enumerate(zip(rows, order)):
+                row.update(scl=str(scl), nom=f"lu en {position}")
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                if name.endswith('.jsonl'):
+                    f.writelines(json.dumps(row) + '\n' for row in rows)
+                else:
+                    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                    writer.writeheader()
+                    writer.writerows(rows)
+
+            _sort_output(path, chunk_rows=3)
+            if name.endswith('.jsonl'):
+                with open(path, encoding='utf-8') as f:
+                    result = [json.loads(line) for line in f]
+            else:
+                result = read_csv(path)
+            assert [(row['scl'], row['nom']) for row in result] == [
+                ('1', 'lu en 4'), ('2', 'lu en 7'), ('3', 'lu en 9'), ('5', 'lu en 6'),
+                ('7', 'lu en 8'), ('9', 'lu en 5')], result
+        assert sorted(os.listdir(directory)) == ['clubs.csv', 'clubs.jsonl']
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
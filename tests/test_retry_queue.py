@@ -0,0 +1,93 @@
+"""
+Tests des nouvelles tentatives différées (délais exponentiels, abandon, reprise par lots)
+"""
+
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from club_data import STATUS_ABSENT, STATUS_ERROR, STATUS_FOUND, STATUS_TRANSIENT, ClubData, ScrapeResult
+from fake_fff_server import FakeFFFServer, FakeServerConfig
+from page_readiness import READY_TIMEOUT
+from retry_queue import (RetryPolicy, RetryQueue, result_from_exception, result_without_club,
+                         transient_http_error)
+from scraper_by_scl_http import HttpSCLScraper
+
+
+def test_delais_exponentiels_avec_gigue():
+    random.seed(3)
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0.5)
+    for attempts, nominal in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 8.0), (6, 10.0)):
+        delays = [policy.delay(attempts) for _ in range(200)]
+        assert nominal * 0.5 <= min(delays) and max(delays) <= nominal * 1.5
+        assert max(delays) - min(delays) > nominal * 0.5  # les reprises ne partent pas ensemble
+    assert RetryPolicy(base_delay=1.0, jitter=0.0).delay(3) == 4.0
+
+
+def test_abandon_apres_max_tentatives():
+    queue = RetryQueue(RetryPolicy(max_attempts=3, base_delay=0.0))
+    transient = ScrapeResult(7, STATUS_TRANSIENT, error="HTTP 503")
+    assert queue.record(transient) is False
+    assert queue.record(transient) is False
+    assert queue.record(transient) is True  # troisième échec: abandon, résultat définitif
+    assert queue.given_up == {7: "HTTP 503"}
+    assert queue.record(ScrapeResult(8, STATUS_ABSENT)) is True
+    assert queue.recovered == 0
+
+
+def test_drain_recupere_les_echecs_transitoires():
+    queue = RetryQueue(RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.01))
+    failures = {1: 2, 2: 9}  # scl 1 répond à la 3e tentative, scl 2 jamais
+    for scl in (1, 2):
+        queue.record(ScrapeResult(scl, STATUS_TRANSIENT, error="timeout"))
+        failures[scl] -= 1
+
+    def fetch(scl):
+        if failures[scl] > 0:
+            failures[scl] -= 1
+            return ScrapeResult(scl, STATUS_TRANSIENT, error="timeout")
+        return ScrapeResult(scl, STATUS_FOUND, ClubData(nom=f"CLUB {scl}"))
+
+    results = {result.scl: result for result in queue.drain(fetch)}
+    assert results[1].status == STATUS_FOUND and results[2].status == STATUS_TRANSIENT
+    assert queue.attempts == {1: 2, 2: 4}  # échecs comptés
+    assert queue.recovered == 1 and list(queue.given_up) == [2]
+    assert len(queue) == 0 and queue.pop_due() == []
+
+
+def test_classement_des_echecs():
+    assert transient_http_error(503) == "HTTP 503"
+    assert transient_http_error(429) == "HTTP 429"
+    assert transient_http_error(404) is None and transient_http_error(None) is None
+    assert result_without_club(1, READY_TIMEOUT).status == STATUS_TRANSIENT
+    assert result_without_club(1, 'found').status == STATUS_ERROR
+    timeout = result_from_exception(1, TimeoutError("Timeout 30000ms exceeded.\n=== logs ==="))
+    assert timeout.status == STATUS_TRANSIENT and timeout.error == "TimeoutError: Timeout 30000ms exceeded."
+    assert result_from_exception(1, KeyError('nom')).status == STATUS_ERROR
+
+
+def test_scraper_http_reprend_les_5xx():
+    """Avec 50% de 5xx, tous les clubs sont retrouvés après les reprises"""
+    config = FakeServerConfig(valid_scls={2, 4, 6, 8}, error_rate=0.5, seed=5)
+    with FakeFFFServer(config=config) as server:
+        with HttpSCLScraper(api_url_template=server.api_url_template, fallback=False,
+                            retry_policy=RetryPolicy(max_attempts=10, base_delay=0.01)) as scraper:
+            seen = []
+            clubs = scraper.scrape_scls(range(1, 11), server.base_url, workers=4,
+                                        on_result=lambda scl, club, elapsed: seen.append(scl))
+        assert server.stats.errors > 0
+    assert [c.nom for c in clubs] == [f"US CLUB NUMERO {scl}" for scl in (2, 4, 6, 8)]
+    assert sorted(seen) == list(range(1, 11))  # un seul résultat définitif par scl
+    # Les 404 reçus avant le premier club reconnu sont aussi retentés
+    assert scraper.retry_queue.retried == server.stats.errors + scraper.stats['unconfirmed']
+    assert scraper.stats['absent'] == 6
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,86 @@
+"""
+Tests du point de reprise exact (état de chaque scl, survie à un arrêt brutal)
+"""
+
+import sys
+import os
+import multiprocessing
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from club_data import STATUS_ABSENT, STATUS_ERROR, STATUS_FOUND, STATUS_TRANSIENT
+from scan_checkpoint import ABSENT, ERROR, FOUND, PENDING, ScanCheckpoint, default_checkpoint_path
+from scl_density import DensityIndex, ScanPlanner
+
+
+def _crash_after_writes(path: str):
+    checkpoint = ScanCheckpoint(path, flush_interval=3600)
+    for scl in range(1, 20001):
+        checkpoint.record(scl, STATUS_FOUND if scl % 7 == 0 else STATUS_ABSENT)
+    os._exit(1)  # ni close ni flush
+
+
+def test_etats_et_agrandissement():
+    with tempfile.TemporaryDirectory() as directory:
+        path = default_checkpoint_path(os.path.join(directory, 'clubs.csv'))
+        checkpoint = ScanCheckpoint(path)
+        assert not checkpoint.resumed
+        checkpoint.record(5, STATUS_FOUND)
+        checkpoint.record(6, STATUS_ABSENT)
+        checkpoint.record(7, STATUS_ERROR)
+        checkpoint.record(8, STATUS_TRANSIENT)  # abandonné après les reprises
+        checkpoint.record(200000, STATUS_FOUND)  # au-delà de la capacité initiale
+        assert checkpoint.capacity > 200000
+        assert [checkpoint.get(scl) for scl in (4, 5, 6, 7, 8)] == [PENDING, FOUND, ABSENT, ERROR, ERROR]
+        assert checkpoint.get(10 ** 9) == PENDING
+        assert [checkpoint.is_done(scl) for scl in (4, 5, 6, 7)] == [False, True, True, False]
+        assert list(checkpoint.scls(FOUND)) == [5, 200000]
+        assert checkpoint.summary() == "2 trouvés, 1 absents, 2 en erreur"
+        checkpoint.close()
+
+        reopened = ScanCheckpoint(path)
+        assert reopened.resumed and list(reopened.scls(ERROR)) == [7, 8]
+        reopened.remove()
+        assert not os.path.exists(path)
+
+        with open(path, 'wb') as f:
+            f.write(b'scl,nom\n' * 4)
+        try:
+            ScanCheckpoint(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("fichier étranger accepté")
+
+
+def test_reprise_apres_arret_brutal():
+    """20000 résultats écrits puis processus tué: la relance ne reteste rien"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.ckpt')
+        process = multiprocessing.get_context('fork').Process(target=_crash_after_writes, args=(path,))
+        process.start()
+        process.join()
+        assert process.exitcode == 1
+
+        checkpoint = ScanCheckpoint(path)
+        counts = checkpoint.counts()
+        assert counts[FOUND] == 20000 // 7 and counts[FOUND] + counts[ABSENT] == 20000
+
+        # Le planificateur saute les numéros traités et ne planifie que la suite
+        planner = ScanPlanner(DensityIndex(), start=1, max_scl=20100, skip=checkpoint.is_done)
+        planner.mark_found(checkpoint.scls(FOUND))
+        todo = []
+        phase = planner.next_phase()
+        while phase:
+            todo += phase
+            phase = planner.next_phase()
+        assert todo == list(range(20001, 20101))
+        checkpoint.close()
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
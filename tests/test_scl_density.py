@@ -0,0 +1,75 @@
+"""
+Tests de l'index de densité des scl et de la planification par phases
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_fff_server import generate_valid_scls
+from scl_density import DensityIndex, ScanPlanner
+
+VALID = generate_valid_scls(6000, block_size=100, seed=3)
+
+
+def _run(planner):
+    """Exécute le plan contre la carte VALID; retourne les numéros testés dans l'ordre"""
+    probed = []
+    todo = planner.next_phase()
+    while todo:
+        for scl in todo:
+            probed.append(scl)
+            planner.record(scl, scl in VALID)
+        todo = planner.next_phase()
+    return probed
+
+
+def test_borne_detectee_sans_index():
+    planner = ScanPlanner(DensityIndex(), start=1)
+    probed = _run(planner)
+    assert VALID <= set(probed)
+    assert len(probed) == len(set(probed))
+    # Arrêt peu après le dernier club (exploration limitée à quelques blocs échantillonnés)
+    assert planner.upper_bound == 5999
+    assert max(probed) < 6000 + planner.frontier_empty_blocks * 100
+
+
+def test_blocs_denses_d_abord():
+    with tempfile.TemporaryDirectory() as directory:
+        # Run précédent au format scrape_range.py: une ligne par scl, nom vide sans club
+        previous = os.path.join(directory, 'previous.csv')
+        with open(previous, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['scl', 'nom'])
+            writer.writeheader()
+            for scl in range(1, 6001):
+                writer.writerow({'scl': scl, 'nom': 'CLUB' if scl in VALID else ''})
+        index_file = os.path.join(directory, 'index.json')
+        index = DensityIndex.build([previous])
+        assert index.max_valid_scl == max(VALID)
+        index.save(index_file)
+
+        probed = _run(ScanPlanner(DensityIndex.load(index_file), start=1))
+        assert VALID <= set(probed)
+        # 90% des clubs trouvés bien avant la moitié des numéros testés
+        found = 0
+        for position, scl in enumerate(probed, 1):
+            found += scl in VALID
+            if found >= 0.9 * len(VALID):
+                break
+        assert position < len(probed) / 2
+
+        # Sans balayage des blocs clairsemés: beaucoup moins de numéros, presque tous les clubs
+        probed = _run(ScanPlanner(DensityIndex.load(index_file), start=1, sweep_sparse=False))
+        assert len(probed) < 0.8 * 6000
+        assert len(VALID & set(probed)) > 0.95 * len(VALID)
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith('test_'):
+            func()
+            print(f"✅ {name}")
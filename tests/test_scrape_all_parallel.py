@@ -0,0 +1,93 @@
+"""
+Tests du driver multi-processus (workers remplacés: pas de navigateur)
+"""
+
+import sys
+import os
+import csv
+import multiprocessing
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import scrape_all_parallel as driver
+from record_log import RecordLog, read_records
+
+
+def _init_fake_worker(*args):
+    pass
+
+
+def _fake_batch_bad_result(task):
+    scls, base_url = task
+    # Résultat incomplet: le dépaquetage échoue dans le processus principal
+    return scls, []
+
+
+class _patched_workers:
+    """Remplace l'initialisation et le traitement des lots (hérités par fork)"""
+
+    def __init__(self, batch):
+        self.batch = batch
+
+    def __enter__(self):
+        self.saved = driver._init_worker, driver._scrape_batch
+        driver._init_worker, driver._scrape_batch = _init_fake_worker, self.batch
+
+    def __exit__(self, *exc):
+        driver._init_worker, driver._scrape_batch = self.saved
+
+
+def test_erreur_du_processus_principal_remontee():
+    """Une erreur pendant les lots arrête le pool et remonte telle quelle (pas "Pool is still running")"""
+    if multiprocessing.get_start_method() != 'fork':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        with _patched_workers(_fake_batch_bad_result):
+            try:
+                driver.scrape_all_parallel(max_scl=20, workers=2, batch_size=5, output_file=output)
+            except ValueError as e:
+                assert 'unpack' in str(e), e
+            else:
+                raise AssertionError("erreur du processus principal avalée")
+        assert not multiprocessing.active_children()
+
+
+def _fake_batch_clubs(task):
+    scls, base_url = task
+    # Un club aux numéros pairs; "Relu" signale un numéro retesté
+    rows = [{'scl': scl, 'nom': f"Relu {scl}"} for scl in scls if scl % 2 == 0]
+    return scls, rows, [], [], []
+
+
+def test_sortie_partagee_avec_scrape_range():
+    """Le journal pas encore compacté compte: ses numéros sont sautés, puis fusionnés dans le CSV trié"""
+    if multiprocessing.get_start_method() != 'fork':
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'clubs.csv')
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '2', 'nom': 'AS Deux'})
+        log.close(compact=True)
+        # Résultats de scrape_range.py restés dans <sortie>.log (sous le seuil de compaction)
+        log = RecordLog(output, check_interval=0)
+        log.append({'scl': '4', 'nom': 'US Quatre', 'temps_extraction': '0.40'})
+        log.append({'scl': '5', 'nom': '', 'temps_extraction': '0.20'})
+        log.close(compact=False)
+        assert read_records(output).keys() == {2, 4, 5}
+
+        with _patched_workers(_fake_batch_clubs):
+            driver.scrape_all_parallel(max_scl=8, workers=2, batch_size=2, output_file=output)
+        assert not os.path.exists(output + '.log')
+        with open(output, encoding='utf-8', newline='') as f:
+            rows = [(row['scl'], row['nom'], row['temps_extraction']) for row in csv.DictReader(f)]
+        assert rows == [('2', 'AS Deux', ''), ('4', 'US Quatre', '0.40'), ('5', '', '0.20'),
+                        ('6', 'Relu 6', ''), ('8', 'Relu 8', '')], rows
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
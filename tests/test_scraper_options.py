@@ -0,0 +1,76 @@
+"""
+Tests des options communes des CLIs (déclaration unique, passage par mot-clé aux drivers)
+"""
+
+import sys
+import os
+import argparse
+import inspect
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from negative_cache import DEFAULT_TTL_DAYS
+from scraper_options import ScraperOptions, add_scraper_arguments
+
+
+def test_options_selectionnees():
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser, hosts=False, sqlite=False, parquet=False, checkpoint=False)
+    args = parser.parse_args(['--rate', '2', '--max-attempts', '7', '--negative-cache', 'cache.tsv'])
+    options = ScraperOptions.from_args(args)
+    assert (options.rate, options.retry_policy.max_attempts, options.negative_cache_file) == (2.0, 7, 'cache.tsv')
+    # Options non déclarées: valeurs par défaut
+    assert options.hosts_file is None and options.host_strategy == 'least-loaded' and options.parquet_file is None
+    assert options.checkpoint_file is None
+    try:
+        parser.parse_args(['--sqlite', 'clubs.db'])
+    except SystemExit:
+        pass
+    else:
+        raise AssertionError("--sqlite accepté sans être déclaré")
+
+
+def test_point_de_reprise():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', type=str, default='clubs.json')
+    add_scraper_arguments(parser)
+    assert ScraperOptions.from_args(parser.parse_args([])).checkpoint_file == 'clubs.json.ckpt'
+    assert ScraperOptions.from_args(parser.parse_args(['--checkpoint', 'run.ckpt'])).checkpoint_file == 'run.ckpt'
+    assert ScraperOptions.from_args(parser.parse_args(['--no-checkpoint'])).checkpoint_file is None
+    # CLI sans l'option: pas de point de reprise
+    parser = argparse.ArgumentParser()
+    add_scraper_arguments(parser, checkpoint=False)
+    assert ScraperOptions.from_args(parser.parse_args([])).checkpoint_file is None
+
+
+def test_parametres_des_drivers():
+    """Les noms des options sont ceux des paramètres de scrape_range et des drivers CSV"""
+    from scrape_all_parallel import scrape_all_parallel
+    from scrape_range import scrape_range
+    from scrape_to_csv import scrape_all_to_csv
+
+    kwargs = ScraperOptions(sqlite_file='clubs.db', parquet_file='clubs.parquet',
+                            checkpoint_file='clubs.csv.ckpt').as_kwargs()
+    inspect.signature(scrape_range).bind(1, 100, output_csv='clubs.csv', **kwargs)
+    inspect.signature(scrape_all_to_csv).bind(**kwargs)
+    inspect.signature(scrape_all_parallel).bind(**kwargs)
+
+
+def test_ouverture():
+    with tempfile.TemporaryDirectory() as directory:
+        options = ScraperOptions(negative_cache_file=os.path.join(directory, 'cache.tsv'), rate=5.0)
+        cache = options.open_negative_cache()
+        assert cache.ttl == DEFAULT_TTL_DAYS * 86400
+        cache.close()
+        assert options.open_rate_limiter().burst == 5.0
+        assert options.open_hosts() is None
+    assert ScraperOptions().open_negative_cache() is None and ScraperOptions().open_rate_limiter() is None
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")